@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+RangisNet Backtest Engine
+Replays historical ticks through RangisAgent on simulated time
+
+Tick files are CSV or Parquet with columns
+    timestamp (epoch s), symbol, price[, prm_score, target_price, amount]
+CSV is converted once into a column cache (<file>.columns/*.npy) that is
+memory-mapped afterwards; Parquet is read memory-mapped through pyarrow.
+Workers of a parameter sweep map the same cache files, so the tick data is
+shared through the page cache instead of being copied into every process.
+
+Each parameter set gets its own agent whose SpendLimitManager runs on the
+ticks' clock, so daily/weekly/... windows advance with replayed time.
+Ticks below the agent's PRM threshold can only be rejected, so they are
+counted in bulk per chunk; the remaining ticks go through evaluate_trade and
+approved trades are booked with record_trade. Positions are marked to market
+at each trade and at the end of the data for P&L and drawdown.
+
+Usage:
+    python3 Backtest-engine.py --sample ticks.csv --days 90      # write seeded sample ticks
+    python3 Backtest-engine.py --ticks ticks.csv                 # default personality x spread grid
+    python3 Backtest-engine.py --ticks ticks.csv --params sets.json --processes 8
+"""
+
+import argparse
+import asyncio
+import csv
+import functools
+import json
+import os
+import sys
+import time
+from array import array
+from datetime import datetime
+
+import numpy as np
+
+from engine_loader import call_engine, load_engine
+
+REQUIRED_COLUMNS = ("timestamp", "symbol", "price")
+OPTIONAL_COLUMNS = ("prm_score", "target_price", "amount")
+
+# Ticks per replay chunk (bounds the working set of mapped pages)
+CHUNK_SIZE = 1 << 16
+
+DEFAULT_PARAMS = {
+    "personality": "moderate",
+    "min_confidence": None,  # None: the personality's threshold
+    "accept_spread": None,   # None: the agent's default negotiation bands
+    "counter_spread": None,
+    "amount": 1.0,           # Spend per trade when the data has no amount column
+    "spend_limits": None,    # None: DEFAULT_SPEND_LIMITS
+}
+
+
+class TickColumns:
+    """Column arrays (possibly memory-mapped) plus the symbol code table"""
+
+    def __init__(self, columns, symbols, source=None):
+        self.columns = columns
+        self.symbols = list(symbols)
+        self.source = source
+
+    def __len__(self):
+        return len(self.columns["timestamp"])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def chunks(self, size=CHUNK_SIZE):
+        """(start, stop) bounds of consecutive chunks"""
+        n = len(self)
+        return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+def _cache_dir(path):
+    return path + ".columns"
+
+
+def _cache_fresh(path):
+    meta_path = os.path.join(_cache_dir(path), "meta.json")
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    stat = os.stat(path)
+    if meta.get("source_size") != stat.st_size or meta.get("source_mtime") != stat.st_mtime:
+        return None
+    return meta
+
+
+def convert_csv(path):
+    """
+    Parse a tick CSV into the .npy column cache next to it
+    Rows are streamed into typed arrays, so memory stays at one compact array per column
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = [name.strip() for name in next(reader)]
+        missing = [name for name in REQUIRED_COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f"{path}: missing columns {', '.join(missing)}")
+        present = [name for name in OPTIONAL_COLUMNS if name in header]
+        numeric = ["timestamp", "price", *present]
+        positions = {name: header.index(name) for name in (*numeric, "symbol")}
+
+        values = {name: array("d") for name in numeric}
+        codes = array("i")
+        symbols = {}
+        for row in reader:
+            if not row:
+                continue
+            for name in numeric:
+                values[name].append(float(row[positions[name]] or "nan"))
+            symbol = row[positions["symbol"]]
+            code = symbols.get(symbol)
+            if code is None:
+                code = symbols[symbol] = len(symbols)
+            codes.append(code)
+
+    directory = _cache_dir(path)
+    os.makedirs(directory, exist_ok=True)
+    for name, column in values.items():
+        np.save(os.path.join(directory, f"{name}.npy"), np.frombuffer(column, dtype=np.float64))
+    np.save(os.path.join(directory, "symbol.npy"), np.frombuffer(codes, dtype=np.int32))
+    stat = os.stat(path)
+    meta = {
+        "columns": numeric,
+        "symbols": list(symbols),
+        "rows": len(codes),
+        "source_size": stat.st_size,
+        "source_mtime": stat.st_mtime,
+    }
+    with open(os.path.join(directory, "meta.json"), "w") as f:
+        json.dump(meta, f)
+    return meta
+
+
+def _load_parquet(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet tick files need the optional 'pyarrow' package") from None
+
+    table = pq.read_table(path, memory_map=True)
+    names = set(table.column_names)
+    missing = [name for name in REQUIRED_COLUMNS if name not in names]
+    if missing:
+        raise ValueError(f"{path}: missing columns {', '.join(missing)}")
+    symbol = table.column("symbol").combine_chunks().dictionary_encode()
+    columns = {
+        name: table.column(name).to_numpy().astype(np.float64, copy=False)
+        for name in ("timestamp", "price", *OPTIONAL_COLUMNS) if name in names
+    }
+    columns["symbol"] = symbol.indices.to_numpy().astype(np.int32, copy=False)
+    return TickColumns(columns, symbol.dictionary.to_pylist(), path)
+
+
+def load_ticks(path):
+    """Tick columns for a CSV (via the memory-mapped cache) or Parquet file"""
+    if path.endswith(".parquet"):
+        return _load_parquet(path)
+    meta = _cache_fresh(path) or convert_csv(path)
+    directory = _cache_dir(path)
+    columns = {
+        name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+        for name in (*meta["columns"], "symbol")
+    }
+    return TickColumns(columns, meta["symbols"], path)
+
+
+def _agent(params, clock):
+    negotiation = {
+        key: params[key] for key in ("accept_spread", "counter_spread") if params[key] is not None
+    }
+    return load_engine("polly-agent-brain").RangisAgent(
+        f"backtest-{params.get('name', 'run')}", params["personality"], history_size=64,
+        spend_limits=params["spend_limits"], clock=clock,
+        min_confidence=params["min_confidence"], **negotiation
+    )
+
+
+async def _replay(ticks, params, agent, now):
+    threshold = agent.polly.min_confidence
+    symbols = ticks.symbols
+    columns = ticks.columns
+    stats = {"ticks": len(ticks), "below_threshold": 0, "approved": 0, "rejected": 0,
+             "blocked": 0, "lapsed": 0, "accept": 0, "counter": 0}
+    trades = {"index": array("q"), "symbol": array("i"), "units": array("d"), "spent": array("d")}
+    confidence = 0.0
+
+    for start, stop in ticks.chunks():
+        prm = np.asarray(columns["prm_score"][start:stop]) if "prm_score" in columns \
+            else np.full(stop - start, 0.5)
+        candidates = np.flatnonzero(prm >= threshold)
+        stats["below_threshold"] += (stop - start) - len(candidates)
+        if not len(candidates):
+            continue
+
+        stamps = np.asarray(columns["timestamp"][start:stop])[candidates].tolist()
+        prices = np.asarray(columns["price"][start:stop])[candidates].tolist()
+        codes = np.asarray(columns["symbol"][start:stop])[candidates].tolist()
+        scores = prm[candidates].tolist()
+        targets = (np.asarray(columns["target_price"][start:stop])[candidates].tolist()
+                   if "target_price" in columns else prices)
+        amounts = (np.asarray(columns["amount"][start:stop])[candidates].tolist()
+                   if "amount" in columns else [params["amount"]] * len(candidates))
+
+        for offset, stamp, price, code, score, target, amount in zip(
+                candidates.tolist(), stamps, prices, codes, scores, targets, amounts):
+            now[0] = stamp
+            decision = await agent.evaluate_trade({
+                "pair": symbols[code],
+                "price": price,
+                "target_price": target if target == target else price,  # NaN → no target
+                "prm_score": score,
+                "amount": amount,
+            })
+            status = decision["status"]
+            if status != "approved":
+                stats[status] += 1
+                continue
+            if not agent.record_trade(decision):
+                stats["lapsed"] += 1
+                continue
+            stats["approved"] += 1
+            stats["accept" if decision["price"] == price else "counter"] += 1
+            confidence += score
+            trades["index"].append(start + offset)
+            trades["symbol"].append(code)
+            trades["units"].append(amount / decision["price"])
+            trades["spent"].append(amount)
+
+    stats["avg_trade_confidence"] = confidence / stats["approved"] if stats["approved"] else 0.0
+    return stats, {name: np.frombuffer(values, dtype=np.int64 if name == "index" else
+                                       np.int32 if name == "symbol" else np.float64)
+                   for name, values in trades.items()}
+
+
+def mark_to_market(ticks, trades):
+    """
+    Equity (position value - spend) after every trade and at the end of the data
+    Each symbol's price at a trade is its last tick at or before that trade
+    """
+    codes = np.asarray(ticks["symbol"])
+    prices = np.asarray(ticks["price"])
+    n_symbols = len(ticks.symbols)
+    samples = np.append(trades["index"], len(ticks) - 1)
+
+    units = np.zeros((len(samples), n_symbols))
+    units[np.arange(len(trades["index"])), trades["symbol"]] = trades["units"]
+    units = np.cumsum(units, axis=0)
+    spent = np.cumsum(np.append(trades["spent"], 0.0))
+
+    marks = np.zeros((len(samples), n_symbols))
+    for code in np.unique(trades["symbol"]):
+        positions = np.flatnonzero(codes == code)
+        last = np.searchsorted(positions, samples, side="right") - 1
+        marks[:, code] = np.where(last >= 0, prices[positions[np.maximum(last, 0)]], 0.0)
+
+    equity = (units * marks).sum(axis=1) - spent
+    drawdown = np.maximum.accumulate(np.maximum(equity, 0.0)) - equity
+    return {
+        "pnl": float(equity[-1]),
+        "spent": float(spent[-1]),
+        "return_on_spend": float(equity[-1] / spent[-1]) if spent[-1] > 0 else 0.0,
+        "max_drawdown": float(drawdown.max()) if len(drawdown) else 0.0,
+    }
+
+
+def run_backtest(path, params=None):
+    """Backtest one parameter set over a tick file; returns P&L and decision stats"""
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    started = time.perf_counter()
+    ticks = load_ticks(path)
+    now = [float(ticks["timestamp"][0]) if len(ticks) else 0.0]
+    agent = _agent(params, clock=lambda: now[0])
+
+    stats, trades = asyncio.run(_replay(ticks, params, agent, now))
+    elapsed = time.perf_counter() - started
+    span_days = (float(ticks["timestamp"][-1]) - float(ticks["timestamp"][0])) / 86400 if len(ticks) else 0.0
+    return {
+        "params": params,
+        "threshold": agent.polly.min_confidence,
+        **mark_to_market(ticks, trades),
+        "trades": stats["approved"],
+        "trades_per_day": stats["approved"] / span_days if span_days else 0.0,
+        "decisions": stats,
+        "days": span_days,
+        "elapsed_s": elapsed,
+        "ticks_per_sec": len(ticks) / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def run_backtests(path, param_sets, processes=None):
+    """
+    Run parameter sets in parallel, one per process-pool task
+    The CSV cache is built once up front; workers memory-map it
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    load_ticks(path)
+    param_sets = list(param_sets)
+    worker = functools.partial(call_engine, "Backtest-engine", "run_backtest")
+    with ProcessPoolExecutor(processes or min(len(param_sets), os.cpu_count() or 1)) as pool:
+        return list(pool.map(worker, [path] * len(param_sets), param_sets))
+
+
+def default_grid():
+    """Every personality against the default and a wider negotiation band"""
+    brain = load_engine("polly-agent-brain")
+    return [
+        {"name": f"{personality}-{label}", "personality": personality,
+         "accept_spread": accept, "counter_spread": counter}
+        for personality in brain.PERSONALITY_THRESHOLDS
+        for label, accept, counter in (("default", brain.ACCEPT_SPREAD, brain.COUNTER_SPREAD),
+                                       ("wide", 0.02, 0.08))
+    ]
+
+
+def write_sample(path, symbols=4, days=30, interval=60, seed=432):
+    """
+    Seeded random-walk ticks for `days` of data every `interval` seconds per symbol
+    prm_score leans on recent momentum; target_price is a jittered quote
+    """
+    rng = np.random.default_rng(seed)
+    steps = int(days * 86400 / interval)
+    stamps = 1_765_000_000.0 + np.arange(steps) * interval
+    returns = rng.normal(0.0, 0.002, size=(symbols, steps))
+    prices = 20.0 * np.exp(np.cumsum(returns, axis=1))
+    momentum = np.concatenate([np.zeros((symbols, 10)), np.log(prices[:, 10:] / prices[:, :-10])], axis=1)
+    prm = np.clip(0.55 + 20.0 * momentum + rng.normal(0.0, 0.12, size=prices.shape), 0.0, 1.0)
+    targets = prices * (1.0 + rng.normal(0.0, 0.02, size=prices.shape))
+
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp", "symbol", "price", "prm_score", "target_price"])
+        for step in range(steps):
+            for s in range(symbols):
+                writer.writerow([f"{stamps[step]:.0f}", f"SYM{s}/USDC", f"{prices[s, step]:.6f}",
+                                 f"{prm[s, step]:.4f}", f"{targets[s, step]:.6f}"])
+    return {"path": path, "rows": steps * symbols}
+
+
+def main(argv=None):
+    """Main execution - returns JSON for Node bridge"""
+    parser = argparse.ArgumentParser(description="RangisNet backtest engine")
+    parser.add_argument("--ticks", metavar="PATH", help="CSV or Parquet tick file to replay")
+    parser.add_argument("--params", metavar="PATH",
+                        help="JSON list of parameter sets (default: personality x spread grid)")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--sample", metavar="PATH", help="write a seeded sample tick CSV instead")
+    parser.add_argument("--symbols", type=int, default=4)
+    parser.add_argument("--days", type=float, default=30)
+    parser.add_argument("--interval", type=float, default=60, help="seconds between sample ticks")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.sample:
+            result = write_sample(args.sample, args.symbols, args.days, args.interval)
+        elif args.ticks:
+            if args.params:
+                with open(args.params) as f:
+                    param_sets = json.load(f)
+            else:
+                param_sets = default_grid()
+            result = run_backtests(args.ticks, param_sets, args.processes)
+        else:
+            parser.error("pass --ticks PATH or --sample PATH")
+        print(json.dumps(result, indent=2))
+        return 0
+    except Exception as e:
+        error_output = {
+            "error": str(e),
+            "status": "failed",
+            "timestamp": datetime.now().isoformat()
+        }
+        print(json.dumps(error_output), file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+RangisNet Consensus Pulse Engine
+Aggregates validator Consensus Harmonic Signals (CHS) into the Rangi
+Consensus Pulse (RCP), the network-wide stability index
+
+- Per-validator state lives in NumPy arrays (one row per validator), so a
+  batch of packets is applied with a few vectorized updates
+- Drift is tracked incrementally: an EWMA mean/variance of each validator's
+  detune ratio feeds a CUSUM of its z-scores; no packet history is kept
+- rcp() is one vectorized pass over the validator rows, so its cost depends
+  on the number of validators, not on how many packets have been seen
+
+CHS packet fields (camelCase aliases from HarmonicConsensus.sol are accepted):
+    validator_id   validator address / node id (required)
+    base_freq      validator health tone, 432 Hz when in tune
+    detune_ratio   drift from the base tone (derived from base_freq if absent)
+    amplitude      load stress, 0..1 (loadFactor)
+    timbre         connection quality, 0..1 (syncQuality)
+    rhythm         work consistency, 0..1 (rhythm_pattern)
+    phase_offset   ms offset from the shared pulse clock (phaseOffset)
+
+Usage:
+    python3 Consensus-Pulse-engine.py                     # RCP for a seeded sample network
+    python3 Consensus-Pulse-engine.py --serve             # NDJSON requests on stdin/stdout
+    python3 Consensus-Pulse-engine.py --serve --socket P  # NDJSON over a Unix socket at P
+
+Server methods: ingest {"packets": [...]}, rcp {"now"?, "top"?}, validator {"validator_id"}
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from engine_loader import load_engine
+
+BASE_FREQUENCY = 432.0
+# Period of the shared pulse clock; phase offsets are measured against it
+PULSE_PERIOD_MS = 2000.0
+
+FIELDS = ("base_freq", "detune_ratio", "amplitude", "timbre", "rhythm", "phase_offset")
+FIELD_ALIASES = {
+    "base_freq": ("baseFreq",),
+    "detune_ratio": ("detuneRatio", "detune"),
+    "amplitude": ("loadFactor", "load_factor"),
+    "timbre": ("syncQuality", "sync_quality", "timbre_code"),
+    "rhythm": ("rhythm_pattern", "rhythmPattern"),
+    "phase_offset": ("phaseOffset",),
+}
+ID_FIELDS = ("validator_id", "validatorId", "validator", "id")
+# Values used for fields a packet leaves out
+FIELD_DEFAULTS = {"base_freq": BASE_FREQUENCY, "amplitude": 0.0, "timbre": 1.0, "rhythm": 1.0, "phase_offset": 0.0}
+BASE, DETUNE, AMPLITUDE, TIMBRE, RHYTHM, PHASE = range(len(FIELDS))
+
+# Drift detection: EWMA weight of the newest packet, variance floor (detune
+# ratios are small, so z-scores are capped at |Δ| / 0.001), CUSUM slack and
+# alarm level, and the mean detune that counts as drifting regardless of trend
+EWMA_ALPHA = 0.1
+VARIANCE_FLOOR = 1e-6
+CUSUM_K = 1.0
+CUSUM_H = 8.0
+DETUNE_LIMIT = 0.02
+
+# Validators silent for longer than this are left out of the pulse
+STALE_AFTER = 10.0
+
+# Per-validator health = weighted mix of tuning, load, connection and rhythm
+HEALTH_WEIGHTS = {"tuning": 0.4, "load": 0.2, "timbre": 0.2, "rhythm": 0.2}
+# RCP states by stress (1 - stability), from the RCP threshold table
+RCP_STATES = ((0.25, "Low Pulse"), (0.5, "Elevated"), (0.75, "High Pulse"), (math.inf, "Chaotic"))
+
+
+def _packet_value(packet, field):
+    value = packet.get(field)
+    if value is None:
+        for alias in FIELD_ALIASES[field]:
+            value = packet.get(alias)
+            if value is not None:
+                break
+    return math.nan if value is None else float(value)
+
+
+def _validator_id(packet):
+    for field in ID_FIELDS:
+        value = packet.get(field)
+        if value is not None:
+            return str(value)
+    return None
+
+
+def rcp_state(stress):
+    for limit, name in RCP_STATES:
+        if stress < limit:
+            return name
+    return RCP_STATES[-1][1]
+
+
+class ConsensusPulse:
+    """Array-backed CHS state for many validators and the RCP computed from it"""
+
+    def __init__(self, capacity=1024, alpha=EWMA_ALPHA, clock=time.time):
+        self.alpha = alpha
+        self.clock = clock
+        self.index = {}  # validator id → row
+        self.ids = []
+        self.packets_seen = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.values = np.zeros((capacity, len(FIELDS)))
+        self.mean = np.zeros(capacity)  # EWMA of detune_ratio
+        self.var = np.zeros(capacity)  # EW variance of detune_ratio
+        self.cusum = np.zeros(capacity)
+        self.packets = np.zeros(capacity, dtype=np.int64)
+        self.last_seen = np.full(capacity, -np.inf)
+        self.drifting = np.zeros(capacity, dtype=bool)
+
+    def _grow(self, needed):
+        capacity = len(self.mean)
+        if needed <= capacity:
+            return
+        old = (self.values, self.mean, self.var, self.cusum, self.packets, self.last_seen, self.drifting)
+        self._allocate(max(needed, capacity * 2))
+        for new, values in zip((self.values, self.mean, self.var, self.cusum, self.packets,
+                                self.last_seen, self.drifting), old):
+            new[:capacity] = values
+
+    def _row(self, validator_id):
+        row = self.index.get(validator_id)
+        if row is None:
+            row = self.index[validator_id] = len(self.ids)
+            self.ids.append(validator_id)
+            self._grow(row + 1)
+        return row
+
+    def ingest(self, packets, now=None):
+        """
+        Apply a batch of CHS packets
+        Returns {"accepted", "rejected", "events"}; events are drift_started /
+        drift_cleared transitions for dashboards
+        """
+        now = self.clock() if now is None else now
+        rows, rounds, values = [], [], []
+        seen = {}
+        rejected = 0
+        for packet in packets:
+            validator_id = _validator_id(packet) if isinstance(packet, dict) else None
+            if validator_id is None:
+                rejected += 1
+                continue
+            try:
+                fields = [_packet_value(packet, field) for field in FIELDS]
+            except (TypeError, ValueError):
+                rejected += 1
+                continue
+            row = self._row(validator_id)
+            rows.append(row)
+            rounds.append(seen.get(row, 0))  # n-th packet for this validator in the batch
+            seen[row] = rounds[-1] + 1
+            values.append(fields)
+
+        events = []
+        if rows:
+            rows = np.array(rows)
+            rounds = np.array(rounds)
+            values = np.array(values)
+            missing = np.isnan(values[:, DETUNE])
+            values[missing, DETUNE] = values[missing, BASE] / BASE_FREQUENCY - 1.0
+            for field, default in FIELD_DEFAULTS.items():
+                column = values[:, FIELDS.index(field)]
+                column[np.isnan(column)] = default
+            values[np.isnan(values[:, DETUNE]), DETUNE] = 0.0
+
+            # Rows are unique within a round, so each round is one vectorized update
+            for n in range(int(rounds.max()) + 1):
+                selected = rounds == n
+                events += self._update(rows[selected], values[selected], now)
+        self.packets_seen += len(rows)
+        return {"accepted": len(rows), "rejected": rejected, "events": events}
+
+    def _update(self, rows, values, now):
+        detune = values[:, DETUNE]
+        first = self.packets[rows] == 0
+        mean = self.mean[rows]
+        var = self.var[rows]
+
+        delta = detune - mean
+        z = np.where(first, 0.0, delta / np.sqrt(var + VARIANCE_FLOOR))
+        self.mean[rows] = np.where(first, detune, mean + self.alpha * delta)
+        self.var[rows] = np.where(first, 0.0, (1 - self.alpha) * (var + self.alpha * delta ** 2))
+        self.cusum[rows] = np.maximum(0.0, self.cusum[rows] + np.abs(z) - CUSUM_K)
+        self.values[rows] = values
+        self.packets[rows] += 1
+        self.last_seen[rows] = now
+
+        drifting = (self.cusum[rows] > CUSUM_H) | (np.abs(self.mean[rows]) > DETUNE_LIMIT)
+        changed = drifting != self.drifting[rows]
+        self.drifting[rows] = drifting
+        return [
+            {
+                "event": "drift_started" if drifting[i] else "drift_cleared",
+                "validator_id": self.ids[rows[i]],
+                "detune": round(float(self.mean[rows[i]]), 6),
+                "score": round(float(self.cusum[rows[i]]), 3)
+            }
+            for i in np.flatnonzero(changed)
+        ]
+
+    def rcp(self, now=None, top=5):
+        """
+        Current Rangi Consensus Pulse over validators seen in the last STALE_AFTER s
+        stability = mean health × (0.5 + 0.5 × phase coherence) × (1 - drifting share / 2)
+        where phase coherence is the length of the mean unit phase vector
+        """
+        now = self.clock() if now is None else now
+        count = len(self.ids)
+        active = np.flatnonzero(self.last_seen[:count] >= now - STALE_AFTER)
+        pulse = {
+            "protocol": "RCP-v1",
+            "validators": len(active),
+            "stale": count - len(active),
+            "packets_seen": self.packets_seen,
+            "timestamp": datetime.now().isoformat()
+        }
+        if not len(active):
+            return {**pulse, "stability": None, "state": "No Signal"}
+
+        values = self.values[active]
+        mean_detune = self.mean[active]
+        drifting = self.drifting[active]
+        tuning = 1.0 - np.minimum(np.abs(mean_detune) / DETUNE_LIMIT, 1.0)
+        health = (HEALTH_WEIGHTS["tuning"] * tuning
+                  + HEALTH_WEIGHTS["load"] * (1.0 - np.clip(values[:, AMPLITUDE], 0.0, 1.0))
+                  + HEALTH_WEIGHTS["timbre"] * np.clip(values[:, TIMBRE], 0.0, 1.0)
+                  + HEALTH_WEIGHTS["rhythm"] * np.clip(values[:, RHYTHM], 0.0, 1.0))
+        phase = 2 * np.pi * values[:, PHASE] / PULSE_PERIOD_MS
+        coherence = math.hypot(np.mean(np.cos(phase)), np.mean(np.sin(phase)))
+        drifting_share = float(np.mean(drifting))
+        stability = float(np.mean(health)) * (0.5 + 0.5 * coherence) * (1.0 - 0.5 * drifting_share)
+
+        worst = active[np.argsort(-self.cusum[active])[:top]] if top else []
+        global_detune = float(np.mean(mean_detune))
+        return {
+            **pulse,
+            "stability": round(stability, 4),
+            "state": rcp_state(1.0 - stability),
+            "global_detune": round(global_detune, 6),
+            "pulse_frequency": round(BASE_FREQUENCY * (1.0 + global_detune), 3),
+            "amplitude": round(float(np.mean(values[:, AMPLITUDE])), 4),
+            "timbre": round(float(np.mean(values[:, TIMBRE])), 4),
+            "rhythm": round(float(np.mean(values[:, RHYTHM])), 4),
+            "phase_coherence": round(coherence, 4),
+            "drifting": int(drifting.sum()),
+            "drift_watch": [
+                {"validator_id": self.ids[row], "score": round(float(self.cusum[row]), 3),
+                 "detune": round(float(self.mean[row]), 6), "drifting": bool(self.drifting[row])}
+                for row in worst
+            ]
+        }
+
+    def validator(self, validator_id):
+        """Latest signal and drift statistics for one validator"""
+        row = self.index.get(str(validator_id))
+        if row is None:
+            raise ValueError(f"unknown validator: {validator_id}")
+        return {
+            "validator_id": self.ids[row],
+            **{field: float(value) for field, value in zip(FIELDS, self.values[row])},
+            "packets": int(self.packets[row]),
+            "detune_mean": float(self.mean[row]),
+            "detune_std": math.sqrt(float(self.var[row])),
+            "drift_score": float(self.cusum[row]),
+            "drifting": bool(self.drifting[row]),
+            "last_seen": float(self.last_seen[row])
+        }
+
+
+# Methods callable through server mode
+SERVED_METHODS = ("ingest", "rcp", "validator")
+
+
+def sample_packets(validators=1000, rounds=5, drifting=0.02, seed=432):
+    """Seeded CHS packets: `rounds` per validator, a `drifting` share detuning steadily"""
+    rng = np.random.default_rng(seed)
+    drifters = rng.random(validators) < drifting
+    packets = []
+    for n in range(rounds):
+        detune = rng.normal(0.0, 0.001, validators) + np.where(drifters, 0.006 * (n + 1), 0.0)
+        amplitude = rng.beta(2, 5, validators)
+        timbre = rng.uniform(0.7, 1.0, validators)
+        rhythm = rng.uniform(0.8, 1.0, validators)
+        phase = rng.normal(0.0, 120.0, validators)
+        packets += [
+            {
+                "validator_id": f"validator-{i:05d}",
+                "base_freq": round(BASE_FREQUENCY * (1 + detune[i]), 4),
+                "detune_ratio": round(float(detune[i]), 6),
+                "amplitude": round(float(amplitude[i]), 4),
+                "timbre": round(float(timbre[i]), 4),
+                "rhythm": round(float(rhythm[i]), 4),
+                "phase_offset": round(float(phase[i]), 2)
+            }
+            for i in range(validators)
+        ]
+    return packets
+
+
+def main(argv=None):
+    """Main execution - returns JSON for Node bridge"""
+    parser = argparse.ArgumentParser(description="RangisNet consensus pulse engine")
+    parser.add_argument("--serve", action="store_true",
+                        help="keep validator state and serve NDJSON requests")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="with --serve, listen on a Unix socket instead of stdin/stdout")
+    parser.add_argument("--validators", type=int, default=1000, help="sample network size")
+    parser.add_argument("--rounds", type=int, default=5, help="sample packets per validator")
+    parser.add_argument("--seed", type=int, default=432)
+    args = parser.parse_args(argv)
+
+    try:
+        pulse = ConsensusPulse()
+        if args.serve:
+            server = load_engine("HHPEI-engine")
+            if args.socket:
+                return server.serve_socket(pulse, args.socket, methods=SERVED_METHODS)
+            return server.serve_stdio(pulse, methods=SERVED_METHODS)
+        ingested = pulse.ingest(sample_packets(args.validators, args.rounds, seed=args.seed))
+        print(json.dumps({**pulse.rcp(), "events": len(ingested["events"])}, indent=2))
+        return 0
+    except Exception as e:
+        error_output = {
+            "error": str(e),
+            "status": "failed",
+            "timestamp": datetime.now().isoformat()
+        }
+        print(json.dumps(error_output), file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
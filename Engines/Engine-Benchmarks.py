@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+RangisNet Engine Benchmarks
+Reproducible timings for the Python engines, checked against a stored baseline
+
+Benchmarks (all inputs seeded):
+- cold_start: one-shot `HHPEI-engine.py --format json` process, launch to exit
+- full_output: generate_full_output on a warm HHPEIEngine
+- metrics_large: McCreaMetricsEngine.calculate_all over a (symbols, windows, n) batch
+- spectral_large: SpectralAnalyzer.market_data over many price series
+- agent_batch: AgentFleet.evaluate_batch, agents x scenarios
+- spend_contention: threads racing SpendLimitManager.reserve/commit
+- consensus_pulse: ConsensusPulse.ingest + rcp for a batch of CHS packets
+- order_book: OrderBook replay of a mixed submit/cancel/crossing order stream
+- prm_scoring: PRMScorer ingesting a multi-symbol tick feed, then one batched score
+
+Each benchmark reports the median seconds per run over --repeats runs. A
+benchmark regresses when it is slower than its baseline by more than the
+threshold (default 25%); baselines are machine-specific, so record one per
+box with --update-baseline before comparing.
+
+Usage:
+    python3 Engine-Benchmarks.py                     # run all, compare to baseline
+    python3 Engine-Benchmarks.py --only full_output  # run a subset
+    python3 Engine-Benchmarks.py --update-baseline   # record new baseline results
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from engine_loader import ENGINES_DIR, load_engine
+
+BASELINE_PATH = os.path.join(ENGINES_DIR, "engine-benchmarks-baseline.json")
+
+# Allowed slowdown against the baseline before a benchmark fails
+DEFAULT_THRESHOLD = 0.25
+
+SEED = 432
+
+
+def _median_seconds(run, repeats):
+    """Median wall time of `repeats` calls to run()"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def bench_cold_start(repeats):
+    command = [sys.executable, os.path.join(ENGINES_DIR, "HHPEI-engine.py"),
+               "--format", "json", "--seed", str(SEED)]
+
+    def run():
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, cwd=ENGINES_DIR)
+
+    return {"seconds": _median_seconds(run, repeats), "ops": 1}
+
+
+def bench_full_output(repeats, iterations=200):
+    engine = load_engine("HHPEI-engine").HHPEIEngine(seed=SEED)
+    engine.generate_full_output()  # Warm caches and lazy imports
+
+    def run():
+        for _ in range(iterations):
+            engine.generate_full_output(include_static=False)
+
+    return {"seconds": _median_seconds(run, repeats), "ops": iterations}
+
+
+def bench_metrics_large(repeats, symbols=512, windows=16):
+    metrics = load_engine("McCrea-MetricsEngine")
+    inputs = metrics.sample_inputs(symbols=symbols, windows=windows, bins=256, trades=512, seed=SEED)
+    engine = metrics.McCreaMetricsEngine()
+
+    def run():
+        engine.calculate_all(inputs["market_data"], inputs["order_book"], inputs["trade_flow"])
+
+    return {"seconds": _median_seconds(run, repeats), "ops": symbols * windows}
+
+
+def bench_spectral_large(repeats, symbols=512, samples=4096):
+    spectral = load_engine("Spectral-Analysis-engine")
+    prices = spectral.sample_prices(symbols, samples, seed=SEED)
+    analyzer = spectral.SpectralAnalyzer(window=128)
+
+    def run():
+        analyzer.market_data(prices)
+
+    return {"seconds": _median_seconds(run, repeats), "ops": symbols}
+
+
+def bench_agent_batch(repeats, agents=300, scenarios=50):
+    import asyncio
+    import random
+
+    brain = load_engine("polly-agent-brain")
+    rng = random.Random(SEED)
+    market = [
+        {
+            "pair": f"SYM{i}/USDC",
+            "price": round(rng.uniform(10.0, 100.0), 4),
+            "target_price": None,
+            "prm_score": round(rng.uniform(0.4, 1.0), 4),
+            "harmonic_freq": rng.choice((432, 528, 639, 741)),
+            "amount": 0.01,
+        }
+        for i in range(scenarios)
+    ]
+    for scenario in market:
+        scenario["target_price"] = round(scenario["price"] * rng.uniform(0.96, 1.06), 4)
+    personalities = tuple(brain.PERSONALITY_THRESHOLDS)
+
+    def run():
+        # Fresh agents per run, so every run starts from empty spend budgets
+        fleet = brain.AgentFleet([
+            brain.RangisAgent(f"bench-{i:04d}", personalities[i % len(personalities)])
+            for i in range(agents)
+        ])
+        asyncio.run(fleet.evaluate_batch(market))
+
+    return {"seconds": _median_seconds(run, repeats), "ops": agents * scenarios}
+
+
+def bench_spend_contention(repeats, workers=8, operations=1000):
+    brain = load_engine("polly-agent-brain")
+    committed = []
+
+    def run():
+        result = brain.benchmark_spend_contention(workers=workers, operations=operations)
+        committed.append(result)
+
+    seconds = _median_seconds(run, repeats)
+    return {"seconds": seconds, "ops": workers * operations,
+            "limit_held": all(r["limit_held"] for r in committed)}
+
+
+def bench_consensus_pulse(repeats, validators=5000, rounds=4):
+    pulse_engine = load_engine("Consensus-Pulse-engine")
+    packets = pulse_engine.sample_packets(validators, rounds, seed=SEED)
+
+    def run():
+        pulse = pulse_engine.ConsensusPulse(clock=lambda: 0.0)
+        pulse.ingest(packets)
+        pulse.rcp()
+
+    return {"seconds": _median_seconds(run, repeats), "ops": len(packets)}
+
+
+def bench_order_book(repeats, operations=200000):
+    order_book = load_engine("Order-Book-engine")
+    stream = order_book.sample_operations(operations, seed=SEED)
+
+    def run():
+        order_book.replay(stream)
+
+    return {"seconds": _median_seconds(run, repeats), "ops": len(stream)}
+
+
+def bench_prm_scoring(repeats, symbols=64, ticks=50000):
+    prm = load_engine("PRM-Scoring-engine")
+    feed = load_engine("Market-Ingestion-engine").sample_ticks(symbols, ticks, seed=SEED)
+
+    def run():
+        scorer = prm.PRMScorer()
+        scorer.ingest(feed)
+        scorer.scores()
+
+    return {"seconds": _median_seconds(run, repeats), "ops": len(feed)}
+
+
+BENCHMARKS = {
+    "cold_start": bench_cold_start,
+    "full_output": bench_full_output,
+    "metrics_large": bench_metrics_large,
+    "spectral_large": bench_spectral_large,
+    "agent_batch": bench_agent_batch,
+    "spend_contention": bench_spend_contention,
+    "consensus_pulse": bench_consensus_pulse,
+    "order_book": bench_order_book,
+    "prm_scoring": bench_prm_scoring,
+}
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def run_benchmarks(names=None, repeats=5):
+    """Run the named benchmarks (default: all), {name: {"seconds", "ops", "ops_per_sec", ...}}"""
+    results = {}
+    for name in names or BENCHMARKS:
+        result = BENCHMARKS[name](repeats)
+        result["ops_per_sec"] = result["ops"] / result["seconds"] if result["seconds"] > 0 else float("inf")
+        results[name] = result
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Verdict per benchmark against the baseline
+    ratio = seconds / baseline seconds; "regressed" when ratio > 1 + threshold
+    """
+    recorded = (baseline or {}).get("results", {})
+    verdicts = {}
+    for name, result in results.items():
+        reference = recorded.get(name)
+        if reference is None:
+            verdicts[name] = {"status": "no-baseline"}
+            continue
+        ratio = result["seconds"] / reference["seconds"]
+        if result.get("limit_held") is False:
+            status = "failed"
+        elif ratio > 1.0 + threshold:
+            status = "regressed"
+        else:
+            status = "ok"
+        verdicts[name] = {"status": status, "ratio": round(ratio, 3),
+                          "baseline_seconds": reference["seconds"]}
+    return verdicts
+
+
+def environment():
+    import numpy as np
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RangisNet engine benchmarks")
+    parser.add_argument("--only", nargs="+", choices=tuple(BENCHMARKS), metavar="NAME",
+                        help=f"benchmarks to run: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown against the baseline (0.25 = 25%%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, metavar="PATH")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store these results as the new baseline instead of comparing")
+    args = parser.parse_args(argv)
+
+    try:
+        results = run_benchmarks(args.only, args.repeats)
+        report = {
+            "timestamp": datetime.now().isoformat(),
+            "environment": environment(),
+            "results": results,
+        }
+        if args.update_baseline:
+            baseline = load_baseline(args.baseline) or {}
+            report["results"] = {**baseline.get("results", {}), **results}
+            with open(args.baseline, "w") as f:
+                json.dump(report, f, indent=2)
+                f.write("\n")
+            print(json.dumps({"baseline": args.baseline, "results": results}, indent=2))
+            return 0
+
+        verdicts = compare(results, load_baseline(args.baseline), args.threshold)
+        report["threshold"] = args.threshold
+        report["verdicts"] = verdicts
+        report["passed"] = all(v["status"] in ("ok", "no-baseline") for v in verdicts.values())
+        print(json.dumps(report, indent=2))
+        return 0 if report["passed"] else 1
+    except Exception as e:
+        error_output = {
+            "error": str(e),
+            "status": "failed",
+            "timestamp": datetime.now().isoformat()
+        }
+        print(json.dumps(error_output), file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
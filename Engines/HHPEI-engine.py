@@ -9,13 +9,377 @@ This engine converts market states into multi-sensory cognition:
 - Haptic: Probability-Tactile-Execution patterns
 - Phonic: Sonic market signatures (528Hz harmony)
 - Tensor: 5D probability space snapshots
+
+Usage:
+    python3 HHPEI-engine.py                      # one-shot JSON payload
+    python3 HHPEI-engine.py --serve              # NDJSON requests on stdin/stdout
+    python3 HHPEI-engine.py --serve --socket P   # NDJSON over a Unix socket at P
+    python3 HHPEI-engine.py --serve --snapshot-ttl 0.5  # per-symbol snapshots cached per 0.5 s
+    python3 HHPEI-engine.py --stats prometheus   # stage timings on stderr
+    RANGIS_PROFILE=cpu python3 HHPEI-engine.py   # cProfile report on stderr
+    python3 HHPEI-engine.py --profile-startup    # import-time breakdown of a one-shot run
+
+Startup is kept light for per-request launches: NumPy, argparse and the
+sibling engines are imported only on the paths that use them. Launching via
+`python3 engine_loader.py HHPEI-engine [args]` also skips compiling this file.
 """
 
+import functools
 import json
 import sys
 import math
 import random
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
+from types import SimpleNamespace
+
+from engine_instrumentation import INSTRUMENTATION, PROFILE_ENV, count, profile_from_env, stage
+
+# Payload sections that never change between calls; clients may fetch them
+# once (method "static_sections") and request payloads with include_static=False
+STATIC_VERSION = "HHPEI-static-v1"
+STATIC_SECTIONS = {
+    "patent": {
+        "system": "McCrea Quantum Modular System",
+        "method": "Crypto Clashers - Market-to-Felt Transformation",
+        "filing_date": "2025-08",
+        "claim": "432Hz harmonic economic interpretation"
+    },
+    "revolution": {
+        "status": "active",
+        "deployment": "hack2build-x402-hackathon",
+        "mission": "First Harmonic Economic Interpreter",
+        "foundation": "sensory cognition for autonomous agents"
+    }
+}
+
+# Output encodings: pretty/json are the dict payload as JSON, columnar turns
+# ladders and tensors into one array per field, msgpack is columnar MessagePack
+OUTPUT_FORMATS = ("pretty", "json", "columnar", "msgpack")
+
+# Distinct volatilities kept per ladder by the harmonics LRU cache
+HARMONICS_CACHE_SIZE = 1024
+# Volatility is rounded to this many decimals before cache lookup
+VOLATILITY_PRECISION = 4
+
+
+# Payloads per symbol are reused for the rest of their SNAPSHOT_TTL-second
+# time bucket; at most SNAPSHOT_CACHE_SIZE are kept (least recently used go first)
+SNAPSHOT_TTL = 1.0
+SNAPSHOT_CACHE_SIZE = 1024
+
+
+# Equal temperament around A4 = 432 Hz (natural tuning) instead of 440 Hz
+A4_FREQUENCY = 432.0
+A4_MIDI = 69
+NOTE_NAMES = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")
+# Precomputed labels for MIDI notes 0..127 (C-1 .. G9)
+NOTE_LABELS = tuple(f"{NOTE_NAMES[midi % 12]}{midi // 12 - 1}" for midi in range(128))
+
+
+def freq_to_pitch(freq):
+    """
+    Nearest equal-tempered note for a frequency
+    Returns (note name, octave, cents offset from that note); all three are
+    None outside the NOTE_LABELS range (MIDI 0..127), as in label_frequencies
+    """
+    if freq <= 0:
+        raise ValueError("frequency must be positive")
+    semitones = A4_MIDI + 12 * math.log2(freq / A4_FREQUENCY)
+    midi = int(round(semitones))
+    if not 0 <= midi < len(NOTE_LABELS):
+        return None, None, None
+    return NOTE_NAMES[midi % 12], midi // 12 - 1, round(100 * (semitones - midi), 2)
+
+
+def freq_to_note(freq):
+    """Convert frequency to musical note label, e.g. 432 Hz -> A4 (None out of range)"""
+    name, octave, _ = freq_to_pitch(freq)
+    return None if name is None else f"{name}{octave}"
+
+
+def label_frequencies(frequencies):
+    """
+    Vectorized note labelling for whole arrays (ladders, FFT peak lists)
+    Returns {"note": labels, "midi": int array, "octave": int array, "cents": float array}
+    shaped like the input; labels come from the NOTE_LABELS table. Outside
+    that range the note is None and midi/octave/cents are masked (masked
+    arrays, so .tolist() gives None), matching freq_to_pitch
+    """
+    import numpy as np
+
+    freqs = np.asarray(frequencies, dtype=np.float64)
+    if np.any(freqs <= 0):
+        raise ValueError("frequencies must be positive")
+    semitones = A4_MIDI + 12 * np.log2(freqs / A4_FREQUENCY)
+    midi = np.rint(semitones).astype(np.int64)
+    in_table = (midi >= 0) & (midi < len(NOTE_LABELS))
+    table = np.array(NOTE_LABELS, dtype=object)
+    labels = np.where(in_table, table[np.clip(midi, 0, len(NOTE_LABELS) - 1)], None)
+    out_of_table = ~in_table
+    return {
+        "note": labels.tolist(),
+        "midi": np.ma.masked_array(midi, mask=out_of_table),
+        "octave": np.ma.masked_array(midi // 12 - 1, mask=out_of_table),
+        "cents": np.ma.masked_array(np.round(100 * (semitones - midi), 2), mask=out_of_table)
+    }
+
+
+class HarmonicLadder:
+    """
+    Volatility-independent parts of the 7→33 harmonic ladder
+    Frequencies, decay amplitudes, phases and note labels are computed once
+    per base frequency; only the volatility scaling is applied per call
+    """
+
+    BASE_ORDERS = 7
+    EXTENDED_ORDERS = 33
+
+    def __init__(self, base_frequency, harmony_frequency):
+        self.base_frequency = base_frequency
+        self.harmony_frequency = harmony_frequency
+
+        base_orders = range(1, self.BASE_ORDERS + 1)
+        self.base_frequencies = tuple(round(base_frequency * i, 2) for i in base_orders)
+        self.base_amplitudes = tuple(1.0 / i for i in base_orders)  # Natural harmonic decay
+        base_pitches = [freq_to_pitch(base_frequency * i) for i in base_orders]
+        self.base_notes = tuple(f"{name}{octave}" for name, octave, _ in base_pitches)
+        self.base_cents = tuple(cents for _, _, cents in base_pitches)
+
+        extended_orders = range(1, self.EXTENDED_ORDERS + 1)
+        self.extended_frequencies = tuple(round(base_frequency * i, 2) for i in extended_orders)
+        self.extended_amplitudes = tuple(1.0 / math.sqrt(i) for i in extended_orders)
+        self.extended_phases = tuple(round((i * 111.11) % 360, 2) for i in extended_orders)  # Phi-based phase alignment
+
+        self._cached_harmonics = functools.lru_cache(maxsize=HARMONICS_CACHE_SIZE)(self._build_harmonics)
+
+    def harmonics(self, market_volatility):
+        """
+        Dict-shaped ladder for one (rounded) volatility
+        Built once per volatility and cached; callers get fresh dicts, so
+        mutating a result cannot leak into later ones
+        """
+        cached = self._cached_harmonics(market_volatility)
+        return {
+            **cached,
+            "base_7": [dict(entry) for entry in cached["base_7"]],
+            "extended_33": [dict(entry) for entry in cached["extended_33"]],
+        }
+
+    def _build_harmonics(self, market_volatility):
+        """Dict-shaped ladder for one (rounded) volatility (the cached original)"""
+        base_scale = 1 - market_volatility
+        extended_scale = 1 - market_volatility * 0.5
+
+        base_harmonics = [
+            {
+                "frequency": freq,
+                "amplitude": round(amplitude * base_scale, 4),
+                "note": note,
+                "cents": cents,
+                "harmonic_order": i
+            }
+            for i, (freq, amplitude, note, cents) in enumerate(
+                zip(self.base_frequencies, self.base_amplitudes, self.base_notes, self.base_cents), 1)
+        ]
+
+        extended_harmonics = [
+            {
+                "frequency": freq,
+                "amplitude": round(amplitude * extended_scale, 4),
+                "phase": phase,
+                "quantum_level": i
+            }
+            for i, (freq, amplitude, phase) in enumerate(
+                zip(self.extended_frequencies, self.extended_amplitudes, self.extended_phases), 1)
+        ]
+
+        return {
+            "base_7": base_harmonics,
+            "extended_33": extended_harmonics,
+            "base_frequency": self.base_frequency,
+            "harmony_frequency": self.harmony_frequency
+        }
+
+    def harmonics_batch(self, market_volatilities):
+        """
+        Vectorized ladders for a batch of volatilities
+        Returns NumPy arrays: amplitudes are (n, 7) and (n, 33), the
+        volatility-independent columns are shared 1-D arrays
+        """
+        import numpy as np
+
+        vol = np.asarray(market_volatilities, dtype=np.float64).reshape(-1, 1)
+        return {
+            "volatility": vol[:, 0],
+            "base_frequencies": np.array(self.base_frequencies),
+            "base_amplitudes": np.array(self.base_amplitudes) * (1 - vol),
+            "extended_frequencies": np.array(self.extended_frequencies),
+            "extended_amplitudes": np.array(self.extended_amplitudes) * (1 - vol * 0.5),
+            "extended_phases": np.array(self.extended_phases),
+            "base_frequency": self.base_frequency,
+            "harmony_frequency": self.harmony_frequency
+        }
+
+
+def make_rng(seed=None):
+    """NumPy Generator from a seed, SeedSequence or existing Generator"""
+    import numpy as np
+
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def tensor_snapshot(batch, index=0, timestamp=None):
+    """Dict view of one snapshot from calculate_probability_tensor_batch"""
+    probability = _row(batch["probability"][index])
+    variance = _row(batch["variance"][index])
+    superposition = _row(batch["superposition"][index])
+    tensor = [
+        {
+            "axis": f"D{i+1}",
+            "probability": round(p, 4),
+            "variance": round(v, 6),
+            "state": "superposition" if sup else "collapsed"
+        }
+        for i, (p, v, sup) in enumerate(zip(probability, variance, superposition))
+    ]
+    
+    return {
+        "dimensions": len(tensor),
+        "tensor": tensor,
+        "collapse_threshold": batch["collapse_threshold"],
+        "entanglement_degree": batch["entanglement_degree"],
+        "timestamp": timestamp or datetime.now().isoformat()
+    }
+
+
+def _row(values):
+    """Plain list from a NumPy row or a list"""
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+@functools.lru_cache(maxsize=None)
+def harmonic_ladder(base_frequency, harmony_frequency):
+    """Shared precomputed ladder per (base, harmony) frequency pair"""
+    return HarmonicLadder(base_frequency, harmony_frequency)
+
+
+class _Flight:
+    """One in-progress computation that concurrent callers wait on"""
+
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SnapshotCache:
+    """
+    Payload cache keyed by (symbol, time bucket)
+    A payload computed during a `ttl`-second bucket is served until that
+    bucket ends. Concurrent misses for the same key share one computation
+    (single flight). Cached payloads are shared between callers; treat them
+    as read-only. ttl <= 0 disables caching
+    """
+
+    def __init__(self, ttl=SNAPSHOT_TTL, max_entries=SNAPSHOT_CACHE_SIZE, clock=time.time):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()  # (symbol, bucket) -> (expires, payload)
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, symbol, compute):
+        """Cached payload for `symbol`, calling compute() on a miss"""
+        if self.ttl <= 0:
+            with self._lock:
+                self._count("misses")
+            return compute()
+        now = self.clock()
+        bucket = int(now // self.ttl)
+        key = (symbol, bucket)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._count("hits")
+                return entry[1]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._count("misses")
+            else:
+                self._count("coalesced")
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                self._entries[key] = ((bucket + 1) * self.ttl, flight.value)
+                self._prune(now)
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.value
+
+    def _prune(self, now):
+        # Entries are inserted in bucket order, so expired ones sit at the front
+        while self._entries:
+            expires, _ = next(iter(self._entries.values()))
+            if expires > now:
+                break
+            self._entries.popitem(last=False)
+            self._count("expirations")
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._count("evictions")
+
+    def _count(self, name):
+        # Called with the lock held
+        setattr(self, name, getattr(self, name) + 1)
+        count("snapshot." + name)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
 
 class HHPEIEngine:
     """Unified Harmonic Economic Interpreter"""
@@ -23,74 +387,74 @@ class HHPEIEngine:
     BASE_FREQUENCY = 432.0  # Hz - Natural harmonic base
     HARMONY_FREQUENCY = 528.0  # Hz - DNA repair frequency
     
-    def __init__(self):
+    COLLAPSE_THRESHOLD = 0.432  # Harmonic threshold
+    ENTANGLEMENT_DEGREE = 0.618  # Phi-based entanglement
+    
+    def __init__(self, seed=None, snapshot_ttl=SNAPSHOT_TTL, snapshot_cache_size=SNAPSHOT_CACHE_SIZE):
+        """
+        seed: int, SeedSequence or numpy Generator for the probability
+        tensor; None draws fresh OS entropy
+        snapshot_ttl / snapshot_cache_size: see SnapshotCache
+        """
         self.timestamp = datetime.now().isoformat()
+        self.seed = seed
+        self._rng = None
+        self._scheduler = None
+        self.snapshots = SnapshotCache(snapshot_ttl, snapshot_cache_size)
+    
+    @property
+    def rng(self):
+        """NumPy Generator behind the probability tensor (created on first use)"""
+        if self._rng is None:
+            self._rng = make_rng(self.seed)
+        return self._rng
         
     def calculate_market_harmonics(self, market_volatility=0.15):
         """
         Generate 7→33 harmonic ladder from market state
         Maps market frequency to musical/mathematical harmonics
         """
-        # Base 7 harmonics (fundamental economic frequencies)
-        base_harmonics = []
-        for i in range(1, 8):
-            freq = self.BASE_FREQUENCY * i
-            amplitude = 1.0 / i  # Natural harmonic decay
-            base_harmonics.append({
-                "frequency": round(freq, 2),
-                "amplitude": round(amplitude * (1 - market_volatility), 4),
-                "note": self._freq_to_note(freq),
-                "harmonic_order": i
-            })
-        
-        # Extended 33 harmonics (full quantum modular ladder)
-        extended_harmonics = []
-        for i in range(1, 34):
-            freq = self.BASE_FREQUENCY * i
-            amplitude = 1.0 / math.sqrt(i)
-            phase = (i * 111.11) % 360  # Phi-based phase alignment
-            extended_harmonics.append({
-                "frequency": round(freq, 2),
-                "amplitude": round(amplitude * (1 - market_volatility * 0.5), 4),
-                "phase": round(phase, 2),
-                "quantum_level": i
-            })
-        
-        return {
-            "base_7": base_harmonics,
-            "extended_33": extended_harmonics,
-            "base_frequency": self.BASE_FREQUENCY,
-            "harmony_frequency": self.HARMONY_FREQUENCY
-        }
+        ladder = harmonic_ladder(self.BASE_FREQUENCY, self.HARMONY_FREQUENCY)
+        return ladder.harmonics(round(float(market_volatility), VOLATILITY_PRECISION))
+
+    def calculate_market_harmonics_batch(self, market_volatilities):
+        """
+        Generate harmonic ladders for many volatilities at once
+        Array form of calculate_market_harmonics for multi-symbol polling
+        """
+        ladder = harmonic_ladder(self.BASE_FREQUENCY, self.HARMONY_FREQUENCY)
+        return ladder.harmonics_batch(market_volatilities)
     
-    def generate_haptic_pattern(self, market_state="stable"):
+    def generate_haptic_pattern(self, market_state="stable", market_data=None):
         """
         Create Probability-Tactile-Execution (PTE) haptic signature
         Converts economic state to felt vibration pattern
+        market_data ({volatility, trend, confidence}) drives the pattern
+        directly; otherwise the named state's preset inputs are used
         """
-        patterns = {
-            "stable": [50, 0, 50, 0, 100],  # Gentle pulse
-            "volatile": [100, 50, 100, 50, 150, 50, 100],  # Rapid fluctuation
-            "bullish": [30, 0, 60, 0, 90, 0, 120],  # Ascending intensity
-            "bearish": [120, 0, 90, 0, 60, 0, 30],  # Descending intensity
-            "harmonic": [111, 0, 111, 0, 111],  # Phi-resonant
-        }
-        
-        base_pattern = patterns.get(market_state, patterns["stable"])
+        from engine_loader import load_engine
+        haptics = load_engine("Haptic-Pattern-engine").HapticPatternEngine()
         
-        return {
-            "pattern": base_pattern,
-            "duration_ms": sum(base_pattern),
-            "intensity_peak": max(base_pattern),
-            "frequency_hz": 111.11,  # Phi harmonic
-            "state": market_state,
-            "encoding": "PTE-v1"
-        }
+        if market_data is None:
+            return haptics.for_state(market_state)
+        return haptics.pattern(
+            market_data.get("volatility", 0.15),
+            market_data.get("trend", 0.0),
+            market_data.get("confidence", 0.5)
+        )
+    
+    def generate_haptic_patterns(self, market_data_batch):
+        """Haptic patterns for many symbols at once (see generate_haptic_pattern)"""
+        from engine_loader import load_engine
+        return load_engine("Haptic-Pattern-engine").HapticPatternEngine().patterns(market_data_batch)
     
     def generate_sonic_signature(self, market_data=None):
         """
         Create phonic market signature using 528Hz DNA harmony
         Multi-frequency sonic encoding of economic state
+        - trend bends the whole ladder by up to an octave (12 semitones per unit)
+        - volatility drives tremolo depth and rate
+        - price level brightens the upper partials
         """
         # Default market simulation
         if market_data is None:
@@ -99,13 +463,18 @@ class HHPEIEngine:
                 "volatility": 0.15,
                 "trend": 0.05
             }
+        price = float(market_data.get("price", 100.0))
+        volatility = min(max(float(market_data.get("volatility", 0.15)), 0.0), 1.0)
+        trend = min(max(float(market_data.get("trend", 0.0)), -1.0), 1.0)
         
         # Generate sonic frequencies
-        fundamental = self.HARMONY_FREQUENCY  # 528 Hz
+        fundamental = self.HARMONY_FREQUENCY * 2 ** trend  # 528 Hz at zero trend
         harmonic_2 = fundamental * 2  # 1056 Hz
         sub_harmonic = fundamental / 2  # 264 Hz
         phi_frequency = fundamental * 1.618  # Golden ratio harmonic
         
+        brightness = min(max(math.log10(max(price, 1.0)) / 5, 0.0), 1.0)
+        
         return {
             "fundamental": round(fundamental, 2),
             "harmonics": [
@@ -114,41 +483,91 @@ class HHPEIEngine:
                 round(phi_frequency, 2),
                 round(sub_harmonic, 2)
             ],
+            "gains": [
+                1.0,
+                round(0.25 + 0.5 * brightness, 4),
+                round(0.15 + 0.35 * brightness, 4),
+                0.6
+            ],
+            "tremolo_hz": round(2.0 + 10.0 * volatility, 4),
+            "tremolo_depth": round(volatility, 4),
             "waveform": "sine",
             "amplitude_db": -6.0,
             "duration_ms": 1000,
             "encoding": "432-528-ladder"
         }
     
-    def calculate_probability_tensor(self, dimensions=5):
+    def render_sonic_signature(self, market_data=None, sample_rate=44100, duration_ms=None, wav_path=None):
+        """
+        Render the sonic signature to float32 PCM (1-D array)
+        market_data may also be a list of market dicts, giving one row per
+        symbol; wav_path writes mono or multi-channel 16-bit WAV
+        """
+        from engine_loader import load_engine
+        phonic = load_engine("Phonic-Synthesis-engine")
+        
+        batch = isinstance(market_data, (list, tuple))
+        signatures = [self.generate_sonic_signature(m) for m in (market_data if batch else [market_data])]
+        synth = phonic.PhonicSynthesizer(sample_rate)
+        synth.set_voices(signatures)
+        audio = synth.render(duration_ms or signatures[0]["duration_ms"])
+        if not batch:
+            audio = audio[0]
+        if wav_path:
+            phonic.write_wav(wav_path, audio, sample_rate)
+        return audio
+    
+    def calculate_probability_tensor(self, dimensions=5, seed=None, timestamp=None):
         """
         Generate 5D probability space snapshot (PTE tensor)
         Represents quantum market state distribution
+        Unseeded snapshots are drawn with the stdlib generator, so the
+        one-shot CLI path never imports NumPy
+        timestamp defaults to the time of the call
         """
-        # Simulate 5D probability distribution
-        tensor = []
-        for i in range(dimensions):
-            dimension = {
-                "axis": f"D{i+1}",
-                "probability": round(random.random(), 4),
-                "variance": round(random.random() * 0.1, 6),
-                "state": "superposition" if random.random() > 0.5 else "collapsed"
+        if seed is None and self.seed is None:
+            draws = [[random.random() for _ in range(dimensions)] for _ in range(3)]
+            batch = {
+                "probability": [draws[0]],
+                "variance": [[v * 0.1 for v in draws[1]]],
+                "superposition": [[v > 0.5 for v in draws[2]]],
+                "collapse_threshold": self.COLLAPSE_THRESHOLD,
+                "entanglement_degree": self.ENTANGLEMENT_DEGREE
             }
-            tensor.append(dimension)
-        
+        else:
+            batch = self.calculate_probability_tensor_batch(1, dimensions, seed)
+        return tensor_snapshot(batch, 0, timestamp)
+    
+    def calculate_probability_tensor_batch(self, snapshots=1, dimensions=5, seed=None, dtype="float64"):
+        """
+        Generate many tensor snapshots in one vectorized draw
+        Returns compact arrays shaped (snapshots, dimensions); use
+        tensor_snapshot() for the dict view of a single snapshot.
+        seed: overrides the engine's generator for a reproducible batch
+        """
+        rng = make_rng(seed) if seed is not None else self.rng
+        draws = rng.random((3, snapshots, dimensions), dtype=dtype)
         return {
-            "dimensions": dimensions,
-            "tensor": tensor,
-            "collapse_threshold": 0.432,  # Harmonic threshold
-            "entanglement_degree": 0.618,  # Phi-based entanglement
-            "timestamp": self.timestamp
+            "probability": draws[0],
+            "variance": draws[1] * 0.1,
+            "superposition": draws[2] > 0.5,
+            "collapse_threshold": self.COLLAPSE_THRESHOLD,
+            "entanglement_degree": self.ENTANGLEMENT_DEGREE
         }
     
-    def calculate_mccrea_metrics(self):
+    def calculate_mccrea_metrics(self, market_data=None, order_book=None, trade_flow=None):
         """
         Core McCrea Quantum Modular System metrics
         HVI, HLI, HRI, SSS, ω, p
+        Computed by McCreaMetricsEngine when market arrays are supplied,
+        simulated otherwise
         """
+        if market_data is not None and order_book is not None and trade_flow is not None:
+            from engine_loader import load_engine
+            metrics_engine = load_engine("McCrea-MetricsEngine").McCreaMetricsEngine()
+            metrics = metrics_engine.calculate_all(market_data, order_book, trade_flow)
+            return metrics_engine.to_payload(metrics)
+
         # Simulated real-time calculations
         hvi = round(random.uniform(0.1, 0.9), 4)  # Harmonic Volatility Index
         hli = round(random.uniform(0.5, 1.0), 4)  # Harmonic Liquidity Index
@@ -167,55 +586,427 @@ class HHPEIEngine:
             "composite_health": round((hli + sss + hri) / 3, 4)
         }
     
+    def compute_many(self, symbols, volatilities=None, prices=None, dimensions=5, processes=None, seed=None):
+        """
+        Harmonics, probability tensors and McCrea metrics for many symbols,
+        sharded across worker processes (see Symbol-Scheduler-engine.py)
+        prices: optional (symbols, samples) series for computed spectral
+        metrics; simulated metrics otherwise. Returns arrays, one row per
+        symbol; results do not depend on `processes`
+        """
+        from engine_loader import load_engine
+        scheduler_engine = load_engine("Symbol-Scheduler-engine")
+
+        if self._scheduler is not None and processes is not None and processes != self._scheduler.processes:
+            self.close()
+        if self._scheduler is None:
+            self._scheduler = scheduler_engine.SymbolScheduler(processes)
+        return self._scheduler.compute_many(self, symbols, volatilities, prices, dimensions, seed)
+
+    def close(self):
+        """Shut down the compute_many() worker pool, if one was started"""
+        if self._scheduler is not None:
+            self._scheduler.close()
+            self._scheduler = None
+    
     def _freq_to_note(self, freq):
-        """Convert frequency to musical note (simplified)"""
-        notes = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
-        # Simplified mapping (A4 = 440Hz standard)
-        # Our system uses A4 = 432Hz (natural tuning)
-        if freq < 250:
-            return "C3"
-        elif freq < 500:
-            return "C4"
-        elif freq < 1000:
-            return "C5"
-        else:
-            return "C6"
+        """Convert frequency to musical note label (A4 = 432 Hz)"""
+        return freq_to_note(freq)
     
-    def generate_full_output(self):
+    def generate_full_output(self, include_static=True, symbol=None):
         """
         Generate complete HHPEI sensory payload
         This is the revolutionary output format
+        include_static=False replaces the patent/revolution blocks with a
+        "static" version reference (see STATIC_SECTIONS)
+        Each section is timed as an "hhpei.<section>" stage (see stats())
+        The payload is stamped with the time it was generated
         """
-        return {
+        timestamp = datetime.now().isoformat()
+        output = {
             "protocol": "HHPEI-v1",
-            "timestamp": self.timestamp,
+            "timestamp": timestamp,
             "network": "avalanche-fuji",
             "payment_status": "verified",
-            "metrics": self.calculate_mccrea_metrics(),
-            "harmonics": self.calculate_market_harmonics(),
-            "haptics": self.generate_haptic_pattern("harmonic"),
-            "phonic": self.generate_sonic_signature(),
-            "tensor": self.calculate_probability_tensor(),
-            "patent": {
-                "system": "McCrea Quantum Modular System",
-                "method": "Crypto Clashers - Market-to-Felt Transformation",
-                "filing_date": "2025-08",
-                "claim": "432Hz harmonic economic interpretation"
-            },
-            "revolution": {
-                "status": "active",
-                "deployment": "hack2build-x402-hackathon",
-                "mission": "First Harmonic Economic Interpreter",
-                "foundation": "sensory cognition for autonomous agents"
-            }
         }
+        if symbol is not None:
+            output["symbol"] = symbol
+        with stage("hhpei.metrics"):
+            output["metrics"] = self.calculate_mccrea_metrics()
+        with stage("hhpei.harmonics"):
+            output["harmonics"] = self.calculate_market_harmonics()
+        with stage("hhpei.haptics"):
+            output["haptics"] = self.generate_haptic_pattern("harmonic")
+        with stage("hhpei.phonic"):
+            output["phonic"] = self.generate_sonic_signature()
+        with stage("hhpei.tensor"):
+            output["tensor"] = self.calculate_probability_tensor(timestamp=timestamp)
+        INSTRUMENTATION.count("hhpei.payloads")
+        if include_static:
+            output.update(STATIC_SECTIONS)
+        else:
+            output["static"] = STATIC_VERSION
+        return output
+
+    def snapshot(self, symbol="default", include_static=True):
+        """
+        generate_full_output for `symbol`, served from the snapshot cache
+        Requests for the same symbol within one SNAPSHOT_TTL bucket share a
+        payload; its timestamp is the time it was generated
+        """
+        payload = self.snapshots.get(symbol, lambda: self.generate_full_output(include_static=False, symbol=symbol))
+        if include_static:
+            payload = {key: value for key, value in payload.items() if key != "static"}
+            payload.update(STATIC_SECTIONS)
+        return payload
+
+    def static_sections(self):
+        """Static payload sections, fetched once by clients that omit them"""
+        return {"version": STATIC_VERSION, **STATIC_SECTIONS}
+
+    def stats(self, format="json", reset=False):
+        """
+        Stage timers and counters for this process, plus snapshot cache stats
+        format="prometheus" returns Prometheus exposition text instead of a dict
+        """
+        if format == "prometheus":
+            result = INSTRUMENTATION.prometheus()
+        else:
+            result = {**INSTRUMENTATION.snapshot(), "snapshot_cache": self.snapshots.stats()}
+        if reset:
+            INSTRUMENTATION.reset()
+        return result
+
+
+def _columns(rows):
+    """List of same-shaped dicts → dict of lists"""
+    if not rows:
+        return {}
+    return {key: [row[key] for row in rows] for key in rows[0]}
 
-def main():
+
+def columnar(payload):
+    """
+    Array layout of a payload: ladder and tensor entries become one list per
+    field ({"frequency": [...], "amplitude": [...]}) instead of a dict per row
+    """
+    payload = dict(payload)
+    harmonics = payload.get("harmonics")
+    if isinstance(harmonics, dict) and "base_7" in harmonics:
+        harmonics = dict(harmonics)
+        harmonics["base_7"] = _columns(harmonics["base_7"])
+        harmonics["extended_33"] = _columns(harmonics["extended_33"])
+        payload["harmonics"] = harmonics
+    tensor = payload.get("tensor")
+    if isinstance(tensor, dict) and isinstance(tensor.get("tensor"), list):
+        tensor = dict(tensor)
+        tensor["tensor"] = _columns(tensor["tensor"])
+        payload["tensor"] = tensor
+    return payload
+
+
+def encode_output(payload, fmt="pretty"):
+    """Encode a payload as bytes in one of OUTPUT_FORMATS"""
+    if fmt == "pretty":
+        return json.dumps(payload, indent=2).encode()
+    if fmt == "json":
+        return json.dumps(payload, separators=(",", ":")).encode()
+    if fmt == "columnar":
+        return json.dumps(columnar(payload), separators=(",", ":")).encode()
+    if fmt == "msgpack":
+        try:
+            import msgpack
+        except ImportError:
+            raise RuntimeError("msgpack output needs the msgpack package (pip install msgpack)")
+        return msgpack.packb(columnar(payload), use_bin_type=True)
+    raise ValueError(f"unknown output format: {fmt}")
+
+
+def benchmark_output_formats(iterations=500, include_static=(True, False)):
+    """
+    Payload size and encode/decode latency per output format
+    Formats whose optional dependency is missing are reported as skipped
+    """
+    import time
+
+    engine = HHPEIEngine(seed=432)
+    payload = engine.generate_full_output()
+    results = []
+    for static in include_static:
+        body = payload if static else {
+            **{k: v for k, v in payload.items() if k not in STATIC_SECTIONS}, "static": STATIC_VERSION
+        }
+        for fmt in OUTPUT_FORMATS:
+            try:
+                encoded = encode_output(body, fmt)
+            except RuntimeError as e:
+                results.append({"format": fmt, "include_static": static, "skipped": str(e)})
+                continue
+            if fmt == "msgpack":
+                import msgpack
+                decode = msgpack.unpackb
+            else:
+                decode = json.loads
+
+            started = time.perf_counter()
+            for _ in range(iterations):
+                encode_output(body, fmt)
+            encode_us = (time.perf_counter() - started) / iterations * 1e6
+
+            started = time.perf_counter()
+            for _ in range(iterations):
+                decode(encoded)
+            decode_us = (time.perf_counter() - started) / iterations * 1e6
+
+            results.append({
+                "format": fmt,
+                "include_static": static,
+                "bytes": len(encoded),
+                "encode_us": round(encode_us, 1),
+                "decode_us": round(decode_us, 1)
+            })
+    return results
+
+# Engine methods callable through server mode
+SERVED_METHODS = (
+    "generate_full_output",
+    "snapshot",
+    "calculate_market_harmonics",
+    "generate_haptic_pattern",
+    "generate_haptic_patterns",
+    "generate_sonic_signature",
+    "calculate_probability_tensor",
+    "calculate_mccrea_metrics",
+    "static_sections",
+    "stats",
+)
+
+# Served methods returning a full payload, the only results columnar() reshapes
+COLUMNAR_METHODS = ("generate_full_output", "snapshot")
+
+
+def handle_request(engine, request, methods=SERVED_METHODS):
+    """
+    Dispatch one server-mode request to the warm engine
+    methods: the engine methods clients may call (other engines reuse this
+    server with their own list)
+    Request: {"id": ..., "method": "...", "params": {...}, "format": "json"|"columnar"}
+    ("columnar" only for COLUMNAR_METHODS)
+    Response: {"id": ..., "result": ...} or {"id": ..., "error": "..."}
+    """
+    request_id = request.get("id") if isinstance(request, dict) else None
+    try:
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        method = request.get("method", "generate_full_output")
+        if method == "ping":
+            return {"id": request_id, "result": "pong"}
+        if method not in methods:
+            raise ValueError(f"unknown method: {method}")
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            raise ValueError("params must be a JSON object")
+        fmt = request.get("format") or "json"
+        if fmt not in ("json", "columnar"):
+            raise ValueError(f"unknown format: {fmt}")
+        if fmt == "columnar" and method not in COLUMNAR_METHODS:
+            raise ValueError(f"columnar format is only available for {', '.join(COLUMNAR_METHODS)}")
+        with stage("server." + method):
+            result = getattr(engine, method)(**params)
+        if fmt == "columnar":
+            result = columnar(result)
+        return {"id": request_id, "result": result}
+    except Exception as e:
+        return {"id": request_id, "error": str(e), "status": "failed"}
+
+
+def handle_line(engine, line, methods=SERVED_METHODS):
+    """Decode one NDJSON request line and encode its response line"""
+    try:
+        request = json.loads(line)
+    except ValueError as e:
+        response = {"id": None, "error": f"invalid JSON: {e}", "status": "failed"}
+    else:
+        response = handle_request(engine, request, methods)
+    return json.dumps(response, separators=(",", ":")) + "\n"
+
+
+def serve_stdio(engine, stdin=None, stdout=None, methods=SERVED_METHODS):
+    """
+    Serve newline-delimited JSON requests on stdin/stdout
+    Responses carry the request id, so callers may pipeline requests
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    for line in stdin:
+        if not line.strip():
+            continue
+        stdout.write(handle_line(engine, line, methods))
+        stdout.flush()
+    return 0
+
+
+def serve_socket(engine, socket_path, methods=SERVED_METHODS):
+    """
+    Serve newline-delimited JSON requests over a Unix socket
+    Each connection is handled concurrently against the same warm engine
+    """
+    import asyncio
+    import os
+
+    async def handle_client(reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                writer.write(handle_line(engine, line.decode(), methods).encode())
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def run():
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = await asyncio.start_unix_server(handle_client, path=socket_path)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+    return 0
+
+
+# Options of a plain one-shot run; parse_args() returns these without
+# building an argparse parser (argparse pulls in re, gettext and shutil)
+CLI_DEFAULTS = {
+    "serve": False,
+    "socket": None,
+    "seed": None,
+    "snapshot_ttl": SNAPSHOT_TTL,
+    "format": "pretty",
+    "omit_static": False,
+    "bench_formats": False,
+    "stats": None,
+    "profile": None,
+    "profile_startup": False,
+}
+
+
+def parse_args(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv:
+        return SimpleNamespace(**CLI_DEFAULTS)
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="HHPEI sensory economic engine")
+    parser.add_argument("--serve", action="store_true",
+                        help="keep one warm engine and serve NDJSON requests")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="with --serve, listen on a Unix socket instead of stdin/stdout")
+    parser.add_argument("--seed", type=int,
+                        help="seed the probability tensor for reproducible output")
+    parser.add_argument("--snapshot-ttl", type=float, metavar="SECONDS",
+                        help=f"with --serve, reuse per-symbol snapshots within this time bucket "
+                             f"(default {SNAPSHOT_TTL:g}, 0 disables)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS,
+                        help="one-shot output encoding (default: pretty JSON)")
+    parser.add_argument("--omit-static", action="store_true",
+                        help="replace the static patent/revolution sections with a version reference")
+    parser.add_argument("--bench-formats", action="store_true",
+                        help="compare payload size and encode/decode time per output format")
+    parser.add_argument("--stats", choices=("json", "prometheus"),
+                        help="print stage timings to stderr after a one-shot run")
+    parser.add_argument("--profile", choices=("cpu", "memory", "cpu,memory"),
+                        help="profile with cProfile and/or tracemalloc (also RANGIS_PROFILE)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="time a one-shot run with the other options and break down its imports")
+    parser.set_defaults(**CLI_DEFAULTS)
+    return parser.parse_args(argv)
+
+
+def profile_startup(argv=(), repeats=5, top=15):
+    """
+    Cold-start report for `HHPEI-engine.py <argv>`
+    Median wall time of fresh processes (run directly and through
+    engine_loader.py) next to a bare interpreter, plus the slowest top-level
+    imports as measured by python -X importtime
+    """
+    import os
+    import statistics
+    import subprocess
+    import time
+
+    script = os.path.abspath(__file__)
+    launcher = os.path.join(os.path.dirname(script), "engine_loader.py")
+
+    def wall_ms(command):
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    traced = subprocess.run([sys.executable, "-X", "importtime", script, *argv],
+                            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imports = []
+    for line in traced.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "top_level": not name[1:].startswith(" "),
+        })
+    top_level = [entry for entry in imports if entry.pop("top_level")]
+
+    return {
+        "command": ["HHPEI-engine.py", *argv],
+        "wall_ms": round(wall_ms([sys.executable, script, *argv]), 2),
+        # Same run through engine_loader.py, which reuses this file's cached bytecode
+        "launcher_wall_ms": round(wall_ms([sys.executable, launcher, "HHPEI-engine", *argv]), 2),
+        "interpreter_ms": round(wall_ms([sys.executable, "-c", "pass"]), 2),
+        "import_ms": round(sum(entry["cumulative_us"] for entry in top_level) / 1000, 2),
+        "modules_imported": len(imports),
+        "numpy_imported": any(entry["module"] == "numpy" for entry in imports),
+        "slowest_imports": sorted(top_level, key=lambda entry: -entry["cumulative_us"])[:top],
+    }
+
+
+def main(argv=None):
     """Main execution - returns JSON for Node bridge"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    args = parse_args(argv)
+    if args.profile_startup:
+        print(json.dumps(profile_startup([arg for arg in argv if arg != "--profile-startup"]), indent=2))
+        return 0
+    profile_from_env({PROFILE_ENV: args.profile} if args.profile else None)
     try:
-        engine = HHPEIEngine()
-        result = engine.generate_full_output()
-        print(json.dumps(result, indent=2))
+        engine = HHPEIEngine(seed=args.seed, snapshot_ttl=args.snapshot_ttl)
+        if args.serve:
+            if args.socket:
+                return serve_socket(engine, args.socket)
+            return serve_stdio(engine)
+        if args.bench_formats:
+            print(json.dumps(benchmark_output_formats(), indent=2))
+            return 0
+        result = engine.generate_full_output(include_static=not args.omit_static)
+        sys.stdout.buffer.write(encode_output(result, args.format))
+        if args.format != "msgpack":
+            sys.stdout.buffer.write(b"\n")
+        if args.stats:
+            print(INSTRUMENTATION.export(args.stats), file=sys.stderr)
         return 0
     except Exception as e:
         error_output = {
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+RangisNet Haptic Pattern Engine
+Probability-Tactile-Execution (PTE) vibration patterns from market state
+
+Patterns use the Vibration API layout [pulse, pause, pulse, ...] in ms and are
+derived from three continuous inputs:
+- confidence (0..1): pulse count and pulse strength
+- trend (-1..1): ascending (bullish) or descending (bearish) pulse ramp
+- volatility (0..1): pause length between pulses, i.e. how "rapid" it feels
+
+Inputs are snapped to a fixed grid before generation, so nearby market states
+share one memoized pattern in a bounded LRU cache.
+
+Usage:
+    python3 Haptic-Pattern-engine.py                 # pattern for a neutral market
+    python3 Haptic-Pattern-engine.py --stdin         # patterns for a JSON list of inputs
+"""
+
+import functools
+import json
+import sys
+from datetime import datetime
+
+# Grid resolution per input
+VOLATILITY_STEP = 0.05
+TREND_STEP = 0.1
+CONFIDENCE_STEP = 0.05
+
+# Quantized (volatility, trend, confidence) patterns kept in memory; the
+# default grid has 21 x 21 x 21 = 9261 cells, so all of them fit
+HAPTIC_CACHE_SIZE = 16384
+
+PULSE_FREQUENCY_HZ = 111.11  # Phi harmonic
+ENCODING = "PTE-v2"
+
+# Continuous inputs behind the named market states
+STATE_PRESETS = {
+    "stable": {"volatility": 0.0, "trend": 0.0, "confidence": 0.35},
+    "volatile": {"volatility": 0.5, "trend": 0.0, "confidence": 0.75},
+    "bullish": {"volatility": 0.0, "trend": 0.8, "confidence": 0.6},
+    "bearish": {"volatility": 0.0, "trend": -0.8, "confidence": 0.6},
+    "harmonic": {"volatility": 0.0, "trend": 0.0, "confidence": 1.0},
+}
+
+
+def _level(value, lo, hi, step):
+    """Clamp value to [lo, hi] and snap it to the grid index"""
+    return int(round((min(max(float(value), lo), hi) - lo) / step))
+
+
+@functools.lru_cache(maxsize=HAPTIC_CACHE_SIZE)
+def _pattern(volatility_level, trend_level, confidence_level):
+    volatility = volatility_level * VOLATILITY_STEP
+    trend = trend_level * TREND_STEP - 1.0
+    confidence = confidence_level * CONFIDENCE_STEP
+
+    pulses = 3 + int(round(confidence * 4))           # 3..7 pulses
+    strength = 30.0 + 81.0 * confidence               # 30..111 ms mean pulse
+    pause = int(round(100 * volatility))              # 0..100 ms between pulses
+
+    pattern = []
+    middle = (pulses - 1) / 2
+    for i in range(pulses):
+        ramp = 1.0 + trend * (i - middle) / max(middle, 1)  # Trend tilts the pulse ramp
+        if i:
+            pattern.append(pause)
+        pattern.append(max(int(round(strength * ramp)), 10))
+    return tuple(pattern)
+
+
+class HapticPatternEngine:
+    """Parametric, memoized PTE pattern generator"""
+
+    def pattern(self, volatility=0.15, trend=0.0, confidence=0.5, state=None):
+        """Haptic pattern dict for one market state"""
+        pattern = _pattern(
+            _level(volatility, 0.0, 1.0, VOLATILITY_STEP),
+            _level(trend, -1.0, 1.0, TREND_STEP),
+            _level(confidence, 0.0, 1.0, CONFIDENCE_STEP),
+        )
+        return {
+            "pattern": list(pattern),
+            "duration_ms": sum(pattern),
+            "intensity_peak": max(pattern),
+            "frequency_hz": PULSE_FREQUENCY_HZ,
+            "state": state or describe(volatility, trend),
+            "encoding": ENCODING
+        }
+
+    def for_state(self, market_state):
+        """Pattern for a named state (see STATE_PRESETS); unknown names fall back to stable"""
+        preset = STATE_PRESETS.get(market_state, STATE_PRESETS["stable"])
+        return self.pattern(state=market_state if market_state in STATE_PRESETS else "stable", **preset)
+
+    def patterns(self, inputs):
+        """
+        Patterns for a batch of symbols/agents
+        inputs: iterable of {"volatility", "trend", "confidence"} dicts
+        """
+        return [
+            self.pattern(item.get("volatility", 0.15), item.get("trend", 0.0), item.get("confidence", 0.5))
+            for item in inputs
+        ]
+
+    @staticmethod
+    def cache_info():
+        return _pattern.cache_info()._asdict()
+
+
+def describe(volatility, trend):
+    """Named state closest to the continuous inputs"""
+    if volatility >= 0.35:
+        return "volatile"
+    if trend >= 0.25:
+        return "bullish"
+    if trend <= -0.25:
+        return "bearish"
+    return "stable"
+
+
+def main(argv=None):
+    """Main execution - returns JSON for Node bridge"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="RangisNet haptic pattern engine")
+    parser.add_argument("--stdin", action="store_true",
+                        help="read a JSON list of {volatility, trend, confidence} from stdin")
+    args = parser.parse_args(argv)
+
+    try:
+        engine = HapticPatternEngine()
+        result = engine.patterns(json.load(sys.stdin)) if args.stdin else engine.pattern()
+        print(json.dumps(result))
+        return 0
+    except Exception as e:
+        error_output = {
+            "error": str(e),
+            "status": "failed",
+            "timestamp": datetime.now().isoformat()
+        }
+        print(json.dumps(error_output), file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,709 @@
+#!/usr/bin/env python3
+"""
+RangisNet Market Ingestion Engine
+asyncio market data intake feeding the metrics stream and trading agents
+
+    sources ──► normalize ──► per-symbol coalescer ──► dispatcher ──► sinks
+    (replay,                   (bounded queue,           (fan-out,      (McCrea metrics,
+     websocket)                 merges bursts)            one queue      agent fleet, ...)
+                                                          per sink)
+
+- Sources are async iterators of raw tick dicts: ReplaySource reads NDJSON
+  or CSV files, WebSocketSource reads a WebSocket feed through a shared
+  WebSocketPool (one connection per URL, reused by every source on it).
+- Ticks are normalized to {"symbol", "price", "volume", "bid", "ask", ...}.
+- While a symbol waits for dispatch, newer ticks for it are merged into the
+  pending one (last price/book, summed volume), so a burst costs one update;
+  the merged tick keeps the burst's price path in "prices" for consumers
+  that need every price (the PRM scorer's spectra).
+  The queue of pending symbols is bounded: when it is full, sources wait.
+- Each sink has its own bounded queue and worker task; a slow sink slows
+  the dispatcher only once its queue is full, and that in turn pauses sources.
+
+MockWebSocketServer serves synthetic ticks over a local WebSocket, so the
+whole path can be exercised without network access. The WebSocket client and
+server are a minimal RFC 6455 subset (text frames, ping/pong, close) built
+on asyncio streams.
+
+Usage:
+    python3 Market-Ingestion-engine.py --mock 20000           # local mock feed
+    python3 Market-Ingestion-engine.py --replay ticks.jsonl   # replay a file
+    python3 Market-Ingestion-engine.py --mock 20000 --agents 30
+"""
+
+import argparse
+import asyncio
+import base64
+import csv
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from engine_loader import load_engine
+
+# Pending symbols held by the coalescer before sources are paused
+DEFAULT_QUEUE_SIZE = 1024
+# Batches buffered per sink before the dispatcher waits for it
+DEFAULT_SINK_QUEUE_SIZE = 64
+# Most symbols handed to the sinks in one batch
+DEFAULT_BATCH_SIZE = 256
+
+# Raw field names accepted for each normalized tick field
+FIELD_ALIASES = {
+    "symbol": ("symbol", "pair", "s"),
+    "price": ("price", "p", "last"),
+    "volume": ("volume", "qty", "size", "q", "v"),
+    "bid": ("bid", "b"),
+    "ask": ("ask", "a"),
+    "bid_size": ("bid_size", "B"),
+    "ask_size": ("ask_size", "A"),
+    "timestamp": ("timestamp", "ts", "t", "time"),
+}
+NUMERIC_FIELDS = ("price", "volume", "bid", "ask")
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_CONTINUATION, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+# Listener queue marker for a connection that dropped without a close frame
+CONNECTION_LOST = object()
+
+
+def normalize_tick(raw, received=None):
+    """
+    Normalized tick from a raw feed message
+    Requires a symbol and a price or a bid/ask pair; timestamps become epoch
+    seconds (ms values and ISO strings are converted), defaulting to receipt time
+    """
+    if not isinstance(raw, dict):
+        raise ValueError(f"tick must be an object, got {type(raw).__name__}")
+    tick = {}
+    for field, aliases in FIELD_ALIASES.items():
+        for alias in aliases:
+            value = raw.get(alias)
+            if value is not None and value != "":
+                tick[field] = value
+                break
+    if "symbol" not in tick:
+        raise ValueError("tick has no symbol")
+    tick["symbol"] = str(tick["symbol"])
+    for field in NUMERIC_FIELDS:
+        if field in tick:
+            tick[field] = float(tick[field])
+    if "price" not in tick and not ("bid" in tick and "ask" in tick):
+        raise ValueError(f"tick for {tick['symbol']} has no price or bid/ask")
+
+    stamp = tick.get("timestamp")
+    if stamp is None:
+        stamp = received if received is not None else time.time()
+    elif isinstance(stamp, str) and not stamp.replace(".", "", 1).isdigit():
+        stamp = datetime.fromisoformat(stamp.replace("Z", "+00:00")).timestamp()
+    else:
+        stamp = float(stamp)
+        if stamp > 1e11:  # Milliseconds
+            stamp /= 1000.0
+    tick["timestamp"] = stamp
+    return tick
+
+
+def merge_ticks(pending, tick):
+    """
+    Fold a newer tick for the same symbol into a pending one
+    Last price and book win, volume is summed, "ticks" counts the merged
+    updates and "prices" lists every merged price, oldest first
+    """
+    volume = pending.get("volume", 0.0) + tick.get("volume", 0.0)
+    prices = pending.get("prices")
+    if prices is None:
+        prices = [pending["price"]] if "price" in pending else []
+    if "price" in tick:
+        prices.append(tick["price"])
+    pending.update(tick)
+    pending["volume"] = volume
+    pending["ticks"] = pending.get("ticks", 1) + 1
+    pending["prices"] = prices
+    return pending
+
+
+class ReplaySource:
+    """
+    Ticks from an NDJSON (.jsonl/.ndjson) or CSV file
+    speed=0 replays as fast as the pipeline accepts; speed=N replays at N×
+    the recorded pace, using the ticks' timestamps
+    """
+
+    def __init__(self, path, speed=0.0, yield_every=256):
+        self.path = path
+        self.speed = speed
+        self.yield_every = yield_every
+
+    def _rows(self, f):
+        if self.path.endswith(".csv"):
+            return csv.DictReader(f)
+        return (json.loads(line) for line in f if line.strip())
+
+    async def __aiter__(self):
+        first_stamp = started = None
+        with open(self.path, newline="") as f:
+            for i, row in enumerate(self._rows(f)):
+                if self.speed > 0:
+                    stamp = normalize_tick(row)["timestamp"]
+                    if first_stamp is None:
+                        first_stamp, started = stamp, time.monotonic()
+                    delay = (stamp - first_stamp) / self.speed - (time.monotonic() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                elif i % self.yield_every == 0:
+                    await asyncio.sleep(0)  # Let the pipeline drain between file chunks
+                yield row
+
+
+class WebSocketConnection:
+    """One client WebSocket; a single reader task fans messages out to listeners"""
+
+    def __init__(self, url, reader, writer):
+        self.url = url
+        self._reader = reader
+        self._writer = writer
+        self._listeners = set()
+        self._task = asyncio.create_task(self._read_loop())
+        self.closed = False
+
+    @classmethod
+    async def connect(cls, url, timeout=10.0):
+        parts = urlsplit(url)
+        secure = parts.scheme == "wss"
+        port = parts.port or (443 if secure else 80)
+        ssl = None
+        if secure:
+            import ssl as ssl_module
+            ssl = ssl_module.create_default_context()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parts.hostname, port, ssl=ssl), timeout)
+
+        key = base64.b64encode(os.urandom(16)).decode()
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        writer.write((
+            f"GET {target} HTTP/1.1\r\n"
+            f"Host: {parts.hostname}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ).encode())
+        headers = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+        status, _, header_block = headers.decode("latin-1").partition("\r\n")
+        if " 101 " not in f"{status} ":
+            writer.close()
+            raise ConnectionError(f"WebSocket upgrade refused: {status}")
+        fields = dict(
+            (name.strip().lower(), value.strip())
+            for name, _, value in (line.partition(":") for line in header_block.split("\r\n") if line)
+        )
+        if fields.get("sec-websocket-accept") != _accept_key(key):
+            writer.close()
+            raise ConnectionError("WebSocket upgrade returned a bad accept key")
+        return cls(url, reader, writer)
+
+    def listen(self, maxsize=DEFAULT_SINK_QUEUE_SIZE):
+        """
+        Bounded queue receiving every decoded message, then None once the peer
+        closes the connection or CONNECTION_LOST if it drops without a close frame
+        A full listener queue pauses the reader, which applies TCP backpressure
+        """
+        queue = asyncio.Queue(maxsize)
+        self._listeners.add(queue)
+        return queue
+
+    def unlisten(self, queue):
+        self._listeners.discard(queue)
+
+    async def send_json(self, message):
+        await _write_frame(self._writer, OP_TEXT, json.dumps(message).encode(), mask=True)
+
+    async def _read_loop(self):
+        end = CONNECTION_LOST
+        try:
+            async for message in _read_messages(self._reader, self._writer, mask=True):
+                for queue in list(self._listeners):
+                    await queue.put(message)
+            end = None  # Close frame received
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self._writer.close()
+        finally:
+            self.closed = True
+            for queue in list(self._listeners):
+                await queue.put(end)
+
+    async def close(self):
+        if not self.closed:
+            try:
+                await _write_frame(self._writer, OP_CLOSE, b"\x03\xe8", mask=True)
+            except ConnectionError:
+                pass
+        self._task.cancel()
+        self._writer.close()
+        self.closed = True
+
+
+class WebSocketPool:
+    """
+    Open WebSocket connections keyed by URL, shared by every source on that URL
+    A source joining a live connection sees messages from that point on
+    """
+
+    def __init__(self):
+        self._connections = {}
+        self._locks = {}
+
+    async def acquire(self, url):
+        lock = self._locks.setdefault(url, asyncio.Lock())
+        async with lock:
+            connection = self._connections.get(url)
+            if connection is None or connection.closed:
+                connection = self._connections[url] = await WebSocketConnection.connect(url)
+            return connection
+
+    async def close(self):
+        for connection in self._connections.values():
+            await connection.close()
+        self._connections.clear()
+
+
+class WebSocketSource:
+    """
+    Ticks from a WebSocket feed of JSON messages (one tick, or a list of ticks, each)
+    subscribe: message sent after connecting (and after every reconnect).
+    When the connection cannot be opened, or drops without a close frame, the
+    source reconnects with exponential backoff, giving up with ConnectionError
+    after `retries` attempts in a row that deliver no message; a close frame
+    from the server ends the feed. Messages sent while disconnected are lost.
+    Messages that are not valid JSON are skipped and counted in `invalid`
+    """
+
+    def __init__(self, url, pool=None, subscribe=None, retries=5, backoff=0.5):
+        self.url = url
+        self.pool = pool or WebSocketPool()
+        self.subscribe = subscribe
+        self.retries = retries
+        self.backoff = backoff
+        self.invalid = 0
+
+    async def __aiter__(self):
+        attempt = 0
+        while True:
+            try:
+                connection = await self.pool.acquire(self.url)
+            except (OSError, ConnectionError):
+                if attempt >= self.retries:
+                    raise
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+                attempt += 1
+                continue
+            queue = connection.listen()
+            try:
+                if self.subscribe is not None:
+                    await connection.send_json(self.subscribe)
+                while (message := await queue.get()) is not None and message is not CONNECTION_LOST:
+                    attempt = 0
+                    try:
+                        payload = json.loads(message)
+                    except json.JSONDecodeError:
+                        self.invalid += 1
+                        continue
+                    if isinstance(payload, list):
+                        for row in payload:
+                            yield row
+                    else:
+                        yield payload
+            except ConnectionError:
+                message = CONNECTION_LOST
+            finally:
+                connection.unlisten(queue)
+            if message is None:
+                return  # Feed ended cleanly
+            if attempt >= self.retries:
+                raise ConnectionError(f"WebSocket feed {self.url} dropped")
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+
+class MockWebSocketServer:
+    """
+    Local WebSocket server streaming synthetic ticks to each client
+    Messages are JSON lists of `batch` ticks; the server closes once they are sent.
+    drop_after=N cuts the first N connections after their first message,
+    without a close frame, to exercise client reconnects
+    """
+
+    def __init__(self, ticks, batch=1, host="127.0.0.1", port=0, drop_after=0):
+        self.ticks = list(ticks)
+        self.batch = batch
+        self.drop_after = drop_after
+        self.host = host
+        self.port = port
+        self._server = None
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/feed"
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    def _messages(self):
+        """Text frames sent to each client"""
+        for start in range(0, len(self.ticks), self.batch):
+            yield json.dumps(self.ticks[start:start + self.batch])
+
+    async def _handle(self, reader, writer):
+        try:
+            request = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+            key = next(line.split(":", 1)[1].strip() for line in request.split("\r\n")
+                       if line.lower().startswith("sec-websocket-key:"))
+            writer.write((
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {_accept_key(key)}\r\n\r\n"
+            ).encode())
+            drop = self.drop_after > 0
+            self.drop_after -= drop
+            for message in self._messages():
+                await _write_frame(writer, OP_TEXT, message.encode(), mask=False)
+                if drop:
+                    return
+            await _write_frame(writer, OP_CLOSE, b"\x03\xe8", mask=False)
+        except (ConnectionError, asyncio.IncompleteReadError, StopIteration):
+            pass
+        finally:
+            writer.close()
+
+
+def _accept_key(key):
+    return base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+
+
+def _apply_mask(payload, mask):
+    """XOR payload with the repeating 4-byte mask, as one big-integer operation"""
+    if not payload:
+        return payload
+    n = len(payload)
+    key = (mask * (n // 4 + 1))[:n]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(n, "big")
+
+
+async def _write_frame(writer, opcode, payload, mask):
+    n = len(payload)
+    if n < 126:
+        header = bytes([0x80 | opcode, (0x80 if mask else 0) | n])
+    elif n < 1 << 16:
+        header = bytes([0x80 | opcode, (0x80 if mask else 0) | 126]) + n.to_bytes(2, "big")
+    else:
+        header = bytes([0x80 | opcode, (0x80 if mask else 0) | 127]) + n.to_bytes(8, "big")
+    if mask:
+        key = os.urandom(4)
+        header += key
+        payload = _apply_mask(payload, key)
+    writer.write(header + payload)
+    await writer.drain()
+
+
+async def _read_messages(reader, writer, mask):
+    """Yield complete text/binary messages as str; answers pings, stops at close"""
+    fragments = []
+    while True:
+        first, second = await reader.readexactly(2)
+        fin, opcode = first & 0x80, first & 0x0F
+        n = second & 0x7F
+        if n == 126:
+            n = int.from_bytes(await reader.readexactly(2), "big")
+        elif n == 127:
+            n = int.from_bytes(await reader.readexactly(8), "big")
+        key = await reader.readexactly(4) if second & 0x80 else None
+        payload = await reader.readexactly(n)
+        if key:
+            payload = _apply_mask(payload, key)
+
+        if opcode == OP_PING:
+            await _write_frame(writer, OP_PONG, payload, mask)
+        elif opcode == OP_CLOSE:
+            return
+        elif opcode in (OP_TEXT, OP_BINARY, OP_CONTINUATION):
+            fragments.append(payload)
+            if fin:
+                yield b"".join(fragments).decode()
+                fragments = []
+
+
+class MetricsSink:
+    """Feeds ticks into a McCreaMetricsStream and keeps each symbol's latest metrics"""
+
+    def __init__(self, stream=None, window=256):
+        self.stream = stream or load_engine("McCrea-MetricsEngine").McCreaMetricsEngine().stream(window)
+        self.latest = {}
+
+    async def __call__(self, ticks):
+        update = self.stream.update
+        for tick in ticks:
+            self.latest[tick["symbol"]] = update(tick["symbol"], tick)
+
+
+def tick_market_data(tick, metrics=None):
+    """
+    Agent market_data for a tick
+    prm_score comes from the tick when the feed supplies one, otherwise from
+    the symbol's composite McCrea health when metrics are available
+    """
+    price = tick.get("price")
+    if price is None:
+        price = (tick["bid"] + tick["ask"]) / 2.0
+    prm_score = tick.get("prm_score")
+    if prm_score is None:
+        prm_score = metrics["composite_health"] if metrics else 0.5
+    return {
+        "pair": tick["symbol"],
+        "price": price,
+        "target_price": tick.get("target_price", tick.get("ask", price)),
+        "prm_score": prm_score,
+        "volatility": metrics["HVI"] if metrics else 0.0,
+        "amount": tick.get("amount", 0.01),
+    }
+
+
+class AgentSink:
+    """
+    Evaluates every agent against each batch of ticks with AgentFleet.evaluate_batch
+    on_decisions(result) receives each fleet result; metrics (a MetricsSink)
+    enriches market_data with the symbol's latest McCrea metrics; scorer (a
+    PRMScorer) is fed each batch first and computes the batch's PRM scores.
+    Fleet verdicts only screen spend limits, so no budget is held between
+    batches; book the trades acted on with RangisAgent.record_trade
+    """
+
+    def __init__(self, agents, metrics=None, on_decisions=None, scorer=None):
+        self.fleet = load_engine("polly-agent-brain").AgentFleet(agents, prm_scorer=scorer)
+        self.scorer = scorer
+        self.metrics = metrics
+        self.on_decisions = on_decisions
+        self.evaluations = 0
+        self.approved = 0
+
+    async def __call__(self, ticks):
+        if self.scorer is not None:
+            self.scorer.ingest(ticks)
+        latest = self.metrics.latest if self.metrics else {}
+        scenarios = [tick_market_data(tick, latest.get(tick["symbol"])) for tick in ticks]
+        result = await self.fleet.evaluate_batch(scenarios)
+        self.evaluations += result["evaluations"]
+        self.approved += result["approved"]
+        if self.on_decisions:
+            self.on_decisions(result)
+
+
+class MarketDataIngestor:
+    """
+    Runs sources into sinks through the coalescing, backpressured pipeline
+    Sinks are async callables taking a list of normalized ticks
+    """
+
+    def __init__(self, queue_size=DEFAULT_QUEUE_SIZE, sink_queue_size=DEFAULT_SINK_QUEUE_SIZE,
+                 batch_size=DEFAULT_BATCH_SIZE, coalesce=True):
+        self.sources = []
+        self.sinks = []
+        self.queue_size = queue_size
+        self.sink_queue_size = sink_queue_size
+        self.batch_size = batch_size
+        self.coalesce = coalesce
+        self.latest = {}  # Last dispatched tick per symbol
+        self.stats = {"received": 0, "invalid": 0, "coalesced": 0, "dispatched": 0, "batches": 0}
+        self._pending = {}
+
+    def add_source(self, source):
+        self.sources.append(source)
+        return source
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        return sink
+
+    def market_data(self, symbol):
+        """Latest {price, bid, ask, volume, ...} for a symbol, e.g. for generate_sonic_signature"""
+        return dict(self.latest[symbol])
+
+    async def _pump(self, source, queue):
+        skipped = getattr(source, "invalid", 0)  # Messages the source dropped itself
+        try:
+            await self._pump_ticks(source, queue)
+        finally:
+            self.stats["invalid"] += getattr(source, "invalid", 0) - skipped
+
+    async def _pump_ticks(self, source, queue):
+        async for raw in source:
+            self.stats["received"] += 1
+            try:
+                tick = normalize_tick(raw)
+            except (ValueError, TypeError):
+                self.stats["invalid"] += 1
+                continue
+            symbol = tick["symbol"]
+            if self.coalesce:
+                pending = self._pending.get(symbol)
+                if pending is not None:
+                    merge_ticks(pending, tick)
+                    self.stats["coalesced"] += 1
+                    continue
+                self._pending[symbol] = tick
+                await queue.put(symbol)  # Waits while queue_size symbols are pending
+            else:
+                await queue.put(tick)
+
+    async def _dispatch(self, queue, sink_queues):
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < self.batch_size and not queue.empty():
+                item = queue.get_nowait()
+                if item is None:
+                    queue.put_nowait(None)
+                    break
+                batch.append(item)
+            ticks = [self._pending.pop(symbol) for symbol in batch] if self.coalesce else batch
+            for tick in ticks:
+                self.latest[tick["symbol"]] = tick
+            self.stats["dispatched"] += len(ticks)
+            self.stats["batches"] += 1
+            for sink_queue in sink_queues:
+                await sink_queue.put(ticks)
+        for sink_queue in sink_queues:
+            await sink_queue.put(None)
+
+    @staticmethod
+    async def _drain(sink, sink_queue):
+        while (ticks := await sink_queue.get()) is not None:
+            await sink(ticks)
+
+    async def run(self):
+        """Ingest until every source is exhausted and every sink has caught up"""
+        queue = asyncio.Queue(self.queue_size)
+        sink_queues = [asyncio.Queue(self.sink_queue_size) for _ in self.sinks]
+        started = time.perf_counter()
+        consumers = [asyncio.create_task(self._drain(sink, sink_queue))
+                     for sink, sink_queue in zip(self.sinks, sink_queues)]
+        dispatcher = asyncio.create_task(self._dispatch(queue, sink_queues))
+        try:
+            await asyncio.gather(*(self._pump(source, queue) for source in self.sources))
+            await queue.put(None)
+            await dispatcher
+            await asyncio.gather(*consumers)
+        finally:
+            for task in (dispatcher, *consumers):
+                task.cancel()
+        elapsed = time.perf_counter() - started
+        return {
+            **self.stats,
+            "symbols": len(self.latest),
+            "elapsed_s": elapsed,
+            "ticks_per_sec": self.stats["received"] / elapsed if elapsed > 0 else float("inf"),
+        }
+
+
+def sample_ticks(symbols=8, count=10000, seed=528):
+    """Seeded random-walk trade/book ticks across `symbols` symbols"""
+    rng = random.Random(seed)
+    prices = {f"SYM{i}/USDC": rng.uniform(10.0, 100.0) for i in range(symbols)}
+    names = list(prices)
+    started = 1_765_000_000.0
+    ticks = []
+    for i in range(count):
+        symbol = rng.choice(names)
+        price = prices[symbol] = prices[symbol] * (1.0 + rng.gauss(0.0, 0.001))
+        spread = price * rng.uniform(1e-4, 1e-3)
+        ticks.append({
+            "symbol": symbol,
+            "price": round(price, 6),
+            "volume": round(rng.uniform(0.1, 10.0), 4),
+            "bid": round(price - spread / 2, 6),
+            "ask": round(price + spread / 2, 6),
+            "bid_size": round(rng.uniform(1.0, 50.0), 3),
+            "ask_size": round(rng.uniform(1.0, 50.0), 3),
+            "timestamp": started + i * 0.001,
+        })
+    return ticks
+
+
+async def run_ingestion(replay=None, speed=0.0, mock=0, symbols=8, agents=0, coalesce=True, seed=528):
+    """CLI pipeline: one source into a metrics sink and, optionally, an agent fleet on computed PRM scores"""
+    ingestor = MarketDataIngestor(coalesce=coalesce)
+    metrics = ingestor.add_sink(MetricsSink())
+    fleet = None
+    if agents:
+        brain = load_engine("polly-agent-brain")
+        personalities = tuple(brain.PERSONALITY_THRESHOLDS)
+        fleet = ingestor.add_sink(AgentSink(
+            [brain.RangisAgent(f"ingest-{i:03d}", personalities[i % len(personalities)])
+             for i in range(agents)],
+            metrics=metrics,
+            scorer=load_engine("PRM-Scoring-engine").PRMScorer(),
+        ))
+
+    if replay:
+        ingestor.add_source(ReplaySource(replay, speed))
+        stats = await ingestor.run()
+    else:
+        async with MockWebSocketServer(sample_ticks(symbols, mock, seed), batch=64) as server:
+            pool = WebSocketPool()
+            ingestor.add_source(WebSocketSource(server.url, pool))
+            try:
+                stats = await ingestor.run()
+            finally:
+                await pool.close()
+
+    result = {"ingestion": stats, "metrics": metrics.latest}
+    if fleet:
+        result["agents"] = {"evaluations": fleet.evaluations, "approved": fleet.approved}
+    return result
+
+
+def main(argv=None):
+    """Main execution - returns JSON for Node bridge"""
+    parser = argparse.ArgumentParser(description="RangisNet market ingestion engine")
+    parser.add_argument("--replay", metavar="PATH", help="replay ticks from an NDJSON or CSV file")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="with --replay, pace at N× recorded time (0 = as fast as possible)")
+    parser.add_argument("--mock", type=int, default=10000, metavar="TICKS",
+                        help="stream this many synthetic ticks from a local mock WebSocket")
+    parser.add_argument("--symbols", type=int, default=8, help="symbols in the mock feed")
+    parser.add_argument("--agents", type=int, default=0, help="also evaluate this many agents per batch")
+    parser.add_argument("--no-coalesce", action="store_true", help="dispatch every tick individually")
+    args = parser.parse_args(argv)
+
+    try:
+        result = asyncio.run(run_ingestion(
+            args.replay, args.speed, args.mock, args.symbols, args.agents, not args.no_coalesce
+        ))
+        print(json.dumps(result))
+        return 0
+    except Exception as e:
+        error_output = {
+            "error": str(e),
+            "status": "failed",
+            "timestamp": datetime.now().isoformat()
+        }
+        print(json.dumps(error_output), file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,424 @@
+#!/usr/bin/env python3
+"""
+McCrea Quantum Modular System - Metrics Engine
+RangisNet Harmonic Market Metrics
+
+Computes the six McCrea metrics from real market arrays:
+- HVI: Harmonic Volatility Index (spectral spread x amplitude instability)
+- HLI: Harmonic Liquidity Index (volume consistency x spread quality x volatility buffer)
+- HRI: Harmonic Resonance Index (share of spectral power in the dominant peaks)
+- SSS: Sonic Stability Score (inverse of tick return volatility)
+- ω: Market angular frequency (2π x spectral centroid)
+- p: Probability coefficient (bid share of order book depth)
+
+Every input is a NumPy array whose LAST axis is the sample axis; any leading
+axes (symbols, time windows, ...) are batch axes, so one call evaluates a whole
+symbols x windows grid without a Python loop. Ragged batches must be padded.
+
+For live feeds, McCreaMetricsEngine.stream() returns a push-style
+McCreaMetricsStream that refreshes HVI, HLI and composite health per tick in
+constant time from ring-buffered running statistics.
+
+Usage:
+    python3 McCrea-MetricsEngine.py            # metrics for a seeded sample market
+    python3 McCrea-MetricsEngine.py --stdin    # metrics for a JSON request on stdin
+"""
+
+import argparse
+import json
+import math
+import sys
+from array import array
+from datetime import datetime
+
+import numpy as np
+
+
+def _field(data, name, default=None):
+    """Read a field from a dict-like or attribute-style market container"""
+    if isinstance(data, dict):
+        value = data.get(name, default)
+    else:
+        value = getattr(data, name, default)
+    return default if value is None else value
+
+
+def _array(data, name):
+    value = _field(data, name)
+    if value is None:
+        raise ValueError(f"missing market field: {name}")
+    return np.asarray(value, dtype=np.float64)
+
+
+def _safe_ratio(numerator, denominator):
+    """Elementwise numerator / denominator with 0 where the denominator is 0"""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    out = np.zeros(np.broadcast(numerator, denominator).shape)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+def _coefficient_of_variation(values):
+    return _safe_ratio(np.std(values, axis=-1), np.abs(np.mean(values, axis=-1)))
+
+
 class McCreaMetricsEngine:
+    """Vectorized McCrea metrics over batched market arrays"""
+
+    # Relative spread (in basis points) at which spread quality falls to 0.5
+    SPREAD_REFERENCE_BPS = 10.0
+    # Tick return volatility at which the Sonic Stability Score falls to 0.5
+    SSS_REFERENCE_VOLATILITY = 0.01
+
+    def calculate_amplitude_instability(self, market_data):
+        """Coefficient of variation of the spectral density"""
+        return _coefficient_of_variation(_array(market_data, "spectral_density"))
+
     def calculate_HVI(self, market_data):
-        frequency_std = np.std(market_data.spectral_density)
-        base_frequency = np.mean(market_data.dominant_frequencies)
+        spectral_density = _array(market_data, "spectral_density")
+        frequency_std = np.std(spectral_density, axis=-1)
+        base_frequency = np.mean(_array(market_data, "dominant_frequencies"), axis=-1)
         amplitude_var = self.calculate_amplitude_instability(market_data)
-        
-        return (frequency_std / base_frequency) * amplitude_var
-        
-    def calculate_HLI(self, order_book, trade_flow):
+
+        return _safe_ratio(frequency_std, base_frequency) * amplitude_var
+
+    def analyze_volume_patterns(self, trade_flow):
+        """Volume consistency: 1 for perfectly even trade sizes, → 0 as they scatter"""
+        return 1.0 / (1.0 + _coefficient_of_variation(_array(trade_flow, "volumes")))
+
+    def measure_spread_tightness(self, order_book):
+        """Spread quality from the top of book: 1 at zero spread, 0.5 at the reference spread"""
+        best_bid = _array(order_book, "bid_prices")[..., 0]
+        best_ask = _array(order_book, "ask_prices")[..., 0]
+        mid = (best_bid + best_ask) / 2.0
+        spread_bps = _safe_ratio(np.maximum(best_ask - best_bid, 0.0), mid) * 1e4
+        return 1.0 / (1.0 + spread_bps / self.SPREAD_REFERENCE_BPS)
+
+    def calculate_HLI(self, order_book, trade_flow, market_data=None, hvi=None):
         volume_consistency = self.analyze_volume_patterns(trade_flow)
         spread_quality = self.measure_spread_tightness(order_book)
-        volatility_buffer = 1.0 / (1.0 + self.calculate_HVI())
-        
+        if hvi is None:
+            hvi = self.calculate_HVI(market_data) if market_data is not None else 0.0
+        volatility_buffer = 1.0 / (1.0 + hvi)
+
         return volume_consistency * spread_quality * volatility_buffer
+
+    def calculate_HRI(self, market_data):
+        """Share of total spectral power held by the dominant peaks"""
+        spectral_density = _array(market_data, "spectral_density")
+        dominant = _field(market_data, "dominant_frequencies")
+        k = np.shape(dominant)[-1] if np.ndim(dominant) else 1
+        k = min(max(k, 1), spectral_density.shape[-1])
+        top = np.partition(spectral_density, -k, axis=-1)[..., -k:]
+        return _safe_ratio(np.sum(top, axis=-1), np.sum(spectral_density, axis=-1))
+
+    def calculate_SSS(self, trade_flow):
+        """Sonic Stability Score: 1 for a flat tape, 0.5 at the reference tick volatility"""
+        prices = _array(trade_flow, "prices")
+        returns = np.diff(np.log(np.maximum(prices, np.finfo(np.float64).tiny)), axis=-1)
+        volatility = np.std(returns, axis=-1) if returns.shape[-1] else np.zeros(prices.shape[:-1])
+        return 1.0 / (1.0 + volatility / self.SSS_REFERENCE_VOLATILITY)
+
+    def calculate_omega(self, market_data):
+        """Angular frequency of the spectral centroid (rad per sample by default)"""
+        spectral_density = _array(market_data, "spectral_density")
+        frequencies = _field(market_data, "frequencies")
+        if frequencies is None:
+            frequencies = np.arange(spectral_density.shape[-1]) / (2.0 * max(spectral_density.shape[-1] - 1, 1))
+        centroid = _safe_ratio(
+            np.sum(spectral_density * np.asarray(frequencies, dtype=np.float64), axis=-1),
+            np.sum(spectral_density, axis=-1),
+        )
+        return 2.0 * np.pi * centroid
+
+    def calculate_p(self, order_book):
+        """Probability coefficient: bid share of resting depth (0.5 when balanced)"""
+        bid_depth = np.sum(_array(order_book, "bid_sizes"), axis=-1)
+        ask_depth = np.sum(_array(order_book, "ask_sizes"), axis=-1)
+        total = bid_depth + ask_depth
+        return np.where(total > 0, _safe_ratio(bid_depth, total), 0.5)
+
+    def calculate_all_spectral(self, market_data):
+        """HVI, HRI and ω for a single spectrum frame, as Python floats"""
+        return (
+            float(self.calculate_HVI(market_data)),
+            float(self.calculate_HRI(market_data)),
+            float(self.calculate_omega(market_data)),
+        )
+
+    def calculate_all(self, market_data, order_book, trade_flow):
+        """
+        All six metrics plus composite health in one batched pass
+        Returns a dict of arrays shaped like the inputs' leading batch axes
+        """
+        hvi = self.calculate_HVI(market_data)
+        hli = self.calculate_HLI(order_book, trade_flow, hvi=hvi)
+        hri = self.calculate_HRI(market_data)
+        sss = self.calculate_SSS(trade_flow)
+
+        return {
+            "HVI": hvi,
+            "HLI": hli,
+            "HRI": hri,
+            "SSS": sss,
+            "omega": self.calculate_omega(market_data),
+            "p": self.calculate_p(order_book),
+            "composite_health": (hli + sss + hri) / 3,
+        }
+
+    @staticmethod
+    def to_payload(metrics, decimals=4):
+        """JSON-ready form of calculate_all output (floats or nested lists)"""
+        return {name: np.round(value, decimals).tolist() for name, value in metrics.items()}
+
+    def stream(self, window=256):
+        """Push-style per-symbol metrics over rolling windows of `window` ticks"""
+        return McCreaMetricsStream(self, window)
+
+
+class RollingStats:
+    """
+    Mean/variance over the last `window` values
+    Sliding Welford update: each push adds one value and evicts the oldest
+    from a fixed ring buffer, so updates are O(1) in time and memory
+    """
+
+    __slots__ = ("window", "count", "mean", "_m2", "_buffer", "_head")
+
+    def __init__(self, window):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._buffer = array("d", bytes(8 * window))
+        self._head = 0
+
+    def push(self, value):
+        if self.count == self.window:
+            old = self._buffer[self._head]
+            delta = value - old
+            old_mean = self.mean
+            self.mean += delta / self.window
+            self._m2 += delta * (value - self.mean + old - old_mean)
+        else:
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (value - self.mean)
+        self._buffer[self._head] = value
+        self._head = (self._head + 1) % self.window
+
+    @property
+    def variance(self):
+        """Population variance (matches np.std's default ddof=0)"""
+        return max(self._m2, 0.0) / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def cv(self):
+        """Coefficient of variation, 0 when the mean is 0"""
+        return self.std / abs(self.mean) if self.mean else 0.0
+
+
+class _SymbolState:
+    __slots__ = ("volumes", "returns", "last_price", "bid", "ask", "bid_depth", "ask_depth",
+                 "hvi", "hri", "omega", "ticks")
+
+    def __init__(self, window):
+        self.volumes = RollingStats(window)
+        self.returns = RollingStats(window)
+        self.last_price = None
+        self.bid = self.ask = None
+        self.bid_depth = self.ask_depth = 0.0
+        self.hvi = self.hri = self.omega = 0.0
+        self.ticks = 0
+
+
+class McCreaMetricsStream:
+    """
+    Incremental McCrea metrics per symbol
+    update(symbol, tick) accepts any combination of:
+    - trade:    {"price": float, "volume": float}
+    - book:     {"bid": float, "ask": float, "bid_size": float|list, "ask_size": float|list}
+    - spectrum: {"spectral_density": [...], "dominant_frequencies": [...], "frequencies": [...]}
+    Trades and book updates cost O(1); a spectrum frame costs O(bins) once and
+    sets HVI, HRI and ω until the next frame arrives.
+    """
+
+    def __init__(self, engine=None, window=256):
+        self.engine = engine or McCreaMetricsEngine()
+        self.window = window
+        self._symbols = {}
+
+    def update(self, symbol, tick):
+        """Apply one tick and return the symbol's refreshed metrics"""
+        self.push(symbol, tick)
+        return self.metrics(symbol)
+
+    def push(self, symbol, tick):
+        """Apply one tick without building the metrics dict"""
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = self._symbols[symbol] = _SymbolState(self.window)
+        state.ticks += 1
+
+        if "spectral_density" in tick:
+            frame = self.engine.calculate_all_spectral(tick)
+            state.hvi, state.hri, state.omega = frame
+
+        price = tick.get("price")
+        if price is not None and price > 0:
+            if state.last_price is not None:
+                state.returns.push(math.log(price / state.last_price))
+            state.last_price = price
+            state.volumes.push(float(tick.get("volume", 0.0)))
+
+        if tick.get("bid") is not None and tick.get("ask") is not None:
+            state.bid = float(tick["bid"])
+            state.ask = float(tick["ask"])
+            state.bid_depth = _depth(tick.get("bid_size", 0.0))
+            state.ask_depth = _depth(tick.get("ask_size", 0.0))
+
+    def set_spectral(self, symbol, hvi, hri, omega):
+        """
+        Set a symbol's spectral metrics directly, e.g. from one batched
+        calculate_HVI/HRI/omega pass over many symbols' spectra
+        """
+        state = self._symbols.get(symbol)
+        if state is None:
+            raise KeyError(symbol)
+        state.hvi, state.hri, state.omega = float(hvi), float(hri), float(omega)
+
+    def trend(self, symbol):
+        """Drift of the window's tick log returns, in standard errors of its mean"""
+        returns = self._symbols[symbol].returns
+        std = returns.std
+        return returns.mean / std * math.sqrt(returns.count) if std else 0.0
+
+    def metrics(self, symbol, decimals=4):
+        """Current metrics for a symbol without applying a tick"""
+        values = self.values(symbol)
+        ticks = values.pop("ticks")
+        return {
+            "symbol": symbol,
+            **{name: round(value, decimals) for name, value in values.items()},
+            "ticks": ticks
+        }
+
+    def values(self, symbol):
+        """Unrounded metrics for a symbol"""
+        state = self._symbols.get(symbol)
+        if state is None:
+            raise KeyError(symbol)
+        engine = self.engine
+
+        volume_consistency = 1.0 / (1.0 + state.volumes.cv)
+        spread_quality = 1.0
+        if state.bid is not None:
+            mid = (state.bid + state.ask) / 2.0
+            spread_bps = max(state.ask - state.bid, 0.0) / mid * 1e4 if mid else 0.0
+            spread_quality = 1.0 / (1.0 + spread_bps / engine.SPREAD_REFERENCE_BPS)
+        hli = volume_consistency * spread_quality / (1.0 + state.hvi)
+        sss = 1.0 / (1.0 + state.returns.std / engine.SSS_REFERENCE_VOLATILITY)
+        depth = state.bid_depth + state.ask_depth
+        p = state.bid_depth / depth if depth > 0 else 0.5
+
+        return {
+            "HVI": state.hvi,
+            "HLI": hli,
+            "HRI": state.hri,
+            "SSS": sss,
+            "omega": state.omega,
+            "p": p,
+            "composite_health": (hli + sss + state.hri) / 3,
+            "ticks": state.ticks
+        }
+
+    def symbols(self):
+        return list(self._symbols)
+
+    def reset(self, symbol=None):
+        if symbol is None:
+            self._symbols.clear()
+        else:
+            self._symbols.pop(symbol, None)
+
+
+def _depth(size):
+    if isinstance(size, (list, tuple)):
+        return float(sum(size))
+    return float(size)
+
+
+def sample_inputs(symbols=1, windows=1, bins=64, peaks=4, levels=10, trades=128, seed=432):
+    """
+    Seeded synthetic market arrays shaped (symbols, windows, n)
+    Used for the CLI sample and benchmarks, not as a market model
+    """
+    rng = np.random.default_rng(seed)
+    batch = (symbols, windows)
+
+    spectral_density = rng.gamma(2.0, 1.0, size=batch + (bins,))
+    frequencies = np.linspace(0.0, 0.5, bins)
+    dominant = np.sort(np.argsort(spectral_density, axis=-1)[..., -peaks:], axis=-1)
+
+    mid = 100.0 * np.exp(rng.normal(0.0, 0.1, size=batch + (1,)))
+    spread = mid * rng.uniform(1e-4, 2e-3, size=batch + (1,))
+    ticks = mid * 1e-4 * np.arange(levels)
+
+    prices = mid * np.exp(np.cumsum(rng.normal(0.0, 0.002, size=batch + (trades,)), axis=-1))
+
+    return {
+        "market_data": {
+            "spectral_density": spectral_density,
+            "frequencies": frequencies,
+            "dominant_frequencies": frequencies[dominant],
+        },
+        "order_book": {
+            "bid_prices": mid - spread / 2 - ticks,
+            "ask_prices": mid + spread / 2 + ticks,
+            "bid_sizes": rng.uniform(1.0, 10.0, size=batch + (levels,)),
+            "ask_sizes": rng.uniform(1.0, 10.0, size=batch + (levels,)),
+        },
+        "trade_flow": {
+            "prices": prices,
+            "volumes": rng.lognormal(0.0, 0.5, size=batch + (trades,)),
+        },
+    }
+
+
+def main(argv=None):
+    """Main execution - returns JSON for Node bridge"""
+    parser = argparse.ArgumentParser(description="McCrea metrics engine")
+    parser.add_argument("--stdin", action="store_true",
+                        help="read {market_data, order_book, trade_flow} JSON from stdin")
+    args = parser.parse_args(argv)
+
+    try:
+        inputs = json.load(sys.stdin) if args.stdin else sample_inputs(symbols=1, windows=1)
+        engine = McCreaMetricsEngine()
+        metrics = engine.calculate_all(inputs["market_data"], inputs["order_book"], inputs["trade_flow"])
+        if not args.stdin:
+            metrics = {name: value[0, 0] for name, value in metrics.items()}
+        result = engine.to_payload(metrics)
+        result["timestamp"] = datetime.now().isoformat()
+        print(json.dumps(result))
+        return 0
+    except Exception as e:
+        error_output = {
+            "error": str(e),
+            "status": "failed",
+            "timestamp": datetime.now().isoformat()
+        }
+        print(json.dumps(error_output), file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
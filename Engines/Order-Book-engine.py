@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+RangisNet Order Book Engine
+Price-time priority matching for agent-to-agent trading
+
+- Each side of a book is a dict of price levels (FIFO deques of resting
+  orders) plus a heap of level prices, so the best price is always heap[0]
+- Prices are integer ticks and quantities integer lots inside the book;
+  Exchange converts agent-facing float prices/amounts at its tick/lot size
+- Cancels are O(1): the order is zeroed in place and skipped when it reaches
+  the front of its level; levels emptied by cancels are dropped once they
+  reach the top of the heap
+- Fills execute at the resting (maker) order's price; a limit order that is
+  not filled completely rests in the book for its remaining quantity
+- Self-trade prevention: an order never fills against a resting order of the
+  same owner; that resting order is cancelled instead (newest intent wins)
+  and matching continues behind it
+
+Usage:
+    python3 Order-Book-engine.py                     # replay a seeded order stream, report ops/sec
+    python3 Order-Book-engine.py --operations 500000
+    python3 Order-Book-engine.py --serve             # NDJSON requests on stdin/stdout
+    python3 Order-Book-engine.py --serve --socket P  # NDJSON over a Unix socket at P
+
+Server methods: submit {"symbol", "side", "price", "amount", "owner"?},
+cancel {"order_id"}, quote {"symbol", "levels"?}, fills {"owner"}
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import random
+import sys
+import time
+from collections import deque
+from datetime import datetime
+
+from engine_loader import load_engine
+
+BUY = "buy"
+SELL = "sell"
+
+# Exchange price/amount grid: 0.0001 quote units per tick, 1e-6 base units per lot
+DEFAULT_TICK_SIZE = 0.0001
+DEFAULT_LOT_SIZE = 0.000001
+
+# A level's deque is compacted once cancelled orders outnumber live ones by this much
+COMPACT_SLACK = 16
+
+# Benchmark order stream: share of new orders that cross the spread, and of
+# operations that cancel a resting order
+MARKETABLE_SHARE = 0.1
+CANCEL_SHARE = 0.3
+
+
+class Order:
+    """A resting limit order; quantity is what is left to fill"""
+
+    __slots__ = ("order_id", "owner", "side", "price", "quantity")
+
+    def __init__(self, order_id, owner, side, price, quantity):
+        self.order_id = order_id
+        self.owner = owner
+        self.side = side
+        self.price = price
+        self.quantity = quantity
+
+
+class PriceLevel:
+    """Orders resting at one price, oldest first"""
+
+    __slots__ = ("orders", "volume", "live")
+
+    def __init__(self):
+        self.orders = deque()
+        self.volume = 0
+        self.live = 0
+
+
+class OrderBook:
+    """
+    Limit order book for one symbol (integer ticks and lots)
+    submit() returns (order_id, fills, cancelled); each fill is
+    (maker_order_id, maker_owner, price, quantity) and each cancelled entry
+    (order_id, quantity) is the submitter's own resting order removed by
+    self-trade prevention
+    """
+
+    def __init__(self, symbol=""):
+        self.symbol = symbol
+        self.orders = {}  # Resting orders by id
+        self._bids = {}   # price -> PriceLevel
+        self._asks = {}
+        self._bid_heap = []  # Negated prices, so the best bid is heap[0]
+        self._ask_heap = []
+        self._ids = itertools.count(1)
+        self.volume = 0  # Lots traded
+
+    def submit(self, side, price, quantity, owner=None, order_id=None):
+        """Match a limit order against the opposite side, resting any remainder"""
+        if quantity <= 0 or price <= 0:
+            raise ValueError("price and quantity must be positive")
+        if order_id is None:
+            order_id = next(self._ids)
+        elif order_id in self.orders:
+            raise ValueError(f"duplicate order id {order_id}")
+
+        fills = []
+        cancelled = []
+        remaining = quantity
+        if side == BUY:
+            heap = self._ask_heap
+            while remaining and heap and heap[0] <= price:
+                remaining = self._take(self._asks, heap, heap[0], remaining, fills, owner, cancelled)
+            if remaining:
+                self._rest(self._bids, self._bid_heap, -price, Order(order_id, owner, side, price, remaining))
+        elif side == SELL:
+            heap = self._bid_heap
+            while remaining and heap and -heap[0] >= price:
+                remaining = self._take(self._bids, heap, heap[0], remaining, fills, owner, cancelled)
+            if remaining:
+                self._rest(self._asks, self._ask_heap, price, Order(order_id, owner, side, price, remaining))
+        else:
+            raise ValueError(f"side must be '{BUY}' or '{SELL}', got {side!r}")
+
+        self.volume += quantity - remaining
+        return order_id, fills, cancelled
+
+    def _take(self, levels, heap, key, quantity, fills, owner=None, cancelled=None):
+        """
+        Fill up to `quantity` from the level at heap key `key`; returns what is left
+        Resting orders of `owner` are cancelled into `cancelled` instead of filled
+        """
+        level = levels[key]
+        price = key if key > 0 else -key
+        orders = level.orders
+        index = self.orders
+        while quantity and orders:
+            maker = orders[0]
+            available = maker.quantity
+            if not available:
+                orders.popleft()  # Cancelled
+                continue
+            if owner is not None and maker.owner == owner:
+                maker.quantity = 0
+                orders.popleft()
+                del index[maker.order_id]
+                level.live -= 1
+                level.volume -= available
+                cancelled.append((maker.order_id, available))
+                continue
+            if available <= quantity:
+                traded = available
+                maker.quantity = 0
+                orders.popleft()
+                del index[maker.order_id]
+                level.live -= 1
+            else:
+                traded = quantity
+                maker.quantity = available - quantity
+            quantity -= traded
+            level.volume -= traded
+            fills.append((maker.order_id, maker.owner, price, traded))
+        if not level.volume:
+            del levels[key]
+            heapq.heappop(heap)
+        return quantity
+
+    def _rest(self, levels, heap, key, order):
+        level = levels.get(key)
+        if level is None:
+            level = levels[key] = PriceLevel()
+            heapq.heappush(heap, key)
+        level.orders.append(order)
+        level.volume += order.quantity
+        level.live += 1
+        self.orders[order.order_id] = order
+
+    def cancel(self, order_id):
+        """Remove a resting order; returns its unfilled quantity (0 if not resting)"""
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return 0
+        if order.side == BUY:
+            levels, heap, key = self._bids, self._bid_heap, -order.price
+        else:
+            levels, heap, key = self._asks, self._ask_heap, order.price
+        level = levels[key]
+        remaining = order.quantity
+        order.quantity = 0
+        level.volume -= remaining
+        level.live -= 1
+        if len(level.orders) > 2 * level.live + COMPACT_SLACK:
+            level.orders = deque(o for o in level.orders if o.quantity)
+        self._prune(levels, heap)
+        return remaining
+
+    @staticmethod
+    def _prune(levels, heap):
+        """Drop emptied levels from the top of a side"""
+        while heap and not levels[heap[0]].volume:
+            del levels[heapq.heappop(heap)]
+
+    def best_bid(self):
+        self._prune(self._bids, self._bid_heap)
+        return -self._bid_heap[0] if self._bid_heap else None
+
+    def best_ask(self):
+        self._prune(self._asks, self._ask_heap)
+        return self._ask_heap[0] if self._ask_heap else None
+
+    def depth(self, levels=10):
+        """Best `levels` (price, volume) pairs per side"""
+        bids = heapq.nsmallest(levels, (k for k, level in self._bids.items() if level.volume))
+        asks = heapq.nsmallest(levels, (k for k, level in self._asks.items() if level.volume))
+        return {
+            "bids": [(-k, self._bids[k].volume) for k in bids],
+            "asks": [(k, self._asks[k].volume) for k in asks],
+        }
+
+
+class Exchange:
+    """
+    Order books per symbol, in agent-facing float prices and amounts
+    Makers are not on the call stack when their orders fill, so their fills
+    are queued per owner until fills(owner) collects them. Orders placed
+    with a ttl are cancelled once `clock` passes it, before the next submit.
+    Amounts are base-asset quantities; a fill's quote notional is amount x price
+    """
+
+    def __init__(self, tick_size=DEFAULT_TICK_SIZE, lot_size=DEFAULT_LOT_SIZE, clock=time.time):
+        self.tick_size = tick_size
+        self.lot_size = lot_size
+        self.clock = clock
+        self.books = {}
+        self._ids = itertools.count(1)
+        self._symbols = {}  # Resting order id -> symbol
+        self._maker_fills = {}
+        self._expiries = []  # (expires_at, order_id) heap
+
+    def book(self, symbol):
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = OrderBook(symbol)
+        return book
+
+    def submit(self, symbol, side, price, amount, owner=None, ttl=None):
+        """
+        Place a limit order for `amount` base units; the result reports
+        immediate fills, what rests and the owner's resting orders it cancelled
+        """
+        if self._expiries:
+            self.expire()
+        ticks = round(price / self.tick_size)
+        lots = round(amount / self.lot_size)
+        if ticks <= 0 or lots <= 0:
+            raise ValueError(f"price {price} and amount {amount} must be at least one tick and one lot")
+
+        book = self.book(symbol)
+        order_id, fills, cancelled = book.submit(side, ticks, lots, owner, next(self._ids))
+        for cancelled_id, _ in cancelled:
+            del self._symbols[cancelled_id]
+        filled = notional = 0
+        report = []
+        for maker_id, maker_owner, fill_ticks, fill_lots in fills:
+            filled += fill_lots
+            notional += fill_ticks * fill_lots
+            fill = {
+                "order_id": maker_id,
+                "price": fill_ticks * self.tick_size,
+                "amount": fill_lots * self.lot_size,
+            }
+            report.append({**fill, "counterparty": maker_owner})
+            if maker_id not in book.orders:
+                del self._symbols[maker_id]
+            if maker_owner is not None:
+                self._maker_fills.setdefault(maker_owner, []).append(
+                    {**fill, "symbol": symbol, "side": SELL if side == BUY else BUY, "counterparty": owner}
+                )
+        if order_id in book.orders:
+            self._symbols[order_id] = symbol
+            if ttl is not None:
+                heapq.heappush(self._expiries, (self.clock() + ttl, order_id))
+
+        return {
+            "order_id": order_id,
+            "symbol": symbol,
+            "side": side,
+            "price": ticks * self.tick_size,
+            "filled": filled * self.lot_size,
+            "remaining": (lots - filled) * self.lot_size,
+            "average_price": notional / filled * self.tick_size if filled else None,
+            "fills": report,
+            "cancelled": [
+                {"order_id": cancelled_id, "amount": cancelled_lots * self.lot_size}
+                for cancelled_id, cancelled_lots in cancelled
+            ],
+        }
+
+    def cancel(self, order_id):
+        """Cancel a resting order; returns the unfilled amount it held"""
+        symbol = self._symbols.pop(order_id, None)
+        if symbol is None:
+            return 0.0
+        return self.books[symbol].cancel(order_id) * self.lot_size
+
+    def expire(self, now=None):
+        """Cancel resting orders whose ttl has passed; returns how many were still resting"""
+        now = self.clock() if now is None else now
+        expired = 0
+        while self._expiries and self._expiries[0][0] <= now:
+            expired += self.cancel(heapq.heappop(self._expiries)[1]) > 0
+        return expired
+
+    def fills(self, owner):
+        """Fills of `owner`'s resting orders since the last call"""
+        return self._maker_fills.pop(owner, [])
+
+    def quote(self, symbol, levels=5):
+        book = self.book(symbol)
+        bid, ask = book.best_bid(), book.best_ask()
+        depth = book.depth(levels)
+        return {
+            "symbol": symbol,
+            "bid": bid * self.tick_size if bid is not None else None,
+            "ask": ask * self.tick_size if ask is not None else None,
+            "bids": [(p * self.tick_size, v * self.lot_size) for p, v in depth["bids"]],
+            "asks": [(p * self.tick_size, v * self.lot_size) for p, v in depth["asks"]],
+            "resting_orders": len(book.orders),
+        }
+
+
+SERVED_METHODS = ("submit", "cancel", "quote", "fills")
+
+
+def sample_operations(count=200000, mid=100000, spread=50, seed=528):
+    """
+    Seeded stream of ("submit", side, price, quantity) / ("cancel", order_id)
+    operations around `mid` ticks, for benchmarking. Order ids are the
+    book's own sequence, so cancels may target orders that already filled
+    """
+    rng = random.Random(seed)
+    operations = []
+    submitted = 0
+    for _ in range(count):
+        roll = rng.random()
+        if roll < CANCEL_SHARE and submitted:
+            operations.append(("cancel", rng.randint(max(1, submitted - 2000), submitted)))
+            continue
+        side = BUY if rng.random() < 0.5 else SELL
+        offset = rng.randint(1, spread)
+        if roll > 1.0 - MARKETABLE_SHARE:
+            offset = -offset  # Cross the spread
+        price = mid - offset if side == BUY else mid + offset
+        operations.append(("submit", side, price, rng.randint(1, 100)))
+        submitted += 1
+    return operations
+
+
+def replay(operations, book=None):
+    """Apply an operation stream to a book; returns (book, fills)"""
+    book = book or OrderBook()
+    submit, cancel = book.submit, book.cancel
+    fills = 0
+    for operation in operations:
+        if operation[0] == "submit":
+            fills += len(submit(operation[1], operation[2], operation[3])[1])
+        else:
+            cancel(operation[1])
+    return book, fills
+
+
+def benchmark(operations=200000, seed=528):
+    """Order operations per second over a seeded mixed stream"""
+    stream = sample_operations(operations, seed=seed)
+    started = time.perf_counter()
+    book, fills = replay(stream)
+    elapsed = time.perf_counter() - started
+    return {
+        "operations": len(stream),
+        "fills": fills,
+        "resting_orders": len(book.orders),
+        "best_bid": book.best_bid(),
+        "best_ask": book.best_ask(),
+        "elapsed_s": elapsed,
+        "ops_per_sec": len(stream) / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+def main(argv=None):
+    """Main execution - returns JSON for Node bridge"""
+    parser = argparse.ArgumentParser(description="RangisNet order book matching engine")
+    parser.add_argument("--serve", action="store_true",
+                        help="keep the books and serve NDJSON requests")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="with --serve, listen on a Unix socket instead of stdin/stdout")
+    parser.add_argument("--operations", type=int, default=200000, help="benchmark stream length")
+    parser.add_argument("--seed", type=int, default=528)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.serve:
+            server = load_engine("HHPEI-engine")
+            if args.socket:
+                return server.serve_socket(Exchange(), args.socket, methods=SERVED_METHODS)
+            return server.serve_stdio(Exchange(), methods=SERVED_METHODS)
+        print(json.dumps(benchmark(args.operations, args.seed), indent=2))
+        return 0
+    except Exception as e:
+        error_output = {
+            "error": str(e),
+            "status": "failed",
+            "timestamp": datetime.now().isoformat()
+        }
+        print(json.dumps(error_output), file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
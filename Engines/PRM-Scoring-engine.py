@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+RangisNet PRM Scoring Engine
+Computes the PRM (Probability Resonance Metric) confidence agents trade on
+from McCrea metrics and harmonic ladder features, instead of taking it from
+the caller
+
+- Per-symbol features are maintained incrementally: trades and book updates
+  feed a McCreaMetricsStream in O(1), and a short price ring per symbol
+  feeds the spectral features. Coalesced ticks (Market-Ingestion-engine)
+  count every merged update and add every merged price to the ring
+- Spectra are recomputed every `spectrum_every` ticks per symbol, for all
+  due symbols in one batched SpectralAnalyzer + McCrea pass at scoring time
+- Each symbol's feature vector is cached in a row of one NumPy matrix and
+  rebuilt only after a tick for that symbol arrives, so scoring N symbols
+  is one matrix-vector product over cached rows
+- The score is a logistic model over bounded features; directional features
+  (book imbalance, trend) are mirrored for sell-side scores
+
+Features:
+    stability         Sonic Stability Score (SSS)
+    liquidity         Harmonic Liquidity Index (HLI)
+    resonance         Harmonic Resonance Index (HRI)
+    calm              1 / (1 + HVI)
+    imbalance         2p - 1: bid share of book depth, signed
+    trend             t-statistic of the window's tick returns, /3 and clipped to ±1
+    ladder_resonance  return spectrum power at the 7 base ladder orders of its
+                      lowest dominant frequency, weighted by ladder amplitude
+    ladder_alignment  how close the dominant peaks sit to whole ladder orders
+                      of that frequency (1 = exact harmonics)
+
+Usage:
+    python3 PRM-Scoring-engine.py                        # score a seeded sample feed
+    python3 PRM-Scoring-engine.py --ticks 100000 --symbols 64
+    python3 PRM-Scoring-engine.py --serve                # NDJSON requests on stdin/stdout
+    python3 PRM-Scoring-engine.py --serve --socket P     # NDJSON over a Unix socket at P
+
+Server methods: ingest {"ticks": [...]}, score {"symbol", "side"?}, scores {"symbols"?, "side"?}
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from engine_loader import load_engine
+
+FEATURES = ("stability", "liquidity", "resonance", "calm", "imbalance", "trend",
+            "ladder_resonance", "ladder_alignment")
+# Features whose sign flips for a sell-side score
+DIRECTIONAL = ("imbalance", "trend")
+
+# Logistic model: score = 1 / (1 + exp(-(bias + weights · features)))
+PRM_WEIGHTS = {
+    "stability": 2.0,
+    "liquidity": 1.5,
+    "resonance": 1.0,
+    "calm": 1.0,
+    "imbalance": 1.0,
+    "trend": 1.0,
+    "ladder_resonance": 1.0,
+    "ladder_alignment": 1.0,
+}
+PRM_BIAS = -4.0
+
+# Score for symbols the scorer has not seen enough ticks of (it also needs
+# SPECTRUM_WINDOW + 1 prices for the spectral features)
+NEUTRAL_SCORE = 0.5
+MIN_TICKS = 32
+
+# Spectral features: prices per spectrum and ticks between recomputations
+SPECTRUM_WINDOW = 64
+SPECTRUM_EVERY = 32
+# Rolling window of the McCrea trade statistics
+METRICS_WINDOW = 256
+
+BASE_FREQUENCY = 432.0
+HARMONY_FREQUENCY = 528.0
+
+
+def ladder_features(market_data, amplitudes, max_order):
+    """
+    Ladder resonance and alignment for a batch of spectra
+    market_data is SpectralAnalyzer.market_data output ((symbols, bins) psd,
+    (symbols, peaks) dominant frequencies); amplitudes weight the base ladder
+    orders 1..len(amplitudes); peaks beyond max_order count as unaligned
+    """
+    psd = market_data["spectral_density"]
+    frequencies = market_data["frequencies"]
+    dominant = market_data["dominant_frequencies"]
+    bins = psd.shape[-1]
+    step = frequencies[1] - frequencies[0]
+
+    fundamental = dominant[:, :1]  # Peaks are ordered by frequency
+    amplitudes = np.asarray(amplitudes, dtype=np.float64)
+    orders = np.arange(1, len(amplitudes) + 1)
+    index = np.rint(fundamental * orders / step).astype(np.int64)
+    inside = index < bins
+    power = np.take_along_axis(psd, np.minimum(index, bins - 1), axis=-1) * inside
+    weight = (amplitudes * inside).sum(axis=-1)
+    peak = psd.max(axis=-1)
+    resonance = np.divide((power * amplitudes).sum(axis=-1), weight * peak,
+                          out=np.zeros(len(psd)), where=(weight * peak) > 0)
+
+    ratios = dominant / fundamental
+    nearest = np.rint(ratios)
+    alignment = np.where(nearest <= max_order, 1.0 - 2.0 * np.abs(ratios - nearest), 0.0).mean(axis=-1)
+    return resonance, alignment
+
+
+class PRMScorer:
+    """
+    Incremental per-symbol PRM scoring
+    update()/ingest() apply ticks ({"symbol"?, "price", "volume", "bid",
+    "ask", "bid_size", "ask_size"}); score()/score_batch() read the cached
+    features, refreshing only symbols that changed since the last score
+    """
+
+    def __init__(self, weights=None, bias=PRM_BIAS, window=METRICS_WINDOW,
+                 spectrum_window=SPECTRUM_WINDOW, spectrum_every=SPECTRUM_EVERY,
+                 min_ticks=MIN_TICKS, capacity=64):
+        weights = {**PRM_WEIGHTS, **(weights or {})}
+        self.weights = np.array([weights[name] for name in FEATURES])
+        self.bias = bias
+        self.min_ticks = min_ticks
+        self.spectrum_every = spectrum_every
+        self._direction = np.array([name in DIRECTIONAL for name in FEATURES])
+
+        metrics = load_engine("McCrea-MetricsEngine")
+        self.engine = metrics.McCreaMetricsEngine()
+        self.stream = metrics.McCreaMetricsStream(self.engine, window)
+        self.analyzer = load_engine("Spectral-Analysis-engine").SpectralAnalyzer(window=spectrum_window)
+        ladder = load_engine("HHPEI-engine").harmonic_ladder(BASE_FREQUENCY, HARMONY_FREQUENCY)
+        self._amplitudes = ladder.base_amplitudes
+        self._max_order = len(ladder.extended_amplitudes)
+
+        # Per-row counters are plain lists: they change on every tick, where
+        # NumPy scalar access would cost more than the update itself
+        self._rows = {}
+        self._symbols = []
+        self._ticks = []
+        self._priced = []
+        self._since_spectrum = []
+        self._dirty = set()
+        self._features = np.zeros((capacity, len(FEATURES)))
+        self._prices = np.zeros((capacity, self.analyzer.window + 1))
+
+    def _row(self, symbol):
+        row = self._rows.get(symbol)
+        if row is None:
+            row = self._rows[symbol] = len(self._symbols)
+            if row == len(self._features):
+                self._features = np.concatenate([self._features, np.zeros_like(self._features)])
+                self._prices = np.concatenate([self._prices, np.zeros_like(self._prices)])
+            self._symbols.append(symbol)
+            self._ticks.append(0)
+            self._priced.append(0)
+            self._since_spectrum.append(0)
+        return row
+
+    def update(self, symbol, tick):
+        """Apply one tick (or one coalesced tick with its "prices" path) for a symbol"""
+        row = self._row(symbol)
+        self.stream.push(symbol, tick)
+        self._ticks[row] += tick.get("ticks", 1)  # Coalesced ticks count every merged update
+        prices = tick.get("prices")
+        if prices is not None:
+            self._push_prices(row, prices)
+        else:
+            price = tick.get("price")
+            if price is not None and price > 0:
+                priced = self._priced[row]
+                self._prices[row, priced % self._prices.shape[1]] = price
+                self._priced[row] = priced + 1
+                self._since_spectrum[row] += 1
+        self._dirty.add(row)
+
+    def _push_prices(self, row, prices):
+        """Append a coalesced tick's price path to a symbol's price ring"""
+        width = self._prices.shape[1]
+        start = priced = self._priced[row]
+        for price in prices[-width:]:
+            if price > 0:
+                self._prices[row, priced % width] = price
+                priced += 1
+        self._priced[row] = priced
+        self._since_spectrum[row] += priced - start
+
+    def ingest(self, ticks):
+        """Apply a batch of ticks carrying their own "symbol" field"""
+        update = self.update
+        for tick in ticks:
+            update(tick["symbol"], tick)
+        return {"ingested": len(ticks), "symbols": len(self._symbols)}
+
+    def _refresh(self, rows):
+        """Rebuild cached feature rows whose symbols changed since they were built"""
+        dirty = self._dirty
+        if not dirty:
+            return
+        rows = sorted(dirty.intersection(rows.tolist()))
+        if not rows:
+            return
+        dirty.difference_update(rows)
+
+        width = self._prices.shape[1]
+        due = np.array([row for row in rows if self._since_spectrum[row] >= self.spectrum_every
+                        and self._priced[row] >= width], dtype=np.int64)
+        if len(due):
+            heads = np.array([self._priced[row] % width for row in due.tolist()])
+            order = (heads[:, None] + np.arange(width)) % width
+            spectra = self.analyzer.market_data(np.take_along_axis(self._prices[due], order, axis=-1))
+            hvi = self.engine.calculate_HVI(spectra)
+            hri = self.engine.calculate_HRI(spectra)
+            omega = self.engine.calculate_omega(spectra)
+            resonance, alignment = ladder_features(spectra, self._amplitudes, self._max_order)
+            for i, row in enumerate(due.tolist()):
+                self.stream.set_spectral(self._symbols[row], hvi[i], hri[i], omega[i])
+            self._features[due, FEATURES.index("ladder_resonance")] = resonance
+            self._features[due, FEATURES.index("ladder_alignment")] = alignment
+            for row in due.tolist():
+                self._since_spectrum[row] = 0
+
+        features = self._features
+        stream = self.stream
+        for row in rows:
+            symbol = self._symbols[row]
+            values = stream.values(symbol)
+            features[row, :6] = (
+                values["SSS"],
+                values["HLI"],
+                values["HRI"],
+                1.0 / (1.0 + values["HVI"]),
+                2.0 * values["p"] - 1.0,
+                min(max(stream.trend(symbol) / 3.0, -1.0), 1.0),
+            )
+
+    def features(self, symbols):
+        """Cached feature matrix for `symbols` (refreshed first), (len(symbols), len(FEATURES))"""
+        rows = np.array([self._rows[s] for s in symbols], dtype=np.int64)
+        self._refresh(rows)
+        return self._features[rows]
+
+    def score_batch(self, symbols, sides="buy", default=NEUTRAL_SCORE):
+        """
+        PRM scores for many symbols in one vectorized pass
+        sides is one side or one per symbol; symbols that are unknown or
+        still warming up (see _ready) get `default` (a scalar or one value per symbol)
+        """
+        symbols = list(symbols)
+        rows = np.array([self._rows.get(s, -1) for s in symbols], dtype=np.int64)
+        ready = np.array([row >= 0 and self._ready(row) for row in rows.tolist()], dtype=bool)
+        scores = np.broadcast_to(np.asarray(default, dtype=np.float64), (len(rows),)).copy()
+        if not ready.any():
+            return scores
+
+        live = rows[ready]
+        self._refresh(live)
+        features = self._features[live]
+        if isinstance(sides, str):
+            sign = -1.0 if sides == "sell" else 1.0
+        else:
+            sign = np.where(np.asarray(list(sides))[ready] == "sell", -1.0, 1.0)[:, None]
+        features = np.where(self._direction, features * sign, features)
+        scores[ready] = 1.0 / (1.0 + np.exp(-(features @ self.weights + self.bias)))
+        return scores
+
+    def _ready(self, row):
+        """Enough trades for the rolling stats and a full window of prices for a spectrum"""
+        return self._ticks[row] >= self.min_ticks and self._priced[row] >= self._prices.shape[1]
+
+    def score(self, symbol, side="buy"):
+        """PRM score and its features for one symbol"""
+        if symbol not in self._rows:
+            return {"symbol": symbol, "prm_score": NEUTRAL_SCORE, "ready": False, "ticks": 0}
+        ticks = self._ticks[self._rows[symbol]]
+        return {
+            "symbol": symbol,
+            "side": side,
+            "prm_score": round(float(self.score_batch([symbol], side)[0]), 4),
+            "ready": self._ready(self._rows[symbol]),
+            "ticks": ticks,
+            "features": dict(zip(FEATURES, np.round(self.features([symbol])[0], 4).tolist())),
+        }
+
+    def scores(self, symbols=None, side="buy"):
+        """{symbol: score} for the given (default: every known) symbol"""
+        symbols = list(self._symbols if symbols is None else symbols)
+        return dict(zip(symbols, np.round(self.score_batch(symbols, side), 4).tolist()))
+
+    def symbols(self):
+        return list(self._symbols)
+
+
+SERVED_METHODS = ("ingest", "score", "scores")
+
+
+def run_sample(ticks=20000, symbols=8, seed=528):
+    """Feed a seeded sample feed through a scorer; returns scores and throughput"""
+    feed = load_engine("Market-Ingestion-engine").sample_ticks(symbols, ticks, seed)
+    scorer = PRMScorer()
+    started = time.perf_counter()
+    scorer.ingest(feed)
+    ingested = time.perf_counter()
+    scores = scorer.scores()
+    finished = time.perf_counter()
+    return {
+        "scores": scores,
+        "ticks": len(feed),
+        "symbols": len(scores),
+        "ingest_s": ingested - started,
+        "score_s": finished - ingested,
+        "ticks_per_sec": len(feed) / (ingested - started) if ingested > started else float("inf"),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+def main(argv=None):
+    """Main execution - returns JSON for Node bridge"""
+    parser = argparse.ArgumentParser(description="RangisNet PRM scoring engine")
+    parser.add_argument("--serve", action="store_true",
+                        help="keep per-symbol features and serve NDJSON requests")
+    parser.add_argument("--socket", metavar="PATH",
+                        help="with --serve, listen on a Unix socket instead of stdin/stdout")
+    parser.add_argument("--ticks", type=int, default=20000, help="sample feed length")
+    parser.add_argument("--symbols", type=int, default=8, help="symbols in the sample feed")
+    parser.add_argument("--seed", type=int, default=528)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.serve:
+            server = load_engine("HHPEI-engine")
+            if args.socket:
+                return server.serve_socket(PRMScorer(), args.socket, methods=SERVED_METHODS)
+            return server.serve_stdio(PRMScorer(), methods=SERVED_METHODS)
+        print(json.dumps(run_sample(args.ticks, args.symbols, args.seed), indent=2))
+        return 0
+    except Exception as e:
+        error_output = {
+            "error": str(e),
+            "status": "failed",
+            "timestamp": datetime.now().isoformat()
+        }
+        print(json.dumps(error_output), file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
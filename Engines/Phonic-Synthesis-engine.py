@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+RangisNet Phonic Synthesis Engine
+Renders HHPEI sonic signatures to PCM audio
+
+Each voice is a sum of sine partials (528 Hz fundamental, 2nd harmonic,
+φ-harmonic and sub-harmonic by default) with a tremolo envelope. Many voices
+(one per symbol) are synthesized together as a (voices, samples) block.
+
+Since sin(φ + ωn) = sin φ·cos ωn + cos φ·sin ωn, the cos/sin of ωn over one
+chunk are tabulated once per voice set; each chunk is then a batched matrix
+product of per-partial phase weights with those tables, written into buffers
+allocated once and reused. Phases carry across chunks, so streamed audio is
+continuous.
+
+Voices come from HHPEIEngine.generate_sonic_signature(market_data), which maps
+price, volatility and trend onto pitch, brightness and tremolo.
+
+Usage:
+    python3 Phonic-Synthesis-engine.py --wav out.wav   # render the default signature
+"""
+
+import argparse
+import json
+import sys
+import wave
+from datetime import datetime
+
+import numpy as np
+
+TWO_PI = 2.0 * np.pi
+
+
+class PhonicSynthesizer:
+    """Chunked additive synthesis for a bank of voices"""
+
+    def __init__(self, sample_rate=44100, chunk_size=1024, dtype=np.float32):
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.dtype = dtype
+        # Sample offsets within a chunk, shared by every voice and partial
+        self._ramp = np.arange(chunk_size, dtype=np.float64)
+        self.set_voices([])
+
+    def set_voices(self, voices):
+        """
+        Load voices (dicts from generate_sonic_signature or with the same
+        keys: harmonics, gains, amplitude_db, tremolo_hz, tremolo_depth).
+        Reallocates buffers only when the voice or partial count changes;
+        phases restart from zero
+        """
+        partials = max((len(v["harmonics"]) for v in voices), default=0)
+        count = len(voices)
+
+        frequencies = np.zeros((count, partials))
+        gains = np.zeros((count, partials))
+        for i, voice in enumerate(voices):
+            n = len(voice["harmonics"])
+            frequencies[i, :n] = voice["harmonics"]
+            gains[i, :n] = voice.get("gains", [1.0] * n)
+        level = np.array([10 ** (v.get("amplitude_db", 0.0) / 20) for v in voices])
+        # Normalise each voice so its partials sum to the requested level
+        gains *= (level / np.maximum(gains.sum(axis=1), 1e-12))[:, None]
+
+        self.frequencies = frequencies
+        self.gains = gains
+        self.tremolo_hz = np.array([v.get("tremolo_hz", 0.0) for v in voices])
+        self.tremolo_depth = np.clip([v.get("tremolo_depth", 0.0) for v in voices], 0.0, 1.0)
+
+        # Phase advance per sample, in radians
+        self._step = TWO_PI * frequencies / self.sample_rate
+        self._tremolo_step = TWO_PI * self.tremolo_hz / self.sample_rate
+
+        # cos/sin of the phase advance across one chunk: (voices, partials, chunk)
+        angle = self._step[:, :, None] * self._ramp
+        self._cos_table = np.cos(angle).astype(self.dtype)
+        self._sin_table = np.sin(angle).astype(self.dtype)
+        angle = self._tremolo_step[:, None] * self._ramp
+        self._tremolo_cos = np.cos(angle).astype(self.dtype)
+        self._tremolo_sin = np.sin(angle).astype(self.dtype)
+
+        shape = (count, self.chunk_size)
+        if getattr(self, "_out", None) is None or self._out.shape != shape:
+            self._out = np.empty(shape, dtype=self.dtype)
+            self._scratch = np.empty(shape, dtype=self.dtype)
+        self.reset()
+
+    def reset(self):
+        """Restart every partial and tremolo from phase zero"""
+        self._phase = np.zeros_like(self.frequencies)
+        self._tremolo_phase = np.zeros_like(self.tremolo_hz)
+
+    @property
+    def voices(self):
+        return self.frequencies.shape[0]
+
+    def render_chunk(self):
+        """
+        Next chunk_size samples for every voice, shape (voices, chunk_size)
+        Returns the engine's reused buffer: copy it to keep it past the next call
+        """
+        out, scratch = self._out, self._scratch
+
+        # Σ_k g_k·sin(φ_k + ω_k n) = Σ_k (g_k sin φ_k)·cos ω_k n + (g_k cos φ_k)·sin ω_k n
+        sin_weight = (self.gains * np.sin(self._phase)).astype(self.dtype)[:, None, :]
+        cos_weight = (self.gains * np.cos(self._phase)).astype(self.dtype)[:, None, :]
+        np.matmul(sin_weight, self._cos_table, out=out[:, None, :])
+        np.matmul(cos_weight, self._sin_table, out=scratch[:, None, :])
+        out += scratch
+
+        # Tremolo: 1 - depth * (1 - cos) / 2, i.e. between 1 - depth and 1
+        cos_phase = np.cos(self._tremolo_phase).astype(self.dtype)[:, None]
+        sin_phase = np.sin(self._tremolo_phase).astype(self.dtype)[:, None]
+        np.multiply(self._tremolo_cos, cos_phase, out=scratch)
+        scratch -= self._tremolo_sin * sin_phase
+        scratch -= 1.0
+        scratch *= (self.tremolo_depth * 0.5).astype(self.dtype)[:, None]
+        scratch += 1.0
+        out *= scratch
+
+        self._phase = (self._phase + self._step * self.chunk_size) % TWO_PI
+        self._tremolo_phase = (self._tremolo_phase + self._tremolo_step * self.chunk_size) % TWO_PI
+        return out
+
+    def stream(self, duration_ms=None):
+        """
+        Yield consecutive chunks (reused buffers) for `duration_ms`, or forever
+        The final chunk is trimmed to the exact duration
+        """
+        remaining = None if duration_ms is None else int(round(self.sample_rate * duration_ms / 1000))
+        while remaining is None or remaining > 0:
+            chunk = self.render_chunk()
+            if remaining is not None:
+                if remaining < self.chunk_size:
+                    chunk = chunk[:, :remaining]
+                remaining -= chunk.shape[1]
+            yield chunk
+
+    def render(self, duration_ms):
+        """Render `duration_ms` of audio into a new (voices, samples) array"""
+        samples = int(round(self.sample_rate * duration_ms / 1000))
+        out = np.empty((self.voices, samples), dtype=self.dtype)
+        offset = 0
+        for chunk in self.stream(duration_ms):
+            out[:, offset:offset + chunk.shape[1]] = chunk
+            offset += chunk.shape[1]
+        return out
+
+
+def to_pcm16(samples):
+    """Float samples in [-1, 1] → little-endian 16-bit PCM bytes"""
+    clipped = np.clip(np.asarray(samples, dtype=np.float64), -1.0, 1.0)
+    return (clipped * 32767).astype("<i2").tobytes()
+
+
+def write_wav(target, samples, sample_rate=44100):
+    """
+    Write samples to a 16-bit WAV file (path or binary file object)
+    1-D samples are mono; (channels, samples) arrays are interleaved
+    """
+    samples = np.asarray(samples)
+    channels = 1 if samples.ndim == 1 else samples.shape[0]
+    frames = samples if samples.ndim == 1 else samples.T
+    with wave.open(target, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(to_pcm16(frames))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RangisNet phonic synthesis engine")
+    parser.add_argument("--wav", metavar="PATH", required=True, help="output WAV file")
+    parser.add_argument("--stdin", action="store_true",
+                        help="read market_data JSON ({price, volatility, trend}) from stdin")
+    parser.add_argument("--sample-rate", type=int, default=44100)
+    args = parser.parse_args(argv)
+
+    try:
+        from engine_loader import load_engine
+
+        market_data = json.load(sys.stdin) if args.stdin else None
+        signature = load_engine("HHPEI-engine").HHPEIEngine().generate_sonic_signature(market_data)
+        synth = PhonicSynthesizer(args.sample_rate)
+        synth.set_voices([signature])
+        write_wav(args.wav, synth.render(signature["duration_ms"])[0], args.sample_rate)
+        print(json.dumps({"wav": args.wav, "signature": signature}))
+        return 0
+    except Exception as e:
+        error_output = {
+            "error": str(e),
+            "status": "failed",
+            "timestamp": datetime.now().isoformat()
+        }
+        print(json.dumps(error_output), file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,62 @@
-class McCreaMetricsEngine:
-    def calculate_HVI(self, market_data):
-        frequency_std = np.std(market_data.spectral_density)
-        base_frequency = np.mean(market_data.dominant_frequencies)
-        amplitude_var = self.calculate_amplitude_instability(market_data)
-        
-        return (frequency_std / base_frequency) * amplitude_var
-        
-    def calculate_HLI(self, order_book, trade_flow):
-        volume_consistency = self.analyze_volume_patterns(trade_flow)
-        spread_quality = self.measure_spread_tightness(order_book)
-        volatility_buffer = 1.0 / (1.0 + self.calculate_HVI())
-        
-        return volume_consistency * spread_quality * volatility_buffer
+#!/usr/bin/env python3
+"""
+RangisNet Real-time Calc Engine
+Streams McCrea metrics for live ticks using McCreaMetricsStream from
+McCrea-MetricsEngine.py
+
+Usage:
+    python3 Real-time_Calc-engine.py            # metrics for the seeded sample market
+    python3 Real-time_Calc-engine.py --stream   # NDJSON ticks in, NDJSON metrics out
+
+Each --stream input line is {"symbol": "AVAX/USD", ...tick fields}; see
+McCreaMetricsStream.update for the accepted trade/book/spectrum fields.
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+
+from engine_loader import load_engine
+
+_metrics = load_engine("McCrea-MetricsEngine")
+McCreaMetricsEngine = _metrics.McCreaMetricsEngine
+McCreaMetricsStream = _metrics.McCreaMetricsStream
+
+
+def run_stream(window, stdin=None, stdout=None):
+    """Apply NDJSON ticks from stdin, writing one metrics line per tick"""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stream = McCreaMetricsEngine().stream(window)
+    for line in stdin:
+        if not line.strip():
+            continue
+        try:
+            tick = json.loads(line)
+            result = stream.update(tick.pop("symbol", "default"), tick)
+        except Exception as e:
+            result = {"error": str(e), "status": "failed"}
+        stdout.write(json.dumps(result, separators=(",", ":")) + "\n")
+        stdout.flush()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RangisNet real-time calc engine")
+    parser.add_argument("--stream", action="store_true",
+                        help="read NDJSON ticks on stdin and emit metrics per tick")
+    parser.add_argument("--window", type=int, default=256,
+                        help="rolling window length in ticks (default 256)")
+    args = parser.parse_args(argv)
+
+    if args.stream:
+        try:
+            return run_stream(args.window)
+        except KeyboardInterrupt:
+            return 0
+    return _metrics.main([])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
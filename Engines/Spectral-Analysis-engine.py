@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+RangisNet Spectral Analysis Engine
+Turns raw price/volume series into the spectral inputs of the McCrea metrics
+
+- Welch spectra: Hann-windowed, overlapping segments averaged per series
+- Spectrograms: one spectrum per sliding window
+- Dominant peaks: strongest non-DC bins, as frequencies and powers
+- SlidingSpectrum: incremental sliding-DFT spectra for live feeds
+
+Series are NumPy arrays whose LAST axis is time; leading axes (symbols, ...)
+are batch axes, so a (symbols, samples) matrix is analysed in one pass.
+The market_data() output plugs straight into McCreaMetricsEngine.calculate_HVI
+and McCreaMetricsStream.update.
+
+Usage:
+    python3 Spectral-Analysis-engine.py            # spectra for a seeded sample series
+    python3 Spectral-Analysis-engine.py --stdin    # spectra for {"prices": [[...], ...]} on stdin
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class SpectralAnalyzer:
+    """Batched windowed-FFT spectra and peak extraction"""
+
+    def __init__(self, window=128, hop=None, sample_rate=1.0, peaks=4):
+        if window < 4:
+            raise ValueError("window must be at least 4 samples")
+        self.window = window
+        self.hop = hop or window // 2
+        self.sample_rate = sample_rate
+        self.peaks = peaks
+
+        self.taper = np.hanning(window + 1)[:-1]  # Periodic Hann
+        self.frequencies = np.fft.rfftfreq(window, d=1.0 / sample_rate)
+        self._scale = _one_sided_scale(window, self.taper, sample_rate)
+
+    @staticmethod
+    def returns(prices):
+        """Log returns along the time axis (one sample shorter than prices)"""
+        prices = np.asarray(prices, dtype=np.float64)
+        return np.diff(np.log(np.maximum(prices, np.finfo(np.float64).tiny)), axis=-1)
+
+    def spectrogram(self, series):
+        """
+        Power spectral density of every sliding window
+        (..., samples) → (..., frames, bins)
+        """
+        series = np.asarray(series, dtype=np.float64)
+        if series.shape[-1] < self.window:
+            raise ValueError(f"need at least {self.window} samples, got {series.shape[-1]}")
+        segments = sliding_window_view(series, self.window, axis=-1)[..., ::self.hop, :]
+        segments = segments - segments.mean(axis=-1, keepdims=True)
+        spectrum = np.fft.rfft(segments * self.taper, axis=-1)
+        return (spectrum.real ** 2 + spectrum.imag ** 2) * self._scale
+
+    def welch(self, series):
+        """Welch PSD estimate: mean of the spectrogram frames, (..., samples) → (..., bins)"""
+        return self.spectrogram(series).mean(axis=-2)
+
+    def dominant_peaks(self, psd, k=None):
+        """
+        Strongest k non-DC bins per spectrum, ordered by frequency
+        Returns (frequencies, powers), each shaped (..., k)
+        """
+        psd = np.asarray(psd, dtype=np.float64)
+        k = min(k or self.peaks, psd.shape[-1] - 1)
+        top = np.argpartition(psd[..., 1:], -k, axis=-1)[..., -k:] + 1
+        top = np.sort(top, axis=-1)
+        return self.frequencies[top], np.take_along_axis(psd, top, axis=-1)
+
+    def market_data(self, prices, spectrum=None):
+        """
+        McCrea spectral inputs from raw prices
+        (symbols, samples) → dict of (symbols, bins) / (symbols, peaks) arrays
+        """
+        psd = self.welch(self.returns(prices)) if spectrum is None else spectrum
+        dominant_frequencies, dominant_powers = self.dominant_peaks(psd)
+        return {
+            "spectral_density": psd,
+            "frequencies": self.frequencies,
+            "dominant_frequencies": dominant_frequencies,
+            "dominant_powers": dominant_powers,
+        }
+
+    def sliding(self, symbols):
+        """Incremental spectrum over the latest `window` samples for `symbols` series"""
+        return SlidingSpectrum(self, symbols)
+
+
+class SlidingSpectrum:
+    """
+    Sliding DFT over the most recent `window` samples of many series
+    Each pushed sample updates every bin in O(bins) per series:
+        X_k ← (X_k - x_oldest + x_new) · e^{2πik/N}
+    and the Hann taper is applied in the frequency domain. The state is
+    re-synchronised with a full FFT once per window to cancel rounding drift.
+    """
+
+    def __init__(self, analyzer, symbols):
+        self.analyzer = analyzer
+        self.symbols = symbols
+        n = analyzer.window
+        bins = n // 2 + 1
+        self._buffer = np.zeros((symbols, n))
+        self._head = 0
+        self._spectrum = np.zeros((symbols, bins), dtype=np.complex128)
+        self._twiddle = np.exp(2j * np.pi * np.arange(bins) / n)
+        self.samples = 0
+
+    @property
+    def ready(self):
+        """True once a full window has been pushed"""
+        return self.samples >= self.analyzer.window
+
+    def push(self, samples):
+        """Append one sample per series, shape (symbols,), or a chunk, shape (symbols, m)"""
+        samples = np.asarray(samples, dtype=np.float64)
+        if samples.ndim == 1:
+            samples = samples[:, None]
+        n = self.analyzer.window
+        for column in samples.T:
+            oldest = self._buffer[:, self._head]
+            self._spectrum += (column - oldest)[:, None]
+            self._spectrum *= self._twiddle
+            self._buffer[:, self._head] = column
+            self._head = (self._head + 1) % n
+            self.samples += 1
+            if self._head == 0:
+                self._spectrum = np.fft.rfft(self._buffer, axis=-1)
+
+    def window_samples(self):
+        """Current window in time order, (symbols, window)"""
+        return np.roll(self._buffer, -self._head, axis=-1)
+
+    def spectrum(self):
+        """Hann-windowed PSD of the current window, (symbols, bins)"""
+        x = self._spectrum.copy()
+        x[:, 0] = 0.0  # Mean removal, as in SpectralAnalyzer.spectrogram
+        n = self.analyzer.window
+        # X[-1] = conj(X[1]) and X[n/2+1] = conj(X[n/2-1]) for real input
+        lower = np.concatenate([np.conj(x[:, 1:2]), x[:, :-1]], axis=-1)
+        upper = np.concatenate([x[:, 1:], np.conj(x[:, -2:-1] if n % 2 == 0 else x[:, -1:])], axis=-1)
+        tapered = 0.5 * x - 0.25 * (lower + upper)
+        return (tapered.real ** 2 + tapered.imag ** 2) * self.analyzer._scale
+
+    def market_data(self):
+        """McCrea spectral inputs for the current window of every series"""
+        return self.analyzer.market_data(None, spectrum=self.spectrum())
+
+
+def _one_sided_scale(window, taper, sample_rate):
+    """PSD scaling per bin: 1/(fs·Σw²), doubled for bins folded from negative frequencies"""
+    scale = np.full(window // 2 + 1, 2.0 / (sample_rate * np.sum(taper ** 2)))
+    scale[0] /= 2.0
+    if window % 2 == 0:
+        scale[-1] /= 2.0
+    return scale
+
+
+def sample_prices(symbols=1, samples=1024, seed=528):
+    """Seeded synthetic price paths with a few periodic components, (symbols, samples)"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(samples)
+    periods = rng.uniform(8, 64, size=(symbols, 1))
+    cycle = 0.002 * np.sin(2 * np.pi * t / periods)
+    noise = rng.normal(0.0, 0.001, size=(symbols, samples))
+    return 100.0 * np.exp(np.cumsum(noise, axis=-1) + cycle)
+
+
+def main(argv=None):
+    """Main execution - returns JSON for Node bridge"""
+    parser = argparse.ArgumentParser(description="RangisNet spectral analysis engine")
+    parser.add_argument("--stdin", action="store_true",
+                        help='read {"prices": [[...], ...]} JSON from stdin')
+    parser.add_argument("--window", type=int, default=128)
+    parser.add_argument("--hop", type=int, default=None)
+    parser.add_argument("--peaks", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    try:
+        prices = json.load(sys.stdin)["prices"] if args.stdin else sample_prices()
+        analyzer = SpectralAnalyzer(args.window, args.hop, peaks=args.peaks)
+        result = {
+            name: np.round(value, 8).tolist()
+            for name, value in analyzer.market_data(np.atleast_2d(prices)).items()
+        }
+        result["timestamp"] = datetime.now().isoformat()
+        print(json.dumps(result))
+        return 0
+    except Exception as e:
+        error_output = {
+            "error": str(e),
+            "status": "failed",
+            "timestamp": datetime.now().isoformat()
+        }
+        print(json.dumps(error_output), file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
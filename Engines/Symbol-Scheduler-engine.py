@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+RangisNet Symbol Scheduler
+Spreads per-symbol HHPEI work (harmonic ladders, probability tensors, McCrea
+metrics) across worker processes for compute_many()
+
+- Inputs (volatilities, optional price matrix) and the ladder tables are
+  copied once into shared memory; workers attach them read-only
+- Symbols are cut into contiguous shards that are handed to the process pool
+  in batches, so one IPC round trip carries several shards
+- Workers write their rows straight into a shared result block; only
+  (start, stop) pairs cross the process boundary, never result dicts
+- Random draws come from a counter-based generator keyed on the seed and the
+  symbol's row, so results do not depend on the shard layout or process count
+
+Small batches, or a single process, are computed inline with the same code.
+
+Usage:
+    python3 Symbol-Scheduler-engine.py --symbols 5000            # simulated metrics
+    python3 Symbol-Scheduler-engine.py --symbols 2000 --samples 1024 --processes 4
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from engine_instrumentation import count, stage
+from engine_loader import call_engine, load_engine
+
+# Rows per shard handed to a worker
+SHARD_SIZE = 256
+# Volatility used when neither a volatility nor a price series is given
+DEFAULT_VOLATILITY = 0.15
+# Welch segment length for metrics computed from price series
+SPECTRAL_WINDOW = 128
+
+METRIC_NAMES = ("HVI", "HLI", "HRI", "SSS", "omega", "p", "composite_health")
+# Uniform ranges of the simulated metrics (same as HHPEIEngine.calculate_mccrea_metrics)
+SIMULATED_RANGES = {
+    "HVI": (0.1, 0.9),
+    "HLI": (0.5, 1.0),
+    "HRI": (0.0, 1.0),
+    "SSS": (0.3, 1.0),
+    "omega": (0.5, 2.0),
+    "p": (0.4, 0.6),
+}
+
+
+def result_layout(dimensions, base_orders=7, extended_orders=33):
+    """Column slices of the (symbols, width) result block, and its width"""
+    widths = [
+        ("volatility", 1),
+        ("base_amplitudes", base_orders),
+        ("extended_amplitudes", extended_orders),
+        ("probability", dimensions),
+        ("variance", dimensions),
+        ("superposition", dimensions),
+        *((name, 1) for name in METRIC_NAMES),
+    ]
+    layout, offset = {}, 0
+    for name, width in widths:
+        layout[name] = slice(offset, offset + width)
+        offset += width
+    return layout, offset
+
+
+def draws_per_symbol(dimensions):
+    """Uniform draws per symbol: three per tensor axis plus one per simulated metric"""
+    return 3 * dimensions + len(SIMULATED_RANGES)
+
+
+def philox_key(seed):
+    """128-bit Philox key from an int, SeedSequence or Generator (None draws fresh entropy)"""
+    if isinstance(seed, np.random.Generator):
+        return int(seed.integers(2 ** 63))
+    if isinstance(seed, np.random.SeedSequence):
+        high, low = (int(word) for word in seed.generate_state(2, np.uint64))
+        return high << 64 | low
+    if seed is None:
+        return np.random.SeedSequence().entropy % 2 ** 128
+    return int(seed) % 2 ** 128
+
+
+def symbol_uniforms(key, start, stop, k):
+    """
+    Uniform [0, 1) draws for rows start..stop, (stop - start, k)
+    Row i always gets the same draws for a given key: the Philox counter is
+    advanced straight to the row instead of drawing through earlier rows
+    """
+    per_row = -(-k // 4) * 4  # Philox emits four 64-bit words per counter step
+    bit_generator = np.random.Philox(key=key)
+    bit_generator.advance(start * per_row // 4)
+    raw = bit_generator.random_raw((stop - start) * per_row).reshape(-1, per_row)[:, :k]
+    return (raw >> np.uint64(11)) * (1.0 / 2 ** 53)
+
+
+def compute_rows(out, layout, volatility, prices, tables, uniforms, dimensions, window=SPECTRAL_WINDOW):
+    """
+    Fill result rows for one shard
+    out: (rows, width) view of the result block; volatility: (rows,) with NaN
+    for "derive from prices"; prices: (rows, samples) or None;
+    tables: (base decay amplitudes, extended decay amplitudes)
+    """
+    returns = None
+    if prices is not None:
+        returns = np.diff(np.log(np.maximum(prices, np.finfo(np.float64).tiny)), axis=-1)
+        derived = np.clip(np.std(returns, axis=-1) * np.sqrt(returns.shape[-1]), 0.0, 1.0)
+        volatility = np.where(np.isnan(volatility), derived, volatility)
+    volatility = np.where(np.isnan(volatility), DEFAULT_VOLATILITY, volatility)
+    vol = volatility[:, None]
+
+    base_decay, extended_decay = tables
+    out[:, layout["volatility"]] = vol
+    out[:, layout["base_amplitudes"]] = base_decay * (1 - vol)
+    out[:, layout["extended_amplitudes"]] = extended_decay * (1 - vol * 0.5)
+
+    d = dimensions
+    out[:, layout["probability"]] = uniforms[:, :d]
+    out[:, layout["variance"]] = uniforms[:, d:2 * d] * 0.1
+    out[:, layout["superposition"]] = uniforms[:, 2 * d:3 * d] > 0.5
+
+    simulated = {
+        name: low + (high - low) * uniforms[:, 3 * d + i]
+        for i, (name, (low, high)) in enumerate(SIMULATED_RANGES.items())
+    }
+    if prices is not None:
+        # Spectral metrics from the series; HLI and p need an order book and stay simulated
+        analyzer = load_engine("Spectral-Analysis-engine").SpectralAnalyzer(window=window)
+        market_data = analyzer.market_data(None, spectrum=analyzer.welch(returns))
+        metrics_engine = load_engine("McCrea-MetricsEngine").McCreaMetricsEngine()
+        simulated["HVI"] = metrics_engine.calculate_HVI(market_data)
+        simulated["HRI"] = metrics_engine.calculate_HRI(market_data)
+        simulated["omega"] = metrics_engine.calculate_omega(market_data)
+        simulated["SSS"] = metrics_engine.calculate_SSS({"prices": prices})
+    simulated["composite_health"] = (simulated["HLI"] + simulated["SSS"] + simulated["HRI"]) / 3
+    for name in METRIC_NAMES:
+        out[:, layout[name].start] = simulated[name]
+    return out
+
+
+class SharedArray:
+    """NumPy array backed by a named shared memory block"""
+
+    def __init__(self, shape, dtype="float64", name=None):
+        from multiprocessing import shared_memory
+
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        size = max(int(np.prod(self.shape)) * self.dtype.itemsize, 1)
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.array = np.ndarray(self.shape, self.dtype, buffer=self.memory.buf)
+
+    @classmethod
+    def copy_of(cls, values):
+        shared = cls(np.shape(values), np.asarray(values).dtype)
+        shared.array[...] = values
+        return shared
+
+    @classmethod
+    def attach(cls, spec):
+        """Attach to a block described by spec() in another process"""
+        return cls(spec["shape"], spec["dtype"], spec["name"])
+
+    def spec(self):
+        return {"name": self.memory.name, "shape": self.shape, "dtype": self.dtype.str}
+
+    def close(self):
+        self.array = None
+        try:
+            self.memory.close()
+        except BufferError:
+            pass  # A traceback still holds a view; the mapping goes when it is collected
+        if self.owner:
+            self.memory.unlink()
+
+
+def compute_shard(job, start, stop):
+    """
+    Worker entry point: compute rows start..stop of a compute_many() job
+    job holds the shared-memory specs of the inputs, tables and result block
+    """
+    blocks = {name: SharedArray.attach(spec) for name, spec in job["blocks"].items()}
+    try:
+        _fill_shard(blocks, job, start, stop)
+    finally:
+        for block in blocks.values():
+            block.close()
+    return stop - start
+
+
+def _fill_shard(blocks, job, start, stop):
+    # Views into the shared blocks live only in this frame, so they are gone
+    # by the time compute_shard() closes the blocks
+    split = job["base_orders"]
+    tables = blocks["tables"].array
+    layout, _ = result_layout(job["dimensions"], split, len(tables) - split)
+    compute_rows(
+        blocks["result"].array[start:stop], layout,
+        blocks["volatility"].array[start:stop],
+        blocks["prices"].array[start:stop] if "prices" in blocks else None,
+        (tables[:split], tables[split:]),
+        symbol_uniforms(job["key"], start, stop, draws_per_symbol(job["dimensions"])),
+        job["dimensions"], job["window"])
+
+
+class SymbolScheduler:
+    """
+    Process pool for compute_many(); keep one per engine and close() it when done
+    processes=1 computes everything inline
+    """
+
+    def __init__(self, processes=None, shard_size=SHARD_SIZE):
+        self.processes = processes or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self._pool = None
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(self.processes)
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def shards(self, rows):
+        return [(start, min(start + self.shard_size, rows)) for start in range(0, rows, self.shard_size)]
+
+    def compute_many(self, engine, symbols, volatilities=None, prices=None, dimensions=5,
+                     seed=None, window=SPECTRAL_WINDOW):
+        """
+        Harmonics, tensors and metrics for every symbol, as arrays
+        volatilities: per-symbol values (NaN = derive); prices: (symbols, samples)
+        Returns the calculate_market_harmonics_batch keys plus "symbols",
+        "tensor" (a calculate_probability_tensor_batch dict), "metrics" and "timestamp"
+        """
+        symbols = list(symbols)
+        rows = len(symbols)
+        if volatilities is None:
+            volatilities = np.full(rows, np.nan)
+        volatilities = np.asarray(volatilities, dtype=np.float64).reshape(rows)
+        if prices is not None:
+            prices = np.asarray(prices, dtype=np.float64)
+            if prices.ndim != 2 or prices.shape[0] != rows:
+                raise ValueError(f"prices must be shaped (symbols, samples), got {prices.shape}")
+
+        ladder = load_engine("HHPEI-engine").harmonic_ladder(engine.BASE_FREQUENCY, engine.HARMONY_FREQUENCY)
+        tables = np.array(ladder.base_amplitudes + ladder.extended_amplitudes)
+        layout, width = result_layout(dimensions, len(ladder.base_amplitudes), len(ladder.extended_amplitudes))
+        key = philox_key(engine.seed if seed is None else seed)
+        shards = self.shards(rows)
+
+        with stage("scheduler.compute_many"):
+            if self.processes <= 1 or len(shards) <= 1:
+                block = np.empty((rows, width))
+                compute_rows(block, layout, volatilities, prices,
+                             (tables[:len(ladder.base_amplitudes)], tables[len(ladder.base_amplitudes):]),
+                             symbol_uniforms(key, 0, rows, draws_per_symbol(dimensions)),
+                             dimensions, window)
+            else:
+                block = self._compute_shared(shards, rows, width, volatilities, prices, tables, {
+                    "key": key,
+                    "dimensions": dimensions,
+                    "window": window,
+                    "base_orders": len(ladder.base_amplitudes),
+                })
+        count("scheduler.symbols", rows)
+
+        return {
+            "symbols": symbols,
+            "volatility": block[:, layout["volatility"].start],
+            "base_frequencies": np.array(ladder.base_frequencies),
+            "base_amplitudes": block[:, layout["base_amplitudes"]],
+            "extended_frequencies": np.array(ladder.extended_frequencies),
+            "extended_amplitudes": block[:, layout["extended_amplitudes"]],
+            "extended_phases": np.array(ladder.extended_phases),
+            "base_frequency": ladder.base_frequency,
+            "harmony_frequency": ladder.harmony_frequency,
+            "tensor": {
+                "probability": block[:, layout["probability"]],
+                "variance": block[:, layout["variance"]],
+                "superposition": block[:, layout["superposition"]] > 0.5,
+                "collapse_threshold": engine.COLLAPSE_THRESHOLD,
+                "entanglement_degree": engine.ENTANGLEMENT_DEGREE
+            },
+            "metrics": {name: block[:, layout[name].start] for name in METRIC_NAMES},
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def _compute_shared(self, shards, rows, width, volatilities, prices, tables, job):
+        """Run the shards on the pool against shared-memory inputs; returns a private copy of the result"""
+        blocks = {"result": SharedArray((rows, width))}
+        try:
+            blocks["volatility"] = SharedArray.copy_of(volatilities)
+            blocks["tables"] = SharedArray.copy_of(tables)
+            if prices is not None:
+                blocks["prices"] = SharedArray.copy_of(prices)
+            job["blocks"] = {name: block.spec() for name, block in blocks.items()}
+
+            worker = functools.partial(call_engine, "Symbol-Scheduler-engine", "compute_shard", job)
+            batch = max(1, len(shards) // (self.processes * 4))
+            starts, stops = zip(*shards)
+            done = sum(self.pool.map(worker, starts, stops, chunksize=batch))
+            if done != rows:
+                raise RuntimeError(f"workers computed {done} of {rows} rows")
+            return blocks["result"].array.copy()
+        finally:
+            for block in blocks.values():
+                block.close()
+
+
+def symbol_snapshot(result, index):
+    """JSON-ready dict view of one symbol from a compute_many() result"""
+    tensor_snapshot = load_engine("HHPEI-engine").tensor_snapshot
+    return {
+        "symbol": result["symbols"][index],
+        "metrics": {name: round(float(values[index]), 4) for name, values in result["metrics"].items()},
+        "harmonics": {
+            "volatility": round(float(result["volatility"][index]), 4),
+            "base_amplitudes": np.round(result["base_amplitudes"][index], 4).tolist(),
+            "extended_amplitudes": np.round(result["extended_amplitudes"][index], 4).tolist(),
+        },
+        "tensor": tensor_snapshot(result["tensor"], index, result["timestamp"])
+    }
+
+
+def main(argv=None):
+    """Main execution - returns JSON for Node bridge"""
+    parser = argparse.ArgumentParser(description="RangisNet multi-process symbol scheduler")
+    parser.add_argument("--symbols", type=int, default=1000, help="number of synthetic symbols")
+    parser.add_argument("--samples", type=int, default=0,
+                        help="price samples per symbol for computed metrics (0 = simulated)")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    parser.add_argument("--dimensions", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=432)
+    args = parser.parse_args(argv)
+
+    try:
+        engine = load_engine("HHPEI-engine").HHPEIEngine(seed=args.seed)
+        symbols = [f"SYM{i:05d}" for i in range(args.symbols)]
+        prices = None
+        if args.samples:
+            prices = load_engine("Spectral-Analysis-engine").sample_prices(args.symbols, args.samples, seed=args.seed)
+
+        with SymbolScheduler(args.processes, args.shard_size) as scheduler:
+            started = time.perf_counter()
+            result = scheduler.compute_many(engine, symbols, prices=prices, dimensions=args.dimensions)
+            seconds = time.perf_counter() - started
+
+        print(json.dumps({
+            "symbols": len(symbols),
+            "processes": scheduler.processes,
+            "shards": len(scheduler.shards(len(symbols))),
+            "seconds": round(seconds, 4),
+            "symbols_per_sec": round(len(symbols) / seconds, 1) if seconds > 0 else None,
+            "sample": symbol_snapshot(result, 0) if symbols else None,
+            "timestamp": datetime.now().isoformat()
+        }, indent=2))
+        return 0
+    except Exception as e:
+        error_output = {
+            "error": str(e),
+            "status": "failed",
+            "timestamp": datetime.now().isoformat()
+        }
+        print(json.dumps(error_output), file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
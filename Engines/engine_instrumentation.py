@@ -0,0 +1,218 @@
+"""
+Engine instrumentation
+Per-stage timers and counters for the RangisNet engines, with optional
+cProfile / tracemalloc hooks and JSON or Prometheus-text snapshots.
+
+Stage timers are always on (one perf_counter pair per stage). Profiling is
+opt-in, by calling start_profiling() or by setting the environment variable
+    RANGIS_PROFILE=cpu | memory | cpu,memory
+before an engine starts; the report is written to stderr at exit.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+
+PROFILE_ENV = "RANGIS_PROFILE"
+
+
+class StageTimer:
+    """Call count and wall time for one stage"""
+
+    __slots__ = ("calls", "total", "min", "max", "last", "errors")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.last = 0.0
+        self.errors = 0
+
+    def record(self, elapsed, failed=False):
+        self.calls += 1
+        self.total += elapsed
+        self.last = elapsed
+        if elapsed < self.min:
+            self.min = elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        if failed:
+            self.errors += 1
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_s": self.total,
+            "mean_s": self.total / self.calls if self.calls else 0.0,
+            "min_s": self.min if self.calls else 0.0,
+            "max_s": self.max,
+            "last_s": self.last
+        }
+
+
+class _Stage:
+    """One timed block; see Instrumentation.stage()"""
+
+    __slots__ = ("registry", "name", "started")
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.record(self.name, time.perf_counter() - self.started, exc_type is not None)
+        return False
+
+
+class Instrumentation:
+    """Registry of stage timers and counters for one process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+        self._profiler = None
+        self._tracing = False
+        self.started = time.time()
+
+    def stage(self, name):
+        """Context manager timing the enclosed block as stage `name`"""
+        return _Stage(self, name)
+
+    def record(self, name, elapsed, failed=False):
+        with self._lock:
+            timer = self._stages.get(name)
+            if timer is None:
+                timer = self._stages[name] = StageTimer()
+            timer.record(elapsed, failed)
+
+    def timed(self, name):
+        """Decorator form of stage()"""
+        def decorate(func):
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            wrapper.__name__ = func.__name__
+            wrapper.__doc__ = func.__doc__
+            return wrapper
+        return decorate
+
+    def count(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """JSON-ready stats for every stage and counter"""
+        with self._lock:
+            return {
+                "uptime_s": time.time() - self.started,
+                "stages": {name: timer.as_dict() for name, timer in sorted(self._stages.items())},
+                "counters": dict(sorted(self._counters.items()))
+            }
+
+    def prometheus(self, prefix="rangis"):
+        """Stats in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_stage_calls_total Calls per engine stage",
+            f"# TYPE {prefix}_stage_calls_total counter",
+        ]
+        lines += [f'{prefix}_stage_calls_total{{stage="{name}"}} {s["calls"]}'
+                  for name, s in snapshot["stages"].items()]
+        lines += [
+            f"# HELP {prefix}_stage_errors_total Failed calls per engine stage",
+            f"# TYPE {prefix}_stage_errors_total counter",
+        ]
+        lines += [f'{prefix}_stage_errors_total{{stage="{name}"}} {s["errors"]}'
+                  for name, s in snapshot["stages"].items()]
+        lines += [
+            f"# HELP {prefix}_stage_seconds_total Wall time per engine stage",
+            f"# TYPE {prefix}_stage_seconds_total counter",
+        ]
+        lines += [f'{prefix}_stage_seconds_total{{stage="{name}"}} {s["total_s"]:.9f}'
+                  for name, s in snapshot["stages"].items()]
+        lines += [
+            f"# HELP {prefix}_stage_seconds_max Slowest call per engine stage",
+            f"# TYPE {prefix}_stage_seconds_max gauge",
+        ]
+        lines += [f'{prefix}_stage_seconds_max{{stage="{name}"}} {s["max_s"]:.9f}'
+                  for name, s in snapshot["stages"].items()]
+        lines += [
+            f"# HELP {prefix}_events_total Engine event counters",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        lines += [f'{prefix}_events_total{{event="{name}"}} {value}'
+                  for name, value in snapshot["counters"].items()]
+        return "\n".join(lines) + "\n"
+
+    def export(self, fmt="json"):
+        """Snapshot as a JSON string or Prometheus text"""
+        if fmt == "prometheus":
+            return self.prometheus()
+        return json.dumps(self.snapshot())
+
+    def start_profiling(self, cpu=True, memory=False):
+        """Start cProfile and/or tracemalloc for this process"""
+        if cpu and self._profiler is None:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        if memory and not self._tracing:
+            import tracemalloc
+            tracemalloc.start()
+            self._tracing = True
+
+    def stop_profiling(self, top=25):
+        """Stop profiling and return a text report of the hottest functions and allocations"""
+        report = []
+        if self._profiler is not None:
+            import io
+            import pstats
+            self._profiler.disable()
+            stream = io.StringIO()
+            pstats.Stats(self._profiler, stream=stream).sort_stats("cumulative").print_stats(top)
+            report.append(stream.getvalue())
+            self._profiler = None
+        if self._tracing:
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self._tracing = False
+            report.append(f"tracemalloc: current={current} B peak={peak} B")
+            report += [str(stat) for stat in snapshot.statistics("lineno")[:top]]
+        return "\n".join(report)
+
+
+INSTRUMENTATION = Instrumentation()
+stage = INSTRUMENTATION.stage
+count = INSTRUMENTATION.count
+
+
+def profile_from_env(environ=None):
+    """
+    Honour RANGIS_PROFILE for the default registry
+    The profile report is printed to stderr when the process exits
+    """
+    modes = {mode.strip() for mode in (environ or os.environ).get(PROFILE_ENV, "").split(",")}
+    cpu, memory = "cpu" in modes, "memory" in modes
+    if not (cpu or memory):
+        return False
+    INSTRUMENTATION.start_profiling(cpu=cpu, memory=memory)
+    atexit.register(lambda: print(INSTRUMENTATION.stop_profiling(), file=sys.stderr))
+    return True
@@ -0,0 +1,68 @@
+"""
+Engine module loader
+RangisNet engine files use hyphenated names (HHPEI-engine.py,
+McCrea-MetricsEngine.py, ...) that a plain import statement cannot reach.
+load_engine() imports them by file name and caches them in sys.modules.
+
+Usage:
+    python3 engine_loader.py HHPEI-engine --format json   # run an engine's CLI
+"""
+
+import importlib.util
+import os
+import sys
+
+ENGINES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_engine(name):
+    """
+    Import an engine file from the Engines directory by its file name
+    e.g. load_engine("McCrea-MetricsEngine").McCreaMetricsEngine
+    """
+    module_name = "rangis_" + name.replace("-", "_").lower()
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    path = os.path.join(ENGINES_DIR, name + ".py")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if spec is None:
+        raise ImportError(f"engine not found: {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
+
+
+def call_engine(name, function, *args, **kwargs):
+    """
+    Call a module-level function of an engine by name
+    Picklable stand-in for engine functions in process pools, e.g.
+    functools.partial(call_engine, "Backtest-engine", "run_backtest"): the child
+    loads the engine through load_engine instead of unpickling a reference to
+    a module name it cannot import
+    """
+    return getattr(load_engine(name), function)(*args, **kwargs)
+
+
+def run_engine(name, argv):
+    """Run an engine's main() as if `python3 <name>.py <argv>` had been invoked"""
+    module = load_engine(name)
+    sys.argv = [module.__file__, *argv]
+    return module.main()
+
+
+if __name__ == "__main__":
+    # python3 engine_loader.py HHPEI-engine [args...]
+    # A script run directly is compiled from source on every launch; loading it
+    # as a module reuses the cached bytecode in __pycache__, which is what a
+    # per-request launch wants
+    if len(sys.argv) < 2:
+        print("usage: engine_loader.py ENGINE [ARGS...]", file=sys.stderr)
+        sys.exit(2)
+    sys.exit(run_engine(sys.argv[1], sys.argv[2:]))
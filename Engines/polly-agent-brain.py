@@ -15,39 +15,148 @@ Dec 2025 - Hack2Build x402
 
 import os
 import json
+import threading
 import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence
 import asyncio
 
+from engine_instrumentation import INSTRUMENTATION, PROFILE_ENV, profile_from_env, stage
+from engine_loader import load_engine
+
+# PRM confidence required to trade, per personality
+PERSONALITY_THRESHOLDS = {
+    'aggressive': 0.60,
+    'moderate': 0.75,
+    'conservative': 0.85
+}
+DEFAULT_THRESHOLD = 0.75
+
+# Negotiation spread bands (fraction of current price)
+ACCEPT_SPREAD = 0.01   # Within 1%: take the current price
+COUNTER_SPREAD = 0.05  # Within 5%: counter at the mid-point
+
+HARMONIC_FREQUENCIES = (432, 528, 639)
+
+# Entries kept in memory per decision/trade history
+DEFAULT_HISTORY_SIZE = 1000
+
+
+class BoundedHistory:
+    """
+    Fixed-capacity ring buffer of recent entries
+    Once full, each append evicts the oldest entry; if a spill path is set,
+    evicted entries are appended to it as JSON lines so nothing is lost.
+    The spill file stays open (line-buffered) until close()
+    """
+    
+    def __init__(self, capacity: int = DEFAULT_HISTORY_SIZE, spill_path: Optional[str] = None):
+        if capacity < 1:
+            raise ValueError("history capacity must be at least 1")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self.total = 0  # Entries ever appended, including evicted ones
+        self._entries: deque = deque(maxlen=capacity)
+        self._spill = None
+    
+    def append(self, entry: Dict):
+        if self.spill_path and len(self._entries) == self.capacity:
+            if self._spill is None:
+                self._spill = open(self.spill_path, 'a', buffering=1)
+            self._spill.write(json.dumps(self._entries[0], default=str) + '\n')
+        self._entries.append(entry)
+        self.total += 1
+    
+    def close(self):
+        """Close the spill file; a later eviction reopens it"""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._entries)
+    
+    def __getitem__(self, index: int) -> Dict:
+        return self._entries[index]
+    
+    def recent(self, n: int) -> List[Dict]:
+        """Newest n entries, oldest first"""
+        n = min(n, len(self._entries))
+        return [self._entries[i] for i in range(len(self._entries) - n, len(self._entries))]
+
+
+_haptics = load_engine("Haptic-Pattern-engine").HapticPatternEngine()
+
+
+def _spill_path(history_dir: Optional[str], agent_id: str, kind: str) -> Optional[str]:
+    if not history_dir:
+        return None
+    os.makedirs(history_dir, exist_ok=True)
+    return os.path.join(history_dir, f"{agent_id}-{kind}.jsonl")
+
 # Polly AI SDK (mock for development - replace with actual SDK)
 class PollyAI:
-    """Polly-based agent reasoning engine"""
+    """
+    Polly-based agent reasoning engine
+    With a PRMScorer (PRM-Scoring-engine) the PRM score is computed from the
+    scorer's live features for market_data['pair']; market_data['prm_score']
+    is only the fallback for symbols the scorer is still warming up on
+    """
     
-    def __init__(self, agent_id: str, personality: str = "conservative"):
+    def __init__(self, agent_id: str, personality: str = "conservative",
+                 history_size: int = DEFAULT_HISTORY_SIZE, history_dir: Optional[str] = None,
+                 min_confidence: Optional[float] = None,
+                 accept_spread: float = ACCEPT_SPREAD, counter_spread: float = COUNTER_SPREAD,
+                 prm_scorer=None):
         self.agent_id = agent_id
+        self.prm_scorer = prm_scorer
         self.personality = personality
-        self.decision_history: List[Dict] = []
+        self.decision_history = BoundedHistory(
+            history_size, _spill_path(history_dir, agent_id, 'decisions')
+        )
+        self._min_confidence = min_confidence
+        self.accept_spread = accept_spread
+        self.counter_spread = counter_spread
+    
+    def close(self):
+        """Close the decision history's spill file"""
+        self.decision_history.close()
         
+    @property
+    def min_confidence(self) -> float:
+        """PRM score this personality (or an explicit override) needs before trading"""
+        if self._min_confidence is not None:
+            return self._min_confidence
+        return PERSONALITY_THRESHOLDS.get(self.personality, DEFAULT_THRESHOLD)
+
     async def analyze_trade(self, market_data: Dict) -> Dict:
         """Analyze trade opportunity using PRM scoring"""
-        prm_score = market_data.get('prm_score', 0.5)
+        prm_score = self.prm_score(market_data)
         harmonic_freq = market_data.get('harmonic_freq', 432)
-        
-        # Decision logic based on personality
-        thresholds = {
-            'aggressive': 0.60,
-            'moderate': 0.75,
-            'conservative': 0.85
-        }
-        
-        min_confidence = thresholds.get(self.personality, 0.75)
-        
+        return self._decide(prm_score, harmonic_freq, prm_score >= self.min_confidence)
+
+    def prm_score(self, market_data: Dict) -> float:
+        """Computed PRM score when a scorer is attached, else the caller's (default 0.5)"""
+        prm_score = market_data.get('prm_score', 0.5)
+        if self.prm_scorer is None or 'pair' not in market_data:
+            return prm_score
+        return float(self.prm_scorer.score_batch(
+            [market_data['pair']], market_data.get('side', 'buy'), default=prm_score
+        )[0])
+    
+    def _decide(self, prm_score: float, harmonic_freq: float, should_trade: bool) -> Dict:
+        """Build and record a decision once the threshold comparison is known"""
         decision = {
-            'should_trade': prm_score >= min_confidence,
+            'should_trade': bool(should_trade),
             'confidence': prm_score,
-            'reasoning': self._generate_reasoning(prm_score, min_confidence),
-            'harmonic_alignment': harmonic_freq in [432, 528, 639],
+            'reasoning': self._generate_reasoning(prm_score, self.min_confidence),
+            'harmonic_alignment': harmonic_freq in HARMONIC_FREQUENCIES,
             'timestamp': datetime.now().isoformat()
         }
         
@@ -64,64 +173,417 @@ class PollyAI:
     async def negotiate_price(self, current_price: float, target_price: float) -> Dict:
         """Negotiate optimal entry price"""
         spread = abs(target_price - current_price) / current_price
-        
-        if spread < 0.01:  # Within 1%
-            return {
-                'action': 'accept',
-                'price': current_price,
-                'reasoning': 'Price within acceptable range'
-            }
-        elif spread < 0.05:  # Within 5%
-            return {
-                'action': 'counter',
-                'price': (current_price + target_price) / 2,
-                'reasoning': 'Propose mid-point negotiation'
-            }
+        return _negotiation(spread, current_price, target_price, self.accept_spread, self.counter_spread)
+
+
+def _negotiation(spread: float, current_price: float, target_price: float,
+                 accept_spread: float = ACCEPT_SPREAD, counter_spread: float = COUNTER_SPREAD) -> Dict:
+    """Negotiation outcome for a known spread"""
+    if spread < accept_spread:
+        return {
+            'action': 'accept',
+            'price': current_price,
+            'reasoning': 'Price within acceptable range'
+        }
+    elif spread < counter_spread:
+        return {
+            'action': 'counter',
+            'price': (current_price + target_price) / 2,
+            'reasoning': 'Propose mid-point negotiation'
+        }
+    else:
+        return {
+            'action': 'reject',
+            'price': None,
+            'reasoning': 'Spread too wide - wait for better entry'
+        }
+
+
+# Sliding spend windows, in days
+SPEND_PERIODS = {
+    'daily': 1,
+    'weekly': 7,
+    'monthly': 30,
+    'yearly': 365
+}
+
+DEFAULT_SPEND_LIMITS = {
+    'daily': 10.0,      # $10/day
+    'weekly': 50.0,     # $50/week
+    'monthly': 200.0,   # $200/month
+    'yearly': 2000.0    # $2000/year
+}
+
+# Ledger time resolution: spend is aggregated into hourly buckets
+LEDGER_BUCKET_SECONDS = 3600
+
+# Seconds an uncommitted spend reservation holds budget before it lapses
+DEFAULT_RESERVATION_TTL = 60.0
+
+# Order book routing: symbol for market data without a 'pair'; resting orders
+# are pulled when the reservation backing them lapses
+DEFAULT_PAIR = 'AVAX/USD'
+ORDER_TTL = DEFAULT_RESERVATION_TTL
+
+
+class SpendLedger:
+    """
+    Sliding-window spend totals over time buckets
+    Spend is aggregated per bucket; each period keeps a running sum and a
+    cursor to its oldest bucket, so advancing time or recording spend is
+    amortised O(1) and reading all window totals is O(periods)
+    """
+    
+    def __init__(self, bucket_seconds: int = LEDGER_BUCKET_SECONDS,
+                 periods: Optional[Dict[str, float]] = None):
+        self.bucket_seconds = bucket_seconds
+        self.periods = dict(periods or SPEND_PERIODS)
+        self._spans = {
+            period: max(1, int(round(days * 86400 / bucket_seconds)))
+            for period, days in self.periods.items()
+        }
+        self._longest = max(self._spans.values())
+        self.clear()
+    
+    def clear(self):
+        self._buckets: deque = deque()  # [bucket, amount], ascending, non-empty only
+        self._base = 0                  # Absolute position of _buckets[0]
+        self._first = {period: 0 for period in self._spans}
+        self._sums = {period: 0.0 for period in self._spans}
+        self._now_bucket = None
+    
+    def bucket_of(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+    
+    def advance(self, timestamp: float):
+        """Slide every window forward to `timestamp`"""
+        now_bucket = self.bucket_of(timestamp)
+        if self._now_bucket is not None and now_bucket <= self._now_bucket:
+            return
+        self._now_bucket = now_bucket
+        end = self._base + len(self._buckets)
+        for period, span in self._spans.items():
+            cutoff = now_bucket - span
+            first = self._first[period]
+            while first < end and self._buckets[first - self._base][0] <= cutoff:
+                self._sums[period] -= self._buckets[first - self._base][1]
+                first += 1
+            self._first[period] = first
+            if first == end:
+                self._sums[period] = 0.0  # Drop accumulated rounding error
+        oldest = min(self._first.values())
+        while self._base < oldest:
+            self._buckets.popleft()
+            self._base += 1
+    
+    def add(self, amount: float, timestamp: float):
+        """Record spend at `timestamp` (at or after the last recorded bucket)"""
+        self.advance(timestamp)
+        bucket = self.bucket_of(timestamp)
+        if self._buckets and self._buckets[-1][0] > bucket:
+            self.load(list(self._buckets) + [[bucket, amount]], timestamp)
+            return
+        if self._buckets and self._buckets[-1][0] == bucket:
+            self._buckets[-1][1] += amount
         else:
-            return {
-                'action': 'reject',
-                'price': None,
-                'reasoning': 'Spread too wide - wait for better entry'
-            }
+            self._buckets.append([bucket, amount])
+        for period in self._sums:
+            self._sums[period] += amount
+    
+    def load(self, buckets, timestamp: float):
+        """Rebuild from (bucket, amount) pairs, e.g. rows read from a store"""
+        merged: Dict[int, float] = {}
+        for bucket, amount in buckets:
+            merged[bucket] = merged.get(bucket, 0.0) + amount
+        self.clear()
+        self._now_bucket = self.bucket_of(timestamp)
+        for bucket in sorted(merged):
+            if bucket > self._now_bucket - self._longest:
+                self._buckets.append([bucket, merged[bucket]])
+        for period, span in self._spans.items():
+            cutoff = self._now_bucket - span
+            first = 0
+            while first < len(self._buckets) and self._buckets[first][0] <= cutoff:
+                first += 1
+            self._first[period] = first
+            self._sums[period] = sum(amount for _, amount in list(self._buckets)[first:])
+    
+    def totals(self, timestamp: float) -> Dict[str, float]:
+        self.advance(timestamp)
+        return {period: max(total, 0.0) for period, total in self._sums.items()}
+    
+    def oldest_bucket(self, timestamp: float) -> int:
+        """Oldest bucket any window can still see at `timestamp`"""
+        return self.bucket_of(timestamp) - self._longest + 1
+
+
+class SQLiteSpendStore:
+    """
+    Durable per-agent spend buckets in a local SQLite file
+    WAL mode and a busy timeout let agents in several processes share one
+    file; PRAGMA data_version tells a reader when another process wrote, and
+    a write counter does the same for managers sharing this connection (the
+    pragma ignores its own connection's commits). Reservations live in the
+    same file so reserve() is atomic across processes
+    """
+    
+    def __init__(self, path: str, mmap_size: int = 64 * 1024 * 1024, timeout: float = 30.0):
+        import sqlite3
+        
+        self.path = path
+        self.lock = threading.RLock()  # One connection, shared by this process's managers
+        self.writes = 0  # Ledger writes through this connection, see data_version
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None,
+                                          check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(f'PRAGMA mmap_size={int(mmap_size)}')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS spend_ledger ('
+            ' agent_id TEXT NOT NULL,'
+            ' bucket INTEGER NOT NULL,'
+            ' amount REAL NOT NULL,'
+            ' PRIMARY KEY (agent_id, bucket)'
+            ') WITHOUT ROWID'
+        )
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS spend_reservations ('
+            ' id TEXT PRIMARY KEY,'
+            ' agent_id TEXT NOT NULL,'
+            ' amount REAL NOT NULL,'
+            ' expires_at REAL NOT NULL'
+            ')'
+        )
+        self.connection.execute(
+            'CREATE INDEX IF NOT EXISTS spend_reservations_agent ON spend_reservations (agent_id)'
+        )
+    
+    @contextmanager
+    def transaction(self):
+        """Write transaction that excludes every other process until it ends"""
+        with self.lock:
+            self.connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield self
+            except BaseException:
+                self.connection.execute('ROLLBACK')
+                raise
+            self.connection.execute('COMMIT')
+    
+    def load(self, agent_id: str, since_bucket: int) -> List[tuple]:
+        with self.lock:
+            return self.connection.execute(
+                'SELECT bucket, amount FROM spend_ledger WHERE agent_id = ? AND bucket >= ?',
+                (agent_id, since_bucket)
+            ).fetchall()
+    
+    def add(self, agent_id: str, bucket: int, amount: float):
+        with self.lock:
+            self.connection.execute(
+                'INSERT INTO spend_ledger (agent_id, bucket, amount) VALUES (?, ?, ?) '
+                'ON CONFLICT (agent_id, bucket) DO UPDATE SET amount = amount + excluded.amount',
+                (agent_id, bucket, amount)
+            )
+            self.writes += 1
+    
+    def reserved(self, agent_id: str, now: float) -> float:
+        """Budget held by live reservations (expired ones are deleted first)"""
+        with self.lock:
+            self.connection.execute('DELETE FROM spend_reservations WHERE expires_at <= ?', (now,))
+            return self.connection.execute(
+                'SELECT COALESCE(SUM(amount), 0) FROM spend_reservations WHERE agent_id = ?',
+                (agent_id,)
+            ).fetchone()[0]
+    
+    def add_reservation(self, reservation_id: str, agent_id: str, amount: float, expires_at: float):
+        with self.lock:
+            self.connection.execute(
+                'INSERT INTO spend_reservations (id, agent_id, amount, expires_at) VALUES (?, ?, ?, ?)',
+                (reservation_id, agent_id, amount, expires_at)
+            )
+    
+    def pop_reservation(self, reservation_id: str, now: float) -> Optional[float]:
+        """Remove a reservation, returning its amount (None if unknown or expired)"""
+        with self.lock:
+            row = self.connection.execute(
+                'DELETE FROM spend_reservations WHERE id = ? RETURNING amount, expires_at',
+                (reservation_id,)
+            ).fetchone()
+            return row[0] if row and row[1] > now else None
+    
+    def take_reservation(self, reservation_id: str, amount: float, now: float) -> Optional[float]:
+        """Use up to `amount` of a reservation, keeping any rest held; returns what was taken"""
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT amount, expires_at FROM spend_reservations WHERE id = ?', (reservation_id,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                return None
+            taken = min(amount, row[0])
+            if row[0] > taken:
+                self.connection.execute('UPDATE spend_reservations SET amount = ? WHERE id = ?',
+                                        (row[0] - taken, reservation_id))
+            else:
+                self.connection.execute('DELETE FROM spend_reservations WHERE id = ?', (reservation_id,))
+            return taken
+    
+    def prune(self, before_bucket: int):
+        """Delete buckets no window can see any more"""
+        with self.lock:
+            self.connection.execute('DELETE FROM spend_ledger WHERE bucket < ?', (before_bucket,))
+            self.writes += 1
+    
+    def data_version(self) -> tuple:
+        """Changes whenever the ledger was written, by another process or through this connection"""
+        with self.lock:
+            return self.connection.execute('PRAGMA data_version').fetchone()[0], self.writes
+    
+    def close(self):
+        with self.lock:
+            self.connection.close()
 
 
 class SpendLimitManager:
-    """Enforce weekly/monthly/yearly spend limits"""
+    """
+    Enforce daily/weekly/monthly/yearly spend limits over sliding windows
+    Pass a SQLiteSpendStore to persist spend across restarts and share it
+    between agent processes; pass `clock` to run on simulated time.
+    
+    Concurrent trades use reserve() → commit()/release(): reserve checks the
+    limits and holds the budget atomically (under a per-manager lock, and in
+    an IMMEDIATE transaction when store-backed), so parallel coroutines,
+    threads or processes cannot jointly overshoot a limit
+    """
     
-    def __init__(self, agent_id: str):
+    def __init__(self, agent_id: str, limits: Optional[Dict[str, float]] = None,
+                 store: Optional[SQLiteSpendStore] = None, clock=time.time,
+                 bucket_seconds: int = LEDGER_BUCKET_SECONDS):
         self.agent_id = agent_id
-        self.limits = {
-            'daily': 10.0,      # $10/day
-            'weekly': 50.0,     # $50/week
-            'monthly': 200.0,   # $200/month
-            'yearly': 2000.0    # $2000/year
-        }
-        self.spending = {
-            'daily': 0.0,
-            'weekly': 0.0,
-            'monthly': 0.0,
-            'yearly': 0.0
-        }
-        self.last_reset = {
-            'daily': datetime.now(),
-            'weekly': datetime.now(),
-            'monthly': datetime.now(),
-            'yearly': datetime.now()
-        }
+        self.limits = dict(limits or DEFAULT_SPEND_LIMITS)
+        unknown = sorted(set(self.limits) - set(SPEND_PERIODS))
+        if unknown:
+            raise ValueError(f"unknown spend period(s) {', '.join(unknown)}; "
+                             f"expected any of {', '.join(SPEND_PERIODS)}")
+        self.store = store
+        self.clock = clock
+        self.ledger = SpendLedger(bucket_seconds, {period: SPEND_PERIODS[period] for period in self.limits})
+        self._store_version = None
+        self._lock = threading.RLock()
+        self._reservations: Dict[str, tuple] = {}  # id -> (amount, expires_at), local only
+        self._sync()
+    
+    @property
+    def spending(self) -> Dict[str, float]:
+        """Spend inside each sliding window right now"""
+        self._sync()
+        return self.ledger.totals(self.clock())
+    
+    @property
+    def reserved(self) -> float:
+        """Budget held by uncommitted reservations"""
+        with self._lock:
+            return self._reserved(self.clock())
     
     def check_limit(self, amount: float) -> Dict:
-        """Check if trade amount is within limits"""
-        self._reset_periods()
-        
+        """Check if trade amount is within limits (spent plus reserved)"""
+        return self._check(amount, self._exposure())
+    
+    def reserve(self, amount: float, ttl: float = DEFAULT_RESERVATION_TTL) -> Dict:
+        """
+        Atomically check the limits and hold `amount` of budget
+        Approved results carry a reservation_id for commit() or release();
+        reservations not committed within `ttl` seconds lapse
+        """
+        with self._lock:
+            if self.store is None:
+                return self._reserve(amount, ttl)
+            with self.store.transaction():
+                return self._reserve(amount, ttl)
+    
+    def _reserve(self, amount: float, ttl: float) -> Dict:
+        now = self.clock()
+        result = self._check(amount, self._exposure(now))
+        if result['approved']:
+            reservation_id = uuid.uuid4().hex
+            if self.store is None:
+                self._reservations[reservation_id] = (amount, now + ttl)
+            else:
+                self.store.add_reservation(reservation_id, self.agent_id, amount, now + ttl)
+            result['reservation_id'] = reservation_id
+        return result
+    
+    def commit(self, reservation_id: str, amount: Optional[float] = None) -> bool:
+        """
+        Turn a reservation into recorded spend; False if it lapsed or is unknown
+        `amount` commits only part of it (e.g. a partial fill), keeping the rest held
+        """
+        with self._lock:
+            if self.store is None:
+                entry = self._reservations.pop(reservation_id, None)
+                if entry is None or entry[1] <= self.clock():
+                    return False
+                spent = entry[0] if amount is None else min(amount, entry[0])
+                if entry[0] > spent:
+                    self._reservations[reservation_id] = (entry[0] - spent, entry[1])
+                self.record_spend(spent)
+                return True
+            with self.store.transaction():
+                if amount is None:
+                    spent = self.store.pop_reservation(reservation_id, self.clock())
+                else:
+                    spent = self.store.take_reservation(reservation_id, amount, self.clock())
+                if spent is None:
+                    return False
+                self.record_spend(spent)
+            return True
+    
+    def release(self, reservation_id: str) -> bool:
+        """Give a reservation's budget back without spending it"""
+        with self._lock:
+            if self.store is None:
+                return self._reservations.pop(reservation_id, None) is not None
+            return self.store.pop_reservation(reservation_id, self.clock()) is not None
+    
+    def _reserved(self, now: float) -> float:
+        if self.store is not None:
+            return self.store.reserved(self.agent_id, now)
+        expired = [rid for rid, (_, expires_at) in self._reservations.items() if expires_at <= now]
+        for rid in expired:
+            del self._reservations[rid]
+        return sum(amount for amount, _ in self._reservations.values())
+    
+    def _exposure(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Spent plus reserved budget per window"""
+        with self._lock:
+            now = self.clock() if now is None else now
+            self._sync()
+            reserved = self._reserved(now)
+            return {period: total + reserved for period, total in self.ledger.totals(now).items()}
+    
+    def check_limits(self, amounts: Sequence[float], cumulative: bool = False) -> List[Dict]:
+        """
+        Check a batch of proposed trades against one snapshot of the windows
+        cumulative=True assumes each approved trade executes before the next
+        """
+        spending = self._exposure()
+        results = []
+        for amount in amounts:
+            result = self._check(amount, spending)
+            if cumulative and result['approved']:
+                spending = {period: total + amount for period, total in spending.items()}
+            results.append(result)
+        return results
+    
+    def _check(self, amount: float, spending: Dict[str, float]) -> Dict:
         violations = []
-        for period in ['daily', 'weekly', 'monthly', 'yearly']:
-            if self.spending[period] + amount > self.limits[period]:
+        for period in self.limits:
+            if spending[period] + amount > self.limits[period]:
                 violations.append({
                     'period': period,
                     'limit': self.limits[period],
-                    'current': self.spending[period],
+                    'current': spending[period],
                     'requested': amount,
-                    'available': self.limits[period] - self.spending[period]
+                    'available': self.limits[period] - spending[period]
                 })
         
         if violations:
@@ -139,68 +601,120 @@ class SpendLimitManager:
     
     def record_spend(self, amount: float):
         """Record completed trade"""
-        self._reset_periods()
-        for period in self.spending:
-            self.spending[period] += amount
+        with self._lock:
+            now = self.clock()
+            if self.store is None:
+                self.ledger.add(amount, now)
+                return
+            with self.store.lock:  # No other manager's write may land between sync and add
+                self._sync()
+                self.ledger.add(amount, now)
+                self.store.add(self.agent_id, self.ledger.bucket_of(now), amount)
+                self._store_version = self.store.data_version()
     
-    def _reset_periods(self):
-        """Reset spending counters based on time periods"""
-        now = datetime.now()
-        
-        # Daily reset
-        if (now - self.last_reset['daily']).days >= 1:
-            self.spending['daily'] = 0.0
-            self.last_reset['daily'] = now
-        
-        # Weekly reset
-        if (now - self.last_reset['weekly']).days >= 7:
-            self.spending['weekly'] = 0.0
-            self.last_reset['weekly'] = now
-        
-        # Monthly reset
-        if (now - self.last_reset['monthly']).days >= 30:
-            self.spending['monthly'] = 0.0
-            self.last_reset['monthly'] = now
-        
-        # Yearly reset
-        if (now - self.last_reset['yearly']).days >= 365:
-            self.spending['yearly'] = 0.0
-            self.last_reset['yearly'] = now
+    def _sync(self):
+        """Reload from the store when another process has written to it"""
+        if self.store is None:
+            return
+        version = self.store.data_version()
+        if version != self._store_version:
+            now = self.clock()
+            self.ledger.load(self.store.load(self.agent_id, self.ledger.oldest_bucket(now)), now)
+            self._store_version = version
     
     def get_status(self) -> Dict:
         """Get current spending status"""
-        self._reset_periods()
+        spending = self.spending
+        reserved = self.reserved
         return {
             'limits': self.limits,
-            'spending': self.spending,
+            'spending': spending,
+            'reserved': reserved,
             'available': {
-                period: self.limits[period] - self.spending[period]
+                period: self.limits[period] - spending[period] - reserved
                 for period in self.limits
             }
         }
 
 
 class RangisAgent:
-    """Complete Mighty Agent with Polly brain and spend limits"""
+    """
+    Complete Mighty Agent with Polly brain and spend limits
+    Pass an order book Exchange (Order-Book-engine) shared by several agents
+    and negotiated prices become limit orders the agents trade against each
+    other with; without one, negotiation is the one-shot accept/counter rule.
+    The exchange should run on the agents' clock, since resting orders expire
+    with their spend reservations.
+    min_confidence / accept_spread / counter_spread override the personality's
+    PRM threshold and the negotiation bands (see PollyAI)
+    """
     
-    def __init__(self, agent_id: str, personality: str = "moderate"):
+    def __init__(self, agent_id: str, personality: str = "moderate",
+                 history_size: int = DEFAULT_HISTORY_SIZE, history_dir: Optional[str] = None,
+                 spend_store: Optional[SQLiteSpendStore] = None,
+                 spend_limits: Optional[Dict[str, float]] = None, clock=time.time,
+                 exchange=None, prm_scorer=None, min_confidence: Optional[float] = None,
+                 accept_spread: float = ACCEPT_SPREAD, counter_spread: float = COUNTER_SPREAD):
         self.agent_id = agent_id
-        self.polly = PollyAI(agent_id, personality)
-        self.spend_manager = SpendLimitManager(agent_id)
+        self.exchange = exchange
+        self.open_orders: Dict[int, Dict] = {}  # Resting order id -> reservation, remaining units
+        self.polly = PollyAI(agent_id, personality, history_size, history_dir,
+                             min_confidence=min_confidence, accept_spread=accept_spread,
+                             counter_spread=counter_spread, prm_scorer=prm_scorer)
+        self.spend_manager = SpendLimitManager(agent_id, spend_limits, store=spend_store, clock=clock)
         self.wallet_address: Optional[str] = None
-        self.trade_history: List[Dict] = []
+        self.trade_history = BoundedHistory(
+            history_size, _spill_path(history_dir, agent_id, 'trades')
+        )
+        
+        # Running totals so get_stats stays O(1) however long the agent runs
+        self.total_trades = 0
+        self.total_spent = 0.0
+        self._confidence_sum = 0.0
         
     async def connect_wallet(self, ibp_wallet_address: str):
         """Connect IBP wallet for payments"""
         self.wallet_address = ibp_wallet_address
         print(f"✅ Agent {self.agent_id} connected to IBP wallet: {ibp_wallet_address[:10]}...")
     
+    def close(self):
+        """Close the decision and trade history spill files (the spend store is the caller's)"""
+        self.polly.close()
+        self.trade_history.close()
+    
     async def evaluate_trade(self, market_data: Dict) -> Dict:
-        """Full trade evaluation pipeline"""
+        """
+        Full trade evaluation pipeline
+        Steps are timed as agent.analysis / agent.negotiation / agent.limit_check
+        stages (plus agent.matching when trading on an exchange)
+        """
         
         # Step 1: Polly analysis
-        decision = await self.polly.analyze_trade(market_data)
+        with stage('agent.analysis'):
+            decision = await self.polly.analyze_trade(market_data)
+        
+        # Step 3 (price negotiation) is pure, so it is resolved up front
+        negotiation = None
+        if decision['should_trade']:
+            current_price = market_data.get('price', 100.0)
+            target_price = market_data.get('target_price', current_price)
+            with stage('agent.negotiation'):
+                negotiation = await self.polly.negotiate_price(current_price, target_price)
         
+        return self._complete_evaluation(market_data, decision, negotiation)
+    
+    def _complete_evaluation(self, market_data: Dict, decision: Dict,
+                             negotiation: Optional[Dict], limit_check: Optional[Dict] = None) -> Dict:
+        """
+        Spend-limit check and final verdict for an analysed, negotiated trade
+        A precomputed `limit_check` (no reservation_id) skips the budget hold
+        """
+        result = self._verdict(market_data, decision, negotiation, limit_check)
+        INSTRUMENTATION.count('agent.decisions.' + result['status'])
+        return result
+    
+    def _verdict(self, market_data: Dict, decision: Dict, negotiation: Optional[Dict],
+                 limit_check: Optional[Dict] = None) -> Dict:
         if not decision['should_trade']:
             return {
                 'status': 'rejected',
@@ -208,9 +722,12 @@ class RangisAgent:
                 'agent': self.agent_id
             }
         
-        # Step 2: Check spend limits
+        # Step 2: Check spend limits and hold the budget until execution
         trade_amount = market_data.get('amount', 0.01)
-        limit_check = self.spend_manager.check_limit(trade_amount)
+        if limit_check is None:
+            with stage('agent.limit_check'):
+                limit_check = self.spend_manager.reserve(trade_amount)
+        reservation_id = limit_check.get('reservation_id')
         
         if not limit_check['approved']:
             return {
@@ -221,11 +738,9 @@ class RangisAgent:
             }
         
         # Step 3: Negotiate price
-        current_price = market_data.get('price', 100.0)
-        target_price = market_data.get('target_price', current_price)
-        negotiation = await self.polly.negotiate_price(current_price, target_price)
-        
         if negotiation['action'] == 'reject':
+            if reservation_id is not None:
+                self.spend_manager.release(reservation_id)
             return {
                 'status': 'rejected',
                 'reason': negotiation['reasoning'],
@@ -233,26 +748,114 @@ class RangisAgent:
             }
         
         # Step 4: Execute trade
-        return {
+        trade = {
             'status': 'approved',
             'action': 'BUY',
             'amount': trade_amount,
             'price': negotiation['price'],
             'confidence': decision['confidence'],
             'harmonic_freq': market_data.get('harmonic_freq', 528),
-            'haptic_pattern': self._generate_haptic(decision['confidence']),
+            'haptic_pattern': self._generate_haptic(
+                decision['confidence'],
+                market_data.get('volatility', 0.0),
+                market_data.get('trend', 0.0)
+            ),
+            'reservation_id': reservation_id,
             'agent': self.agent_id,
             'timestamp': datetime.now().isoformat()
         }
+        # Resting orders live off their reservation, so unheld verdicts are not routed
+        if self.exchange is None or reservation_id is None:
+            return trade
+        with stage('agent.matching'):
+            return self._route_order(market_data, trade)
     
-    def _generate_haptic(self, confidence: float) -> List[int]:
-        """Generate haptic pattern based on confidence"""
-        if confidence >= 0.9:
-            return [111, 0, 111, 0, 111]  # Strong triple pulse
-        elif confidence >= 0.75:
-            return [50, 0, 100, 0, 50]    # Medium pulse
-        else:
-            return [30, 0, 30]             # Gentle pulse
+    def _route_order(self, market_data: Dict, trade: Dict) -> Dict:
+        """
+        Place the negotiated price as a limit order
+        The trade amount is a spend (quote currency), so the order is for
+        amount / price base units. Immediate fills approve the trade for their
+        notional (filled units x average price, 'units' holds the quantity);
+        the rest rests in the book, still holding its reserved budget, until
+        another agent trades against it (see settle_fills), it is cancelled or
+        its reservation lapses. Nothing filled → status 'resting'.
+        The exchange never matches an agent with itself: crossing one of this
+        agent's own resting orders cancels that order and releases its budget
+        """
+        self.settle_fills()
+        self._expire_orders()
+        
+        side = market_data.get('side', 'buy')
+        order = self.exchange.submit(market_data.get('pair', DEFAULT_PAIR), side, trade['price'],
+                                     trade['amount'] / trade['price'], owner=self.agent_id, ttl=ORDER_TTL)
+        for cancelled in order['cancelled']:
+            stale = self.open_orders.pop(cancelled['order_id'], None)
+            if stale is not None:
+                self.spend_manager.release(stale['reservation_id'])
+        trade = {**trade, 'action': side.upper(), 'order_id': order['order_id'], 'limit_price': order['price']}
+        if order['remaining'] > 0:
+            self.open_orders[order['order_id']] = {
+                'trade': trade,
+                'reservation_id': trade['reservation_id'],
+                'remaining': order['remaining'],
+                'expires_at': self.spend_manager.clock() + ORDER_TTL
+            }
+        
+        if not order['filled']:
+            return {**trade, 'status': 'resting', 'units': 0.0,
+                    'reason': f"No counterparty at {order['price']:.4f} yet; order resting in the book"}
+        return {**trade, 'amount': order['filled'] * order['average_price'], 'units': order['filled'],
+                'price': order['average_price'], 'resting': order['remaining'], 'fills': order['fills']}
+    
+    def settle_fills(self) -> List[Dict]:
+        """
+        Book fills other agents made against this agent's resting orders
+        Returns the booked trades, shaped like approved evaluate_trade results
+        (amount is the fill's notional, units its quantity)
+        """
+        if self.exchange is None:
+            return []
+        booked = []
+        for fill in self.exchange.fills(self.agent_id):
+            order = self.open_orders.get(fill['order_id'])
+            trade = {
+                **(order['trade'] if order else {'confidence': 0.0, 'agent': self.agent_id}),
+                'status': 'approved',
+                'action': fill['side'].upper(),
+                'amount': fill['amount'] * fill['price'],
+                'units': fill['amount'],
+                'price': fill['price'],
+                'order_id': fill['order_id'],
+                'counterparty': fill['counterparty'],
+                'reservation_id': order['reservation_id'] if order else None,
+                'timestamp': datetime.now().isoformat()
+            }
+            if order is not None:
+                order['remaining'] -= fill['amount']
+                if order['remaining'] < self.exchange.lot_size / 2:
+                    del self.open_orders[fill['order_id']]
+            self.record_trade(trade)
+            booked.append(trade)
+        return booked
+    
+    def cancel_order(self, order_id: int) -> float:
+        """Pull a resting order and release its budget; returns its unfilled units"""
+        self.settle_fills()
+        order = self.open_orders.pop(order_id, None)
+        if order is None:
+            return 0.0
+        remaining = self.exchange.cancel(order_id)
+        self.spend_manager.release(order['reservation_id'])
+        return remaining
+    
+    def _expire_orders(self):
+        now = self.spend_manager.clock()
+        for order_id in [oid for oid, order in self.open_orders.items() if order['expires_at'] <= now]:
+            self.cancel_order(order_id)
+    
+    def _generate_haptic(self, confidence: float, volatility: float = 0.0, trend: float = 0.0) -> List[int]:
+        """Generate haptic pattern based on confidence (and market state, if known)"""
+        return _haptics.pattern(volatility, trend, confidence)['pattern']
     
     async def execute_trade(self, trade_decision: Dict):
         """Execute trade with ICM warp"""
@@ -260,11 +863,9 @@ class RangisAgent:
             print(f"❌ Trade not approved: {trade_decision.get('reason')}")
             return
         
-        # Record spend
-        self.spend_manager.record_spend(trade_decision['amount'])
-        
-        # Log trade
-        self.trade_history.append(trade_decision)
+        if not self.record_trade(trade_decision):
+            print(f"❌ Trade not executed: spend reservation {trade_decision['reservation_id']} lapsed")
+            return
         
         print(f"✅ Agent {self.agent_id} executed trade:")
         print(f"   Amount: ${trade_decision['amount']}")
@@ -273,22 +874,219 @@ class RangisAgent:
         print(f"   Harmonic: {trade_decision['harmonic_freq']}Hz")
         print(f"   Haptic: {trade_decision['haptic_pattern']}")
     
+    def record_trade(self, trade_decision: Dict) -> bool:
+        """
+        Book an approved trade without the console report (used by backtests)
+        Returns False when its spend reservation has lapsed (order book fills
+        have already happened, so they are booked regardless)
+        """
+        # Record spend against the budget reserved at evaluation
+        reservation_id = trade_decision.get('reservation_id')
+        order_id = trade_decision.get('order_id')
+        if order_id is not None:
+            # Already matched in the book, so the fill is booked even if its hold lapsed
+            if reservation_id is None or not self.spend_manager.commit(reservation_id, trade_decision['amount']):
+                self.spend_manager.record_spend(trade_decision['amount'])
+            if reservation_id is not None and order_id not in self.open_orders:
+                self.spend_manager.release(reservation_id)  # Budget of the unfilled rest
+        elif reservation_id is None:
+            self.spend_manager.record_spend(trade_decision['amount'])
+        elif not self.spend_manager.commit(reservation_id):
+            return False
+        
+        # Log trade
+        self.trade_history.append(trade_decision)
+        self.total_trades += 1
+        self.total_spent += trade_decision.get('amount', 0)
+        self._confidence_sum += trade_decision.get('confidence', 0)
+        return True
+    
     def get_stats(self) -> Dict:
         """Get agent performance stats"""
-        total_trades = len(self.trade_history)
-        total_spent = sum(t.get('amount', 0) for t in self.trade_history)
-        avg_confidence = sum(t.get('confidence', 0) for t in self.trade_history) / total_trades if total_trades > 0 else 0
+        total_trades = self.total_trades
+        avg_confidence = self._confidence_sum / total_trades if total_trades > 0 else 0
         
         return {
             'agent_id': self.agent_id,
             'total_trades': total_trades,
-            'total_spent': total_spent,
+            'total_spent': self.total_spent,
             'avg_confidence': avg_confidence,
             'spend_limits': self.spend_manager.get_status(),
             'personality': self.polly.personality
         }
 
 
+class AgentFleet:
+    """
+    Evaluate many RangisAgents against many market scenarios in one pass
+    PRM threshold comparisons and negotiation spreads are computed as
+    agents x scenarios arrays; per-agent spend checks run concurrently.
+    With a PRMScorer, every scenario's PRM score comes from one batched
+    score over the scenarios' pairs (prm_score remains the warm-up fallback)
+    
+    Batch verdicts are a screen, not a commitment: each agent's limits are
+    checked against one snapshot of its windows (approved trades counted
+    cumulatively within the batch) without holding budget or placing orders.
+    Approved decisions carry reservation_id None, so record_trade() books
+    the ones actually executed as plain spend
+    """
+    
+    def __init__(self, agents: Sequence[RangisAgent], prm_scorer=None):
+        self.agents = list(agents)
+        self.prm_scorer = prm_scorer
+    
+    async def evaluate_batch(self, scenarios: Sequence[Dict]) -> Dict:
+        """
+        Evaluate every agent against every scenario
+        Returns decisions[agent][scenario] (same shape as evaluate_trade
+        results) plus throughput metrics
+        """
+        import numpy as np
+        
+        started = time.perf_counter()
+        scenarios = list(scenarios)
+        
+        prm_scores = np.array([s.get('prm_score', 0.5) for s in scenarios], dtype=float)
+        if self.prm_scorer is not None:
+            with stage('fleet.prm_scoring'):
+                prm_scores = self.prm_scorer.score_batch(
+                    [s.get('pair') for s in scenarios],
+                    [s.get('side', 'buy') for s in scenarios],
+                    default=prm_scores
+                )
+        current = np.array([s.get('price', 100.0) for s in scenarios], dtype=float)
+        target = np.array([s.get('target_price', s.get('price', 100.0)) for s in scenarios], dtype=float)
+        thresholds = np.array([a.polly.min_confidence for a in self.agents], dtype=float)
+        
+        with stage('fleet.analysis'):
+            should_trade = prm_scores[None, :] >= thresholds[:, None]
+        with stage('fleet.negotiation'):
+            # One negotiation row per distinct (accept, counter) band pair in the fleet
+            spreads = np.abs(target - current) / current
+            quotes = list(zip(spreads.tolist(), current.tolist(), target.tolist()))
+            negotiations = {}
+            for agent in self.agents:
+                bands = (agent.polly.accept_spread, agent.polly.counter_spread)
+                if bands not in negotiations:
+                    negotiations[bands] = [
+                        _negotiation(spread, price, target_price, *bands)
+                        for spread, price, target_price in quotes
+                    ]
+        
+        decisions = await asyncio.gather(*(
+            self._evaluate_agent(
+                agent, row, scenarios,
+                negotiations[(agent.polly.accept_spread, agent.polly.counter_spread)],
+                prm_scores.tolist()
+            )
+            for agent, row in zip(self.agents, should_trade.tolist())
+        ))
+        
+        elapsed = time.perf_counter() - started
+        evaluations = len(self.agents) * len(scenarios)
+        approved = sum(d['status'] == 'approved' for row in decisions for d in row)
+        return {
+            'decisions': decisions,
+            'agents': len(self.agents),
+            'scenarios': len(scenarios),
+            'evaluations': evaluations,
+            'approved': approved,
+            'elapsed_s': elapsed,
+            'evaluations_per_sec': evaluations / elapsed if elapsed > 0 else float('inf')
+        }
+    
+    async def _evaluate_agent(self, agent: RangisAgent, should_trade: List[bool],
+                              scenarios: List[Dict], negotiations: List[Dict],
+                              prm_scores: List[float]) -> List[Dict]:
+        results = []
+        manager = agent.spend_manager
+        with stage('agent.limit_check'):
+            exposure = manager._exposure()
+        for market_data, trade, negotiation, prm_score in zip(scenarios, should_trade, negotiations, prm_scores):
+            decision = agent.polly._decide(
+                prm_score,
+                market_data.get('harmonic_freq', 432),
+                trade
+            )
+            limit_check = None
+            if trade:
+                amount = market_data.get('amount', 0.01)
+                limit_check = manager._check(amount, exposure)
+                if limit_check['approved'] and negotiation['action'] != 'reject':
+                    exposure = {period: total + amount for period, total in exposure.items()}
+            results.append(agent._complete_evaluation(market_data, decision, negotiation, limit_check))
+        await asyncio.sleep(0)  # Let other agents' evaluations interleave
+        return results
+
+
+def _spend_contention_worker(manager: SpendLimitManager, operations: int, amount: float) -> int:
+    committed = 0
+    for _ in range(operations):
+        result = manager.reserve(amount)
+        if result['approved'] and manager.commit(result['reservation_id']):
+            committed += 1
+    return committed
+
+
+def _spend_contention_process(store_path: str, limits: Dict[str, float],
+                              operations: int, amount: float) -> int:
+    manager = SpendLimitManager('bench-agent', limits, store=SQLiteSpendStore(store_path))
+    return _spend_contention_worker(manager, operations, amount)
+
+
+def benchmark_spend_contention(workers: int = 8, operations: int = 2000, amount: float = 1.0,
+                               processes: int = 0, store_path: Optional[str] = None) -> Dict:
+    """
+    Check-and-reserve throughput with many workers racing for one budget
+    The daily limit covers only half the attempted spend, so the run also
+    proves the limit holds: committed spend must never exceed it.
+    processes=0 runs `workers` threads on one in-memory manager; processes>0
+    runs that many processes, each with its own manager on a shared SQLite store
+    """
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    
+    parallel = processes or workers
+    daily_limit = parallel * operations * amount / 2
+    limits = {'daily': daily_limit, 'weekly': daily_limit * 7,
+              'monthly': daily_limit * 30, 'yearly': daily_limit * 365}
+    
+    with tempfile.TemporaryDirectory() as scratch:
+        started = time.perf_counter()
+        if processes:
+            store_path = store_path or os.path.join(scratch, 'spend.db')
+            SQLiteSpendStore(store_path).close()
+            with ProcessPoolExecutor(processes) as pool:
+                committed = sum(pool.map(
+                    _spend_contention_process,
+                    [store_path] * processes, [limits] * processes,
+                    [operations] * processes, [amount] * processes
+                ))
+            spent = SpendLimitManager('bench-agent', limits, store=SQLiteSpendStore(store_path)).spending['daily']
+        else:
+            manager = SpendLimitManager('bench-agent', limits)
+            with ThreadPoolExecutor(workers) as pool:
+                committed = sum(pool.map(
+                    _spend_contention_worker,
+                    [manager] * workers, [operations] * workers, [amount] * workers
+                ))
+            spent = manager.spending['daily']
+        elapsed = time.perf_counter() - started
+    
+    attempts = parallel * operations
+    return {
+        'mode': 'processes+sqlite' if processes else 'threads',
+        'parallelism': parallel,
+        'attempts': attempts,
+        'committed': committed,
+        'daily_limit': daily_limit,
+        'spent': spent,
+        'limit_held': spent <= daily_limit + 1e-9,
+        'elapsed_s': elapsed,
+        'reservations_per_sec': attempts / elapsed if elapsed > 0 else float('inf')
+    }
+
+
 # Demo usage
 async def demo_agent():
     """Demo Mighty Agent in action"""
@@ -349,14 +1147,64 @@ async def demo_agent():
             print(f"❌ Trade rejected: {decision['reason']}")
         
         print()
-        time.sleep(1)
+        await asyncio.sleep(1)
     
     # Show stats
     print("=" * 50)
     print("📈 Agent Performance Stats:")
     stats = agent.get_stats()
     print(json.dumps(stats, indent=2))
+    print()
+    
+    # Fleet evaluation: every personality against every scenario at once
+    fleet = AgentFleet([
+        RangisAgent(f"polly-fleet-{i:03d}", personality)
+        for i, personality in enumerate(['aggressive', 'moderate', 'conservative'] * 100)
+    ])
+    batch = await fleet.evaluate_batch(market_scenarios)
+    print("🚀 Fleet Evaluation:")
+    print(f"   {batch['agents']} agents x {batch['scenarios']} scenarios = {batch['evaluations']} evaluations")
+    print(f"   Approved: {batch['approved']}")
+    print(f"   Throughput: {batch['evaluations_per_sec']:,.0f} evaluations/sec")
+    print()
+    
+    # Two agents trading against each other through a shared order book
+    exchange = load_engine("Order-Book-engine").Exchange()
+    maker = RangisAgent("polly-maker-001", "aggressive", exchange=exchange)
+    taker = RangisAgent("polly-taker-001", "aggressive", exchange=exchange)
+    ask = await maker.evaluate_trade({**market_scenarios[0], 'side': 'sell', 'amount': 0.02})
+    bid = await taker.evaluate_trade(market_scenarios[0])
+    if bid['status'] == 'approved':
+        taker.record_trade(bid)
+    maker_fills = maker.settle_fills()
+    print("📒 Order Book:")
+    print(f"   Maker ask: {ask['status']} at ${ask['limit_price']:.2f} for ${ask['amount']}")
+    print(f"   Taker bid: {bid['status']}, filled {bid['units']:.6f} at ${bid['price']:.2f} (${bid['amount']:.4f})")
+    print(f"   Maker fills settled: {len(maker_fills)}, still resting: {exchange.quote(market_scenarios[0]['pair'])['asks']}")
 
 
 if __name__ == "__main__":
-    asyncio.run(demo_agent())
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="RangisNet Polly agent brain")
+    parser.add_argument("--bench-spend", action="store_true",
+                        help="benchmark spend reservations under contention instead of the demo")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--processes", type=int, default=0,
+                        help="with --bench-spend, race processes on a shared SQLite store")
+    parser.add_argument("--stats", choices=("json", "prometheus"),
+                        help="print pipeline stage timings when done")
+    parser.add_argument("--profile", choices=("cpu", "memory", "cpu,memory"),
+                        help="profile with cProfile and/or tracemalloc (also RANGIS_PROFILE)")
+    args = parser.parse_args()
+    profile_from_env({PROFILE_ENV: args.profile} if args.profile else None)
+    
+    if args.bench_spend:
+        print(json.dumps(benchmark_spend_contention(
+            workers=args.workers, operations=args.operations, processes=args.processes
+        ), indent=2))
+    else:
+        asyncio.run(demo_agent())
+    if args.stats:
+        print(INSTRUMENTATION.export(args.stats))
@@ -0,0 +1,40 @@
+"""
+Shared fixtures for the engine test suite
+Engine files have hyphenated names, so tests import them through
+engine_loader.load_engine rather than import statements.
+
+Usage:
+    cd Engines && python3 -m pytest -q tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine_loader import load_engine  # noqa: E402
+
+
+class FakeClock:
+    """Manually advanced clock for SpendLimitManager / Exchange"""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(scope="session")
+def brain():
+    return load_engine("polly-agent-brain")
@@ -0,0 +1,128 @@
+"""Consensus Pulse drift detection and RCP aggregation"""
+
+import math
+
+import numpy as np
+import pytest
+
+from engine_loader import load_engine
+
+VALIDATORS = 500
+DRIFTING = 0.05
+NOW = 1000.0
+
+
+@pytest.fixture(scope="module")
+def pulse_engine():
+    return load_engine("Consensus-Pulse-engine")
+
+
+@pytest.fixture
+def pulse(pulse_engine):
+    return pulse_engine.ConsensusPulse(capacity=16, clock=lambda: NOW)
+
+
+def drifters(validators=VALIDATORS, drifting=DRIFTING, seed=432):
+    """Validator ids sample_packets makes drift (its first draw from the seeded rng)"""
+    chosen = np.random.default_rng(seed).random(validators) < drifting
+    return {f"validator-{i:05d}" for i in np.flatnonzero(chosen)}
+
+
+def reference_drift(engine, detunes):
+    """EWMA mean/variance and CUSUM of one validator's detune ratios, packet by packet"""
+    mean = var = cusum = 0.0
+    for n, detune in enumerate(detunes):
+        if n == 0:
+            mean, var, z = detune, 0.0, 0.0
+        else:
+            delta = detune - mean
+            z = delta / math.sqrt(var + engine.VARIANCE_FLOOR)
+            mean += engine.EWMA_ALPHA * delta
+            var = (1 - engine.EWMA_ALPHA) * (var + engine.EWMA_ALPHA * delta ** 2)
+        cusum = max(0.0, cusum + abs(z) - engine.CUSUM_K)
+    return mean, var, cusum
+
+
+def test_batched_drift_state_matches_per_packet_reference(pulse_engine, pulse):
+    packets = pulse_engine.sample_packets(60, rounds=8, drifting=0.2)
+    # One batch holding every round, so several packets per validator share it
+    assert pulse.ingest(packets)["accepted"] == len(packets)
+
+    for validator_id in {p["validator_id"] for p in packets}:
+        detunes = [p["detune_ratio"] for p in packets if p["validator_id"] == validator_id]
+        mean, var, cusum = reference_drift(pulse_engine, detunes)
+        state = pulse.validator(validator_id)
+        assert state["packets"] == len(detunes)
+        assert state["detune_mean"] == pytest.approx(mean, abs=1e-12)
+        assert state["detune_std"] == pytest.approx(math.sqrt(var), abs=1e-12)
+        assert state["drift_score"] == pytest.approx(cusum, rel=1e-9, abs=1e-9)
+
+
+def test_seeded_drifters_start_drifting_and_nobody_else(pulse_engine, pulse):
+    packets = pulse_engine.sample_packets(VALIDATORS, rounds=10, drifting=DRIFTING)
+    started, cleared = set(), set()
+    for n in range(10):
+        for event in pulse.ingest(packets[n * VALIDATORS:(n + 1) * VALIDATORS])["events"]:
+            (started if event["event"] == "drift_started" else cleared).add(event["validator_id"])
+
+    assert started == drifters()
+    assert cleared == set()
+    assert pulse.rcp(top=0)["drifting"] == len(drifters())
+
+
+def test_drift_clears_once_a_validator_is_back_in_tune(pulse):
+    for n in range(6):
+        pulse.ingest([{"validator_id": "v1", "detune_ratio": 0.01 * (n + 1)}])
+    assert pulse.validator("v1")["drifting"]
+
+    events = []
+    for _ in range(200):
+        events += pulse.ingest([{"validator_id": "v1", "detune_ratio": 0.0}])["events"]
+    assert [event["event"] for event in events] == ["drift_cleared"]
+    assert not pulse.validator("v1")["drifting"]
+
+
+def test_detune_is_derived_from_base_freq_and_camel_case_aliases(pulse):
+    result = pulse.ingest([
+        {"validatorId": "v1", "baseFreq": 432 * 1.01, "loadFactor": 0.5, "syncQuality": 0.9},
+        {"amplitude": 0.1},  # No validator id
+    ])
+    assert (result["accepted"], result["rejected"]) == (1, 1)
+    state = pulse.validator("v1")
+    assert state["detune_ratio"] == pytest.approx(0.01)
+    assert (state["amplitude"], state["timbre"], state["rhythm"]) == (0.5, 0.9, 1.0)
+
+
+def test_rcp_matches_a_direct_computation(pulse_engine, pulse):
+    engine = pulse_engine
+    packets = engine.sample_packets(200, rounds=6, drifting=0.1)
+    pulse.ingest(packets)
+    pulse.ingest([{"validator_id": "stale", "detune_ratio": 0.0}], now=NOW - engine.STALE_AFTER - 1)
+
+    states = [pulse.validator(f"validator-{i:05d}") for i in range(200)]
+    detune = np.array([s["detune_mean"] for s in states])
+    tuning = 1.0 - np.minimum(np.abs(detune) / engine.DETUNE_LIMIT, 1.0)
+    weights = engine.HEALTH_WEIGHTS
+    health = (weights["tuning"] * tuning
+              + weights["load"] * (1.0 - np.clip([s["amplitude"] for s in states], 0, 1))
+              + weights["timbre"] * np.clip([s["timbre"] for s in states], 0, 1)
+              + weights["rhythm"] * np.clip([s["rhythm"] for s in states], 0, 1))
+    phase = 2 * np.pi * np.array([s["phase_offset"] for s in states]) / engine.PULSE_PERIOD_MS
+    coherence = abs(np.mean(np.exp(1j * phase)))
+    drifting = np.mean([s["drifting"] for s in states])
+    stability = health.mean() * (0.5 + 0.5 * coherence) * (1.0 - 0.5 * drifting)
+
+    rcp = pulse.rcp(top=3)
+    assert (rcp["validators"], rcp["stale"]) == (200, 1)
+    assert rcp["stability"] == pytest.approx(stability, abs=1e-4)
+    assert rcp["state"] == engine.rcp_state(1.0 - rcp["stability"])
+    assert rcp["phase_coherence"] == pytest.approx(coherence, abs=1e-4)
+    assert rcp["global_detune"] == pytest.approx(detune.mean(), abs=1e-6)
+    scores = sorted((s["drift_score"] for s in states), reverse=True)[:3]
+    assert [w["score"] for w in rcp["drift_watch"]] == pytest.approx(scores, abs=1e-3)
+
+
+def test_rcp_states_and_no_signal(pulse_engine, pulse):
+    assert pulse.rcp()["state"] == "No Signal"
+    assert [pulse_engine.rcp_state(s) for s in (0.1, 0.3, 0.6, 0.9)] == \
+        ["Low Pulse", "Elevated", "High Pulse", "Chaotic"]
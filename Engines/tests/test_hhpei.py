@@ -0,0 +1,56 @@
+"""HHPEI pitch labelling and harmonic ladder"""
+
+import pytest
+
+from engine_loader import load_engine
+
+
+@pytest.fixture(scope="module")
+def hhpei():
+    return load_engine("HHPEI-engine")
+
+
+def test_label_frequencies_matches_scalar_labels(hhpei):
+    freqs = [1e-3, 27.0, 432.0, 528.0, 432.0 * 33, 5e9]
+    labels = hhpei.label_frequencies(freqs)
+
+    pitches = [hhpei.freq_to_pitch(freq) for freq in freqs]
+    assert labels["note"] == [hhpei.freq_to_note(freq) for freq in freqs]
+    assert labels["octave"].tolist() == [octave for _, octave, _ in pitches]
+    assert labels["cents"].tolist() == [cents for _, _, cents in pitches]
+
+
+def test_out_of_table_frequencies_have_no_pitch(hhpei):
+    labels = hhpei.label_frequencies([432.0, 5e9])
+    assert labels["note"] == ["A4", None]
+    assert labels["midi"].tolist() == [69, None]
+    assert labels["octave"].tolist() == [4, None]
+    assert hhpei.freq_to_pitch(5e9) == (None, None, None)
+    assert hhpei.freq_to_note(5e9) is None
+
+
+def test_market_harmonics_are_not_shared_with_the_cache(hhpei):
+    engine = hhpei.HHPEIEngine()
+    first = engine.calculate_market_harmonics(0.2)
+    first["base_7"][0]["amplitude"] = -1
+    first["extended_33"].clear()
+
+    second = engine.calculate_market_harmonics(0.2)
+    assert second["base_7"][0]["amplitude"] != -1
+    assert len(second["extended_33"]) == 33
+
+
+def test_columnar_format_only_applies_to_payload_methods(hhpei):
+    engine = hhpei.HHPEIEngine(seed=432)
+    full = hhpei.handle_request(engine, {"id": 1, "method": "generate_full_output", "format": "columnar"})
+    ladder = full["result"]["harmonics"]["base_7"]
+    assert isinstance(ladder, dict) and len(ladder["frequency"]) == 7
+
+    plain = hhpei.handle_request(engine, {"id": 2, "method": "calculate_market_harmonics", "format": "json"})
+    assert "error" not in plain
+    for request in ({"id": 3, "method": "calculate_market_harmonics", "format": "columnar"},
+                    {"id": 4, "method": "snapshot", "format": "xml"}):
+        response = hhpei.handle_request(engine, request)
+        assert response["id"] == request["id"] and response["status"] == "failed"
+    assert "only available for generate_full_output, snapshot" in hhpei.handle_request(
+        engine, {"method": "stats", "format": "columnar"})["error"]
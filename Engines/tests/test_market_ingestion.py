@@ -0,0 +1,119 @@
+"""Market ingestion pipeline: agent sink and WebSocket source"""
+
+import asyncio
+
+import pytest
+
+from engine_loader import load_engine
+
+LIMITS = {"daily": 5.0, "weekly": 35.0, "monthly": 150.0, "yearly": 1825.0}
+
+
+@pytest.fixture(scope="module")
+def ingestion():
+    return load_engine("Market-Ingestion-engine")
+
+
+def test_agent_sink_leaves_no_spend_holds(ingestion, brain):
+    agent = brain.RangisAgent("ingest-000", "aggressive", spend_limits=LIMITS)
+    sink = ingestion.AgentSink([agent])
+    ticks = [{**tick, "prm_score": 0.9, "amount": 1.0}
+             for tick in ingestion.sample_ticks(symbols=2, count=40)]
+
+    for start in range(0, len(ticks), 10):
+        asyncio.run(sink(ticks[start:start + 10]))
+        assert agent.spend_manager.reserved == 0.0
+
+    # Each batch is screened against the same unspent $5 daily limit
+    assert sink.evaluations == len(ticks)
+    assert sink.approved == 5 * len(ticks) // 10
+
+
+async def _collect(source):
+    return [row async for row in source]
+
+
+def test_websocket_source_reconnects_after_a_drop(ingestion):
+    ticks = ingestion.sample_ticks(symbols=2, count=30)
+
+    async def run():
+        async with ingestion.MockWebSocketServer(ticks, batch=10, drop_after=2) as server:
+            pool = ingestion.WebSocketPool()
+            try:
+                return await _collect(ingestion.WebSocketSource(server.url, pool, backoff=0.01))
+            finally:
+                await pool.close()
+
+    rows = asyncio.run(run())
+    # Two dropped connections delivered their first batch each, the third the whole feed
+    assert rows == ticks[:10] + ticks[:10] + ticks
+
+
+def test_websocket_source_stops_after_a_clean_close(ingestion):
+    ticks = ingestion.sample_ticks(symbols=2, count=30)
+
+    async def run():
+        async with ingestion.MockWebSocketServer(ticks, batch=10) as server:
+            pool = ingestion.WebSocketPool()
+            try:
+                return await _collect(ingestion.WebSocketSource(server.url, pool, backoff=0.01))
+            finally:
+                await pool.close()
+
+    assert asyncio.run(run()) == ticks
+
+
+def test_websocket_source_gives_up_after_retries(ingestion):
+    async def run():
+        async with ingestion.MockWebSocketServer([]) as server:
+            url = server.url
+        await _collect(ingestion.WebSocketSource(url, retries=2, backoff=0.01))
+
+    with pytest.raises(OSError):
+        asyncio.run(run())
+
+
+def test_coalesced_ticks_keep_their_price_path_for_the_scorer(ingestion):
+    scorer = load_engine("PRM-Scoring-engine").PRMScorer()
+    ticks = [ingestion.normalize_tick(raw) for raw in ingestion.sample_ticks(symbols=1, count=80)]
+    pending = dict(ticks[0])
+    for tick in ticks[1:]:
+        ingestion.merge_ticks(pending, tick)
+
+    assert pending["ticks"] == len(ticks)
+    assert pending["prices"] == [tick["price"] for tick in ticks]
+    assert pending["price"] == ticks[-1]["price"]
+
+    scorer.update(pending["symbol"], pending)
+    row = scorer._rows[pending["symbol"]]
+    assert scorer._ready(row)
+    assert sorted(scorer._prices[row]) == sorted(tick["price"] for tick in ticks[-scorer._prices.shape[1]:])
+
+
+def test_bad_frames_and_rows_are_counted_not_fatal(ingestion):
+    ticks = ingestion.sample_ticks(symbols=2, count=20)
+
+    class BadFrameServer(ingestion.MockWebSocketServer):
+        def _messages(self):
+            yield "not json {"
+            yield "[5, null]"
+            yield from super()._messages()
+
+    async def run():
+        async with BadFrameServer(ticks, batch=10) as server:
+            pool = ingestion.WebSocketPool()
+            ingestor = ingestion.MarketDataIngestor(coalesce=False)
+            ingestor.add_source(ingestion.WebSocketSource(server.url, pool))
+            try:
+                return await ingestor.run()
+            finally:
+                await pool.close()
+
+    stats = asyncio.run(run())
+    assert stats["invalid"] == 3
+    assert stats["dispatched"] == len(ticks)
+
+
+def test_normalize_tick_rejects_non_objects(ingestion):
+    with pytest.raises(ValueError):
+        ingestion.normalize_tick(5)
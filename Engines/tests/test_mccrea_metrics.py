@@ -0,0 +1,152 @@
+"""McCrea metrics: batched engine checked window by window against plain NumPy"""
+
+import numpy as np
+import pytest
+
+from engine_loader import load_engine
+
+
+@pytest.fixture(scope="module")
+def mccrea():
+    return load_engine("McCrea-MetricsEngine")
+
+
+@pytest.fixture(scope="module")
+def inputs(mccrea):
+    return mccrea.sample_inputs(symbols=3, windows=4)
+
+
+def reference_metrics(engine, spectrum, frequencies, dominant, bid_prices, ask_prices,
+                      bid_sizes, ask_sizes, prices, volumes):
+    """All six metrics for ONE window, straight from their definitions"""
+    amplitude_var = np.std(spectrum) / abs(np.mean(spectrum))
+    hvi = np.std(spectrum) / np.mean(dominant) * amplitude_var
+
+    volume_consistency = 1.0 / (1.0 + np.std(volumes) / np.mean(volumes))
+    bid, ask = bid_prices[0], ask_prices[0]
+    spread_bps = (ask - bid) / ((bid + ask) / 2) * 1e4
+    spread_quality = 1.0 / (1.0 + spread_bps / engine.SPREAD_REFERENCE_BPS)
+    hli = volume_consistency * spread_quality / (1.0 + hvi)
+
+    hri = np.sum(sorted(spectrum)[-len(dominant):]) / np.sum(spectrum)
+    sss = 1.0 / (1.0 + np.std(np.diff(np.log(prices))) / engine.SSS_REFERENCE_VOLATILITY)
+    omega = 2 * np.pi * np.sum(spectrum * frequencies) / np.sum(spectrum)
+    p = np.sum(bid_sizes) / (np.sum(bid_sizes) + np.sum(ask_sizes))
+
+    return {"HVI": hvi, "HLI": hli, "HRI": hri, "SSS": sss, "omega": omega, "p": p,
+            "composite_health": (hli + sss + hri) / 3}
+
+
+def test_batched_metrics_match_per_window_computation(mccrea, inputs):
+    engine = mccrea.McCreaMetricsEngine()
+    market, book, flow = inputs["market_data"], inputs["order_book"], inputs["trade_flow"]
+    metrics = engine.calculate_all(market, book, flow)
+
+    for name in metrics:
+        assert metrics[name].shape == (3, 4)
+    for index in np.ndindex(3, 4):
+        expected = reference_metrics(
+            engine, market["spectral_density"][index], market["frequencies"],
+            market["dominant_frequencies"][index],
+            book["bid_prices"][index], book["ask_prices"][index],
+            book["bid_sizes"][index], book["ask_sizes"][index],
+            flow["prices"][index], flow["volumes"][index],
+        )
+        for name, value in expected.items():
+            assert metrics[name][index] == pytest.approx(value, rel=1e-12), (name, index)
+
+
+def test_single_window_equals_its_slice_of_the_batch(mccrea, inputs):
+    engine = mccrea.McCreaMetricsEngine()
+    batch = engine.calculate_all(inputs["market_data"], inputs["order_book"], inputs["trade_flow"])
+
+    def window(group):
+        return {name: value if np.ndim(value) == 1 else value[1, 2] for name, value in group.items()}
+
+    single = engine.calculate_all(window(inputs["market_data"]), window(inputs["order_book"]),
+                                  window(inputs["trade_flow"]))
+    for name, value in single.items():
+        assert np.ndim(value) == 0
+        assert value == pytest.approx(batch[name][1, 2], rel=1e-12)
+
+
+def test_degenerate_inputs_fall_back_to_neutral_values(mccrea):
+    engine = mccrea.McCreaMetricsEngine()
+    zeros = {"spectral_density": np.zeros(8), "dominant_frequencies": np.zeros(2)}
+    assert engine.calculate_HVI(zeros) == 0.0
+    assert engine.calculate_HRI(zeros) == 0.0
+    assert engine.calculate_p({"bid_sizes": [0.0], "ask_sizes": [0.0]}) == 0.5
+    assert engine.calculate_SSS({"prices": [100.0]}) == 1.0
+
+
+def test_missing_field_is_reported(mccrea):
+    with pytest.raises(ValueError, match="spectral_density"):
+        mccrea.McCreaMetricsEngine().calculate_HVI({"dominant_frequencies": [0.1]})
+
+
+def test_rolling_stats_match_each_sliding_window(mccrea):
+    rng = np.random.default_rng(7)
+    # A large offset makes a naive sum-of-squares update lose every digit
+    values = 1e6 + rng.normal(0.0, 1.0, size=500)
+    stats = mccrea.RollingStats(32)
+
+    for n, value in enumerate(values, start=1):
+        stats.push(value)
+        window = values[max(0, n - 32):n]
+        assert stats.count == len(window)
+        assert stats.mean == pytest.approx(np.mean(window), rel=1e-12)
+        assert stats.variance == pytest.approx(np.var(window), rel=1e-6)
+
+
+def test_rolling_stats_rejects_empty_window(mccrea):
+    with pytest.raises(ValueError):
+        mccrea.RollingStats(0)
+
+
+def test_stream_matches_batch_engine_over_its_window(mccrea):
+    engine = mccrea.McCreaMetricsEngine()
+    window = 64
+    stream = engine.stream(window=window)
+    rng = np.random.default_rng(11)
+    prices = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.002, size=200)))
+    volumes = rng.lognormal(0.0, 0.5, size=200)
+    spectrum = {"spectral_density": rng.gamma(2.0, 1.0, size=32),
+                "frequencies": np.linspace(0.0, 0.5, 32),
+                "dominant_frequencies": [0.1, 0.2, 0.3]}
+
+    stream.push("ETH", spectrum)
+    for price, volume in zip(prices, volumes):
+        stream.push("ETH", {"price": price, "volume": volume})
+    values = stream.update("ETH", {"bid": 99.9, "ask": 100.1, "bid_size": [3.0, 1.0], "ask_size": 2.0})
+
+    hvi = engine.calculate_HVI(spectrum)
+    book = {"bid_prices": [99.9], "ask_prices": [100.1], "bid_sizes": [4.0], "ask_sizes": [2.0]}
+    # The stream keeps `window` volumes and `window` returns, i.e. window + 1 prices
+    flow = {"prices": prices[-(window + 1):], "volumes": volumes[-window:]}
+    expected = {
+        "HVI": hvi,
+        "HLI": engine.calculate_HLI(book, flow, hvi=hvi),
+        "HRI": engine.calculate_HRI(spectrum),
+        "SSS": engine.calculate_SSS(flow),
+        "omega": engine.calculate_omega(spectrum),
+        "p": engine.calculate_p(book),
+    }
+    exact = stream.values("ETH")
+    for name, value in expected.items():
+        assert exact[name] == pytest.approx(float(value), rel=1e-9), name
+        assert values[name] == round(exact[name], 4)
+    assert values["ticks"] == 202
+
+
+def test_stream_trend_and_spectral_override(mccrea):
+    stream = mccrea.McCreaMetricsStream(window=16)
+    prices = 100.0 * 1.001 ** np.arange(40) * np.where(np.arange(40) % 2, 1.0005, 1.0)
+    for price in prices:
+        stream.push("BTC", {"price": price, "volume": 1.0})
+    returns = np.diff(np.log(prices))[-16:]
+    assert stream.trend("BTC") == pytest.approx(returns.mean() / returns.std() * 4.0, rel=1e-6)
+
+    stream.set_spectral("BTC", 0.5, 0.25, 1.0)
+    assert (stream.values("BTC")["HVI"], stream.values("BTC")["HRI"]) == (0.5, 0.25)
+    with pytest.raises(KeyError):
+        stream.set_spectral("SOL", 0.5, 0.25, 1.0)
@@ -0,0 +1,109 @@
+"""Order book matching and agents trading through an Exchange"""
+
+import asyncio
+
+import pytest
+
+from engine_loader import load_engine
+
+LIMITS = {"daily": 100.0, "weekly": 700.0, "monthly": 3000.0, "yearly": 36500.0}
+
+
+@pytest.fixture(scope="module")
+def order_book():
+    return load_engine("Order-Book-engine")
+
+
+@pytest.fixture
+def exchange(order_book, clock):
+    return order_book.Exchange(clock=clock)
+
+
+@pytest.fixture
+def agents(brain, clock, exchange):
+    def make(agent_id):
+        return brain.RangisAgent(agent_id, "aggressive", spend_limits=LIMITS, clock=clock, exchange=exchange)
+    return make
+
+
+def trade(agent, side, amount, price=50.0):
+    market = {"pair": "AVAX/USD", "side": side, "amount": amount, "price": price, "prm_score": 0.9}
+    return asyncio.run(agent.evaluate_trade(market))
+
+
+def test_book_matches_price_time_and_rests_the_rest(order_book):
+    book = order_book.OrderBook()
+    first, _, _ = book.submit("sell", 101, 5, owner="a")
+    second, _, _ = book.submit("sell", 100, 5, owner="b")
+
+    order_id, fills, cancelled = book.submit("buy", 101, 8, owner="c")
+    assert fills == [(second, "b", 100, 5), (first, "a", 101, 3)]
+    assert cancelled == []
+    assert order_id not in book.orders
+    assert book.orders[first].quantity == 2
+
+
+def test_book_cancels_own_resting_orders_instead_of_self_trading(order_book):
+    book = order_book.OrderBook()
+    own, _, _ = book.submit("sell", 100, 5, owner="a")
+    other, _, _ = book.submit("sell", 100, 5, owner="b")
+
+    order_id, fills, cancelled = book.submit("buy", 100, 8, owner="a")
+    assert cancelled == [(own, 5)]
+    assert fills == [(other, "b", 100, 5)]
+    assert own not in book.orders
+    assert book.orders[order_id].quantity == 3
+    assert book.depth() == {"bids": [(100, 3)], "asks": []}
+
+
+def test_orders_are_sized_in_base_units_and_spend_their_notional(agents):
+    maker, taker = agents("maker"), agents("taker")
+    ask = trade(maker, "sell", 10.0)
+    assert ask["status"] == "resting"
+    assert maker.spend_manager.reserved == pytest.approx(10.0)
+
+    bid = trade(taker, "buy", 4.0)
+    assert bid["status"] == "approved"
+    assert bid["units"] == pytest.approx(0.08)
+    assert bid["amount"] == pytest.approx(4.0)
+    assert taker.record_trade(bid)
+    assert taker.spend_manager.spending["daily"] == pytest.approx(4.0)
+    assert taker.spend_manager.reserved == 0.0
+
+    (fill,) = maker.settle_fills()
+    assert (fill["units"], fill["amount"]) == (pytest.approx(0.08), pytest.approx(4.0))
+    assert maker.spend_manager.spending["daily"] == pytest.approx(4.0)
+    assert maker.spend_manager.reserved == pytest.approx(6.0)
+
+    assert maker.cancel_order(ask["order_id"]) == pytest.approx(0.12)
+    assert maker.spend_manager.reserved == 0.0
+    assert maker.spend_manager.spending["daily"] == pytest.approx(4.0)
+
+
+def test_partial_fill_keeps_the_rest_reserved_until_cancelled(agents):
+    maker, taker = agents("maker"), agents("taker")
+    trade(maker, "sell", 10.0)
+
+    bid = trade(taker, "buy", 20.0)
+    assert bid["amount"] == pytest.approx(10.0)
+    assert bid["resting"] == pytest.approx(0.2)
+    assert taker.record_trade(bid)
+    assert taker.spend_manager.spending["daily"] == pytest.approx(10.0)
+    assert taker.spend_manager.reserved == pytest.approx(10.0)
+
+    taker.cancel_order(bid["order_id"])
+    assert taker.spend_manager.reserved == 0.0
+    assert taker.spend_manager.spending["daily"] == pytest.approx(10.0)
+
+
+def test_agent_crossing_its_own_order_cancels_it(agents, exchange):
+    agent = agents("agent")
+    ask = trade(agent, "sell", 10.0)
+    bid = trade(agent, "buy", 5.0)
+
+    assert bid["status"] == "resting"
+    assert ask["order_id"] not in agent.open_orders
+    assert agent.spend_manager.reserved == pytest.approx(5.0)
+    quote = exchange.quote("AVAX/USD")
+    assert quote["asks"] == [] and quote["bids"] == [(50.0, pytest.approx(0.1))]
+    assert agent.settle_fills() == []
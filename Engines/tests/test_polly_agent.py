@@ -0,0 +1,69 @@
+"""RangisAgent configuration and AgentFleet negotiation"""
+
+import asyncio
+
+
+def test_agent_overrides_reach_polly(brain):
+    scorer = object()
+    agent = brain.RangisAgent("agent-1", "conservative", prm_scorer=scorer,
+                              min_confidence=0.4, accept_spread=0.02, counter_spread=0.1)
+
+    assert agent.polly.min_confidence == 0.4
+    assert (agent.polly.accept_spread, agent.polly.counter_spread) == (0.02, 0.1)
+    assert agent.polly.prm_scorer is scorer
+
+    market = {"prm_score": 0.5, "price": 100.0, "target_price": 101.5}
+    decision = asyncio.run(agent.evaluate_trade(market))
+    assert decision["status"] == "approved"
+    assert decision["price"] == 100.0
+
+
+def test_fleet_negotiates_with_each_agents_bands(brain):
+    agents = [
+        brain.RangisAgent("default", "aggressive"),
+        brain.RangisAgent("wide", "aggressive", accept_spread=0.03, counter_spread=0.2),
+        brain.RangisAgent("narrow", "aggressive", accept_spread=0.001, counter_spread=0.02),
+    ]
+    scenarios = [{"prm_score": 0.9, "price": 100.0, "target_price": target}
+                 for target in (100.5, 102.0, 110.0)]
+
+    result = asyncio.run(brain.AgentFleet(agents).evaluate_batch(scenarios))
+
+    for agent, row in zip(agents, result["decisions"]):
+        for market, decision in zip(scenarios, row):
+            expected = asyncio.run(agent.polly.negotiate_price(market["price"], market["target_price"]))
+            if expected["action"] == "reject":
+                assert decision["status"] == "rejected"
+            else:
+                assert decision["status"] == "approved"
+                assert decision["price"] == expected["price"]
+
+
+def test_history_spills_evictions_through_one_open_file(brain, tmp_path, monkeypatch):
+    path = tmp_path / "decisions.jsonl"
+    history = brain.BoundedHistory(2, str(path))
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda *args, **kwargs: opened.append(args) or real_open(*args, **kwargs))
+
+    for n in range(5):
+        history.append({"n": n})
+    # Line-buffered: evicted entries are on disk before close()
+    assert path.read_text().splitlines() == ['{"n": 0}', '{"n": 1}', '{"n": 2}']
+    assert [entry["n"] for entry in history] == [3, 4]
+    assert len([args for args in opened if args[0] == str(path)]) == 1
+
+    history.close()
+    history.append({"n": 5})
+    history.close()
+    assert path.read_text().splitlines()[-1] == '{"n": 3}'
+
+
+def test_agent_close_closes_both_spill_files(brain, tmp_path):
+    agent = brain.RangisAgent("agent-1", history_size=1, history_dir=str(tmp_path))
+    for n in range(2):
+        agent.polly.decision_history.append({"n": n})
+        agent.trade_history.append({"n": n})
+    agent.close()
+    assert agent.polly.decision_history._spill is None and agent.trade_history._spill is None
+    assert (tmp_path / "agent-1-trades.jsonl").read_text() == '{"n": 0}\n'
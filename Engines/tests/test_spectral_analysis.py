@@ -0,0 +1,83 @@
+"""Spectral analysis: windowed spectra and the sliding DFT against a direct np.fft"""
+
+import numpy as np
+import pytest
+
+from engine_loader import load_engine
+
+
+@pytest.fixture(scope="module")
+def spectral():
+    return load_engine("Spectral-Analysis-engine")
+
+
+def reference_psd(segment, sample_rate=1.0):
+    """One-sided periodic-Hann PSD of a single mean-removed segment"""
+    n = len(segment)
+    taper = 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(n) / n)
+    power = np.abs(np.fft.rfft((segment - segment.mean()) * taper)) ** 2 / (sample_rate * np.sum(taper ** 2))
+    power[1:] *= 2.0
+    if n % 2 == 0:
+        power[-1] /= 2.0
+    return power
+
+
+def test_spectrogram_matches_per_window_fft(spectral):
+    analyzer = spectral.SpectralAnalyzer(window=32, hop=12, sample_rate=2.0)
+    series = np.random.default_rng(3).normal(size=(2, 150))
+    frames = analyzer.spectrogram(series)
+
+    starts = range(0, 150 - 32 + 1, 12)
+    assert frames.shape == (2, len(starts), 17)
+    for symbol in range(2):
+        for frame, start in enumerate(starts):
+            expected = reference_psd(series[symbol, start:start + 32], sample_rate=2.0)
+            np.testing.assert_allclose(frames[symbol, frame], expected, rtol=1e-10, atol=1e-15)
+    np.testing.assert_allclose(analyzer.welch(series), frames.mean(axis=-2))
+
+
+def test_psd_integrates_to_the_segment_variance(spectral):
+    analyzer = spectral.SpectralAnalyzer(window=64)
+    noise = np.random.default_rng(5).normal(0.0, 0.5, size=(1, 64 * 400))
+    # Parseval for the Hann-weighted estimate: Σ PSD·Δf ≈ variance for white noise
+    total = analyzer.welch(noise).sum() / 64
+    assert total == pytest.approx(0.25, rel=0.05)
+
+
+def test_dominant_peaks_skip_dc_and_are_frequency_ordered(spectral):
+    analyzer = spectral.SpectralAnalyzer(window=16, peaks=2)
+    psd = np.array([100.0, 1.0, 9.0, 2.0, 8.0, 3.0, 0.0, 0.0, 0.0])
+    frequencies, powers = analyzer.dominant_peaks(psd)
+    np.testing.assert_allclose(frequencies, analyzer.frequencies[[2, 4]])
+    np.testing.assert_allclose(powers, [9.0, 8.0])
+
+
+@pytest.mark.parametrize("window", [16, 15])
+def test_sliding_spectrum_matches_direct_fft_after_every_push(spectral, window):
+    analyzer = spectral.SpectralAnalyzer(window=window)
+    sliding = analyzer.sliding(3)
+    series = np.random.default_rng(window).normal(size=(3, 5 * window + 7))
+
+    for n in range(series.shape[1]):
+        sliding.push(series[:, n])
+        if not sliding.ready:
+            assert n + 1 < window
+            continue
+        current = series[:, n + 1 - window:n + 1]
+        np.testing.assert_array_equal(sliding.window_samples(), current)
+        expected = np.array([reference_psd(row) for row in current])
+        np.testing.assert_allclose(sliding.spectrum(), expected, rtol=1e-8, atol=1e-12)
+
+
+def test_sliding_chunks_equal_single_pushes(spectral):
+    analyzer = spectral.SpectralAnalyzer(window=16)
+    series = np.random.default_rng(9).normal(size=(2, 45))
+    single, chunked = analyzer.sliding(2), analyzer.sliding(2)
+    for n in range(45):
+        single.push(series[:, n])
+    chunked.push(series[:, :20])
+    chunked.push(series[:, 20:])
+
+    np.testing.assert_allclose(chunked.spectrum(), single.spectrum(), rtol=1e-10, atol=1e-15)
+    np.testing.assert_allclose(chunked.spectrum(), analyzer.spectrogram(series[:, -16:])[..., 0, :],
+                               rtol=1e-8, atol=1e-12)
@@ -0,0 +1,117 @@
+"""SpendLimitManager reservations and AgentFleet budget screening"""
+
+import asyncio
+
+import pytest
+
+LIMITS = {"daily": 10.0, "weekly": 70.0, "monthly": 300.0, "yearly": 3650.0}
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def manager(request, brain, clock, tmp_path):
+    store = brain.SQLiteSpendStore(str(tmp_path / "spend.db")) if request.param == "sqlite" else None
+    return brain.SpendLimitManager("agent-1", LIMITS, store=store, clock=clock)
+
+
+def test_reserve_holds_budget_until_commit(manager):
+    held = manager.reserve(6.0)
+    assert held["approved"]
+    assert manager.reserved == pytest.approx(6.0)
+    assert not manager.reserve(5.0)["approved"]
+
+    assert manager.commit(held["reservation_id"])
+    assert manager.reserved == 0.0
+    assert manager.spending["daily"] == pytest.approx(6.0)
+    assert not manager.commit(held["reservation_id"])
+
+
+def test_partial_commit_keeps_the_rest_held(manager):
+    held = manager.reserve(8.0)
+    assert manager.commit(held["reservation_id"], 3.0)
+    assert manager.spending["daily"] == pytest.approx(3.0)
+    assert manager.reserved == pytest.approx(5.0)
+
+    assert manager.release(held["reservation_id"])
+    assert manager.reserved == 0.0
+    assert manager.spending["daily"] == pytest.approx(3.0)
+
+
+def test_release_returns_budget_without_spending(manager):
+    held = manager.reserve(10.0)
+    assert manager.release(held["reservation_id"])
+    assert not manager.release(held["reservation_id"])
+    assert manager.spending["daily"] == 0.0
+    assert manager.reserve(10.0)["approved"]
+
+
+def test_reservations_lapse_after_ttl(manager, clock):
+    held = manager.reserve(10.0, ttl=30)
+    clock.advance(29)
+    assert not manager.reserve(1.0)["approved"]
+
+    clock.advance(1)
+    assert manager.reserved == 0.0
+    assert not manager.commit(held["reservation_id"])
+    assert manager.reserve(10.0)["approved"]
+
+
+def test_evaluate_trade_reserves_and_record_trade_commits(brain, clock):
+    agent = brain.RangisAgent("agent-1", "aggressive", spend_limits=LIMITS, clock=clock)
+    market = {"prm_score": 0.9, "price": 100.0, "amount": 4.0}
+
+    decision = asyncio.run(agent.evaluate_trade(market))
+    assert decision["status"] == "approved"
+    assert agent.spend_manager.reserved == pytest.approx(4.0)
+
+    assert agent.record_trade(decision)
+    assert agent.spend_manager.reserved == 0.0
+    assert agent.spend_manager.spending["daily"] == pytest.approx(4.0)
+
+
+def test_fleet_batches_do_not_hold_budget(brain, clock):
+    agent = brain.RangisAgent("agent-1", "aggressive", spend_limits=LIMITS, clock=clock)
+    fleet = brain.AgentFleet([agent])
+    scenarios = [{"prm_score": 0.9, "price": 100.0, "amount": 1.0}] * 12
+
+    for _ in range(3):
+        result = asyncio.run(fleet.evaluate_batch(scenarios))
+        statuses = [d["status"] for d in result["decisions"][0]]
+        assert statuses == ["approved"] * 10 + ["blocked"] * 2
+        assert agent.spend_manager.reserved == 0.0
+
+    approved = result["decisions"][0][0]
+    assert approved["reservation_id"] is None
+    assert agent.record_trade(approved)
+    assert agent.spend_manager.spending["daily"] == pytest.approx(1.0)
+    statuses = [d["status"] for d in asyncio.run(fleet.evaluate_batch(scenarios))["decisions"][0]]
+    assert statuses.count("approved") == 9
+
+
+def test_fleet_rejected_negotiations_do_not_use_budget(brain, clock):
+    agent = brain.RangisAgent("agent-1", "aggressive", spend_limits=LIMITS, clock=clock)
+    wide = {"prm_score": 0.9, "price": 100.0, "target_price": 150.0, "amount": 6.0}
+    tight = {"prm_score": 0.9, "price": 100.0, "amount": 6.0}
+
+    result = asyncio.run(brain.AgentFleet([agent]).evaluate_batch([wide, tight]))
+    assert [d["status"] for d in result["decisions"][0]] == ["rejected", "approved"]
+
+
+def test_managers_sharing_a_store_see_each_others_spend(brain, clock, tmp_path):
+    store = brain.SQLiteSpendStore(str(tmp_path / "spend.db"))
+    first = brain.SpendLimitManager("agent-1", LIMITS, store=store, clock=clock)
+    second = brain.SpendLimitManager("agent-1", LIMITS, store=store, clock=clock)
+
+    held = first.reserve(8.0)
+    assert first.commit(held["reservation_id"])
+    assert not second.reserve(8.0)["approved"]
+    assert second.spending["daily"] == pytest.approx(8.0)
+
+    second.record_spend(1.0)
+    assert first.spending["daily"] == pytest.approx(9.0)
+    assert not first.reserve(2.0)["approved"]
+
+
+def test_unknown_spend_periods_are_rejected(brain, clock):
+    with pytest.raises(ValueError, match="hourly.*daily, weekly, monthly, yearly"):
+        brain.SpendLimitManager("agent-1", {"daily": 10.0, "hourly": 1.0}, clock=clock)
+    assert brain.SpendLimitManager("agent-1", {"weekly": 5.0}, clock=clock).spending == {"weekly": 0.0}
@@ -9,50 +9,230 @@
 const { spawn } = require("child_process");
 const path = require("path");
 
+// Engines are launched through engine_loader.py, which reuses their cached
+// bytecode instead of compiling the script on every spawn
+const ENGINE_LOADER = path.join(__dirname, "../Engines/engine_loader.py");
+const DEFAULT_POOL_SIZE = parseInt(process.env.HHPEI_POOL_SIZE || "2", 10);
+const DEFAULT_TIMEOUT_MS = parseInt(process.env.HHPEI_TIMEOUT_MS || "10000", 10);
+
 /**
- * Run the HHPEI Python engine as subprocess
- * Returns full sensory economic payload (JSON)
- * 
- * @returns {Promise<Object>} HHPEI sensory payload
+ * One warm engine process running in --serve mode (HHPEI-engine by default)
+ * Requests are NDJSON lines tagged with an id, so many may be in flight
  */
-function runHHPEIEngine() {
-  return new Promise((resolve, reject) => {
-    const scriptPath = path.join(__dirname, "../Engines/HHPEI-engine.py");
-    const child = spawn("python3", [scriptPath]);
+class HHPEIWorker {
+  constructor(onExit, engine = "HHPEI-engine") {
+    this.nextId = 1;
+    this.pending = new Map();
+    this.buffer = "";
+    this.errorOutput = "";
+    this.alive = true;
 
-    let output = "";
-    let errorOutput = "";
+    this.child = spawn("python3", [ENGINE_LOADER, engine, "--serve"]);
 
-    child.stdout.on("data", (data) => {
-      output += data.toString();
+    this.child.stdout.on("data", (data) => {
+      this.buffer += data.toString();
+      let newline;
+      while ((newline = this.buffer.indexOf("\n")) !== -1) {
+        const line = this.buffer.slice(0, newline);
+        this.buffer = this.buffer.slice(newline + 1);
+        if (line.trim()) this._onResponse(line);
+      }
     });
 
-    child.stderr.on("data", (data) => {
-      errorOutput += data.toString();
+    this.child.stderr.on("data", (data) => {
+      this.errorOutput += data.toString();
     });
 
-    child.on("close", (code) => {
-      if (code !== 0) {
-        return reject(new Error(`Engine failed: ${errorOutput}`));
-      }
+    // A write racing the worker's exit fails with EPIPE; without a listener
+    // that error would be unhandled and take the whole Node process down.
+    // The pool drops the worker once it is marked dead, so stop the child too
+    this.child.stdin.on("error", (err) => {
+      this._fail(new Error(`Engine worker stdin failed: ${err.message}`));
+      this.child.kill();
+    });
 
-      try {
-        const result = JSON.parse(output);
-        resolve(result);
-      } catch (parseError) {
-        // Fallback: return raw output if JSON parse fails
-        resolve({ 
-          raw: output,
-          error: "JSON parse failed",
-          fallback: true 
-        });
+    this.child.on("close", (code) => {
+      this._fail(new Error(`Engine worker exited (${code}): ${this.errorOutput}`));
+      onExit(this);
+    });
+
+    this.child.on("error", (err) => {
+      this._fail(new Error(`Failed to start engine: ${err.message}`));
+      onExit(this);
+    });
+  }
+
+  call(method, params, timeoutMs) {
+    return new Promise((resolve, reject) => {
+      if (!this.alive) {
+        reject(new Error(`Engine worker is not running (${method})`));
+        return;
       }
+      const id = this.nextId++;
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error(`Engine call ${method} timed out after ${timeoutMs}ms`));
+      }, timeoutMs);
+
+      this.pending.set(id, { resolve, reject, timer });
+      this.child.stdin.write(JSON.stringify({ id, method, params }) + "\n");
     });
+  }
+
+  close() {
+    this.alive = false;
+    this.child.stdin.end();
+  }
+
+  _onResponse(line) {
+    let response;
+    try {
+      response = JSON.parse(line);
+    } catch {
+      return;
+    }
+
+    const entry = this.pending.get(response.id);
+    if (!entry) return;
+    this.pending.delete(response.id);
+    clearTimeout(entry.timer);
+
+    if (response.error) {
+      entry.reject(new Error(`Engine failed: ${response.error}`));
+    } else {
+      entry.resolve(response.result);
+    }
+  }
+
+  _fail(err) {
+    this.alive = false;
+    for (const entry of this.pending.values()) {
+      clearTimeout(entry.timer);
+      entry.reject(err);
+    }
+    this.pending.clear();
+  }
+}
+
+/**
+ * Small pool of warm HHPEI workers
+ * Each call goes to the worker with the fewest in-flight requests;
+ * dead workers are replaced on the next call
+ */
+class HHPEIEnginePool {
+  constructor(size = DEFAULT_POOL_SIZE, timeoutMs = DEFAULT_TIMEOUT_MS, engine = "HHPEI-engine") {
+    this.size = Math.max(1, size);
+    this.timeoutMs = timeoutMs;
+    this.engine = engine;
+    this.workers = [];
+  }
+
+  call(method = "generate_full_output", params = {}) {
+    return this._acquire().call(method, params, this.timeoutMs);
+  }
+
+  close() {
+    for (const worker of this.workers) worker.close();
+    this.workers = [];
+  }
 
-    child.on("error", (err) => {
-      reject(new Error(`Failed to start engine: ${err.message}`));
+  _acquire() {
+    this.workers = this.workers.filter((worker) => worker.alive);
+    while (this.workers.length < this.size) {
+      this.workers.push(new HHPEIWorker((dead) => {
+        this.workers = this.workers.filter((worker) => worker !== dead);
+      }, this.engine));
+    }
+    return this.workers.reduce((best, worker) =>
+      worker.pending.size < best.pending.size ? worker : best
+    );
+  }
+}
+
+let sharedPool = null;
+
+/**
+ * Call a method on the shared warm HHPEI engine pool
+ *
+ * @param {string} method - HHPEIEngine method (e.g. "calculate_market_harmonics")
+ * @param {Object} params - Keyword arguments for the method
+ * @returns {Promise<Object>} Method result
+ */
+function callHHPEIEngine(method, params = {}) {
+  if (!sharedPool) sharedPool = new HHPEIEnginePool();
+  return sharedPool.call(method, params);
+}
+
+/**
+ * Stop the shared HHPEI worker pool (e.g. on server shutdown)
+ */
+function shutdownHHPEIEngine() {
+  if (sharedPool) {
+    sharedPool.close();
+    sharedPool = null;
+  }
+}
+
+let pulsePool = null;
+
+/**
+ * Call the Consensus Pulse engine (CHS ingestion and RCP aggregation)
+ * Validator state lives in the engine process, so a single worker serves
+ * every call; a replacement worker rebuilds state from the next packets
+ *
+ * @param {string} method - "ingest" ({ packets }), "rcp" ({ top }) or "validator" ({ validator_id })
+ * @param {Object} params - Keyword arguments for the method
+ * @returns {Promise<Object>} Method result
+ */
+function callConsensusPulse(method, params = {}) {
+  if (!pulsePool) pulsePool = new HHPEIEnginePool(1, DEFAULT_TIMEOUT_MS, "Consensus-Pulse-engine");
+  return pulsePool.call(method, params);
+}
+
+/**
+ * Stop the Consensus Pulse worker
+ */
+function shutdownConsensusPulse() {
+  if (pulsePool) {
+    pulsePool.close();
+    pulsePool = null;
+  }
+}
+
+let staticSections = null;
+
+/**
+ * Static HHPEI payload sections (patent/revolution), fetched once per process
+ *
+ * @returns {Promise<Object>} { version, patent, revolution }
+ */
+function getHHPEIStaticSections() {
+  if (!staticSections) {
+    staticSections = callHHPEIEngine("static_sections").catch((err) => {
+      staticSections = null;
+      throw err;
     });
-  });
+  }
+  return staticSections;
+}
+
+/**
+ * Run the HHPEI Python engine
+ * Served by a pool of warm --serve workers instead of a fresh subprocess per call;
+ * the static sections are fetched once and merged locally instead of being
+ * re-sent with every payload. Workers cache each symbol's payload for the
+ * current one-second bucket, so bursts for the same symbol share one computation
+ * 
+ * @param {string} [symbol] - Market symbol the payload is cached under
+ * @returns {Promise<Object>} HHPEI sensory payload
+ */
+async function runHHPEIEngine(symbol = "default") {
+  const [payload, sections] = await Promise.all([
+    callHHPEIEngine("snapshot", { symbol, include_static: false }),
+    getHHPEIStaticSections(),
+  ]);
+  const { static: _version, ...dynamic } = payload;
+  return { ...dynamic, patent: sections.patent, revolution: sections.revolution };
 }
 
 /**
@@ -63,8 +243,7 @@ function runHHPEIEngine() {
  */
 function runPTEEngine() {
   return new Promise((resolve, reject) => {
-    const scriptPath = path.join(__dirname, "../Engines/Real-time_Calc-engine.py");
-    const child = spawn("python3", [scriptPath]);
+    const child = spawn("python3", [ENGINE_LOADER, "Real-time_Calc-engine"]);
 
     let output = "";
     let errorOutput = "";
@@ -96,12 +275,14 @@ function runPTEEngine() {
  * Run McCrea Metrics Engine
  * Computes HVI, HLI, HRI, SSS, ω, p
  * 
+ * @param {Object} [input] - { market_data, order_book, trade_flow } arrays;
+ *   omitted → metrics for the engine's seeded sample market
  * @returns {Promise<Object>} McCrea metrics output
  */
-function runMcCreaMetrics() {
+function runMcCreaMetrics(input) {
   return new Promise((resolve, reject) => {
-    const scriptPath = path.join(__dirname, "../Engines/McCrea-MetricsEngine.py");
-    const child = spawn("python3", [scriptPath]);
+    const args = [ENGINE_LOADER, "McCrea-MetricsEngine"];
+    const child = spawn("python3", input ? [...args, "--stdin"] : args);
 
     let output = "";
     let errorOutput = "";
@@ -114,6 +295,13 @@ function runMcCreaMetrics() {
       errorOutput += data.toString();
     });
 
+    // An engine that exits before reading its input (bad input, import error)
+    // fails the write with EPIPE, which would otherwise crash the Node process
+    child.stdin.on("error", (err) => {
+      reject(new Error(`McCrea Engine stdin failed: ${err.message}`));
+      child.kill();
+    });
+
     child.on("close", (code) => {
       if (code !== 0) {
         return reject(new Error(`McCrea Engine failed: ${errorOutput}`));
@@ -125,11 +313,19 @@ function runMcCreaMetrics() {
         resolve({ raw: output });
       }
     });
+
+    if (input) child.stdin.end(JSON.stringify(input));
   });
 }
 
 module.exports = { 
+  HHPEIEnginePool,
+  callHHPEIEngine,
+  shutdownHHPEIEngine,
+  getHHPEIStaticSections,
   runHHPEIEngine,
+  callConsensusPulse,
+  shutdownConsensusPulse,
   runPTEEngine,
   runMcCreaMetrics 
 };
@@ -1,43 +1,603 @@
-from solana.rpc.async_api import AsyncClient
-from solana.keypair import Keypair
-from spl.token.async_client import AsyncToken
-from spl.token.constants import TOKEN_PROGRAM_ID
+"""
+RANGI token minting and bulk distribution
+
+- Default run: create the RANGI mint, a payer token account and the initial supply
+- --distribute: mint (or transfer) RANGI to every recipient in a list
+
+Bulk distribution packs several recipients into each transaction (create
+the associated token account if missing + mint_to/transfer), keeps up to
+--concurrency transactions in flight over one pooled RPC client, retries
+with backoff and appends every confirmed batch to a checkpoint file, so an
+interrupted run of tens of thousands of recipients resumes where it left off.
+
+A retried transaction is re-sent with the same signature until it lands or
+its blockhash expires; the cluster deduplicates by signature, so a lost
+acknowledgement never mints twice.
+
+--local swaps the cluster for an in-memory validator stand-in (no network,
+no solana packages needed) for dry runs and failure drills.
+
+Usage:
+    RANGI_PAYER_KEY=<base58> python3 mint-rangi-token.py
+    RANGI_PAYER_KEY=<base58> python3 mint-rangi-token.py --distribute recipients.csv --mint <MINT>
+    python3 mint-rangi-token.py --distribute recipients.csv --local --drop-rate 0.1
+
+Recipient lists are CSV (address,amount) or JSON lines ({"address", "amount"});
+amounts are in whole RANGI and may have up to RANGI_DECIMALS decimals.
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
 import json
-import base58  # For key serialization
+import os
+import random
+import sys
+import time
+from decimal import Decimal, InvalidOperation
+
+RPC_URL = os.environ.get("RANGI_RPC_URL", "https://api.devnet.solana.com")  # Devnet for test
+PAYER_KEY_ENV = "RANGI_PAYER_KEY"
+RANGI_DECIMALS = 9
+
+# Recipients per transaction: each one adds a create-account and a mint/transfer
+# instruction, and six keep the transaction under the 1232-byte packet limit
+DEFAULT_BATCH_SIZE = 6
+# Transactions in flight at once
+DEFAULT_CONCURRENCY = 16
+DEFAULT_RETRIES = 5
+# Base delay between attempts; doubles on every retry
+DEFAULT_BACKOFF = 0.5
+# Seconds to wait for a submitted transaction to confirm before re-sending it
+CONFIRM_TIMEOUT = 15.0
+# Blockhashes are reused across batches for this long (they stay valid ~60 s)
+BLOCKHASH_TTL = 20.0
+
+LANDED, FAILED, PENDING, EXPIRED = "landed", "failed", "pending", "expired"
+
+
+def load_payer():
+    """Payer keypair from RANGI_PAYER_KEY (base58 secret key)"""
+    from solders.keypair import Keypair
+
+    secret = os.environ.get(PAYER_KEY_ENV)
+    if not secret:
+        raise RuntimeError(f"set {PAYER_KEY_ENV} to the payer's base58 secret key")
+    return Keypair.from_base58_string(secret)
+
 
 async def mint_rangi_token():
-    # Wallet setup (your dev keypair; replace with env var)
-    payer = Keypair.from_base58("YOUR_BASE58_PRIVATE_KEY")  # Lock this securely!
-    client = AsyncClient("https://api.devnet.solana.com")  # Devnet for test
+    from solana.rpc.async_api import AsyncClient
+    from spl.token.async_client import AsyncToken
+    from spl.token.constants import TOKEN_PROGRAM_ID
+
+    payer = load_payer()  # Keep the key out of the source
+    client = AsyncClient(RPC_URL)
 
     # Mint params: RANGI token (supply 1M, 9 decimals)
     mint = await AsyncToken.create_mint(
         conn=client,
         payer=payer,
-        mint_authority=payer.public_key,
-        decimals=9,
+        mint_authority=payer.pubkey(),
+        decimals=RANGI_DECIMALS,
         program_id=TOKEN_PROGRAM_ID  # SPL Token Program
     )
 
     # Create token account
-    token_account = await mint.create_account(payer.public_key)
+    token_account = await mint.create_account(payer.pubkey())
 
     # Mint initial supply
     await mint.mint_to(
         dest=token_account,
-        mint_authority=payer.public_key,
-        amount=1_000_000 * 10**9  # 1M tokens
+        mint_authority=payer,
+        amount=1_000_000 * 10**RANGI_DECIMALS  # 1M tokens
     )
 
     # Metadata URI (off-chain JSON for Phantom display)
     metadata_uri = "https://your-rangis-bucket/rangi-metadata.json"  # Upload this: {"name": "Rangi Token", "symbol": "RANGI", "description": "Harmonic PTE vibes", "image": "https://your-cymatic-wave.png"}
-    
+
     # Use Metaplex for on-chain metadata (fetch from docs if needed)
     print(f"Mint Address: {mint.pubkey}")
     print(f"Token Account: {token_account}")
     print(f"Metadata URI: {metadata_uri}  # Ensures 'RANGI' shows in Phantom, not 'Unknown'")
     await client.close()
 
+
+def to_base_units(amount, decimals=RANGI_DECIMALS):
+    """Whole-token amount (str, int or Decimal) → integer base units"""
+    try:
+        units = Decimal(str(amount)).scaleb(decimals)
+    except InvalidOperation:
+        raise ValueError(f"invalid amount: {amount!r}")
+    if units <= 0 or units != units.to_integral_value():
+        raise ValueError(f"amount must be positive with at most {decimals} decimals: {amount!r}")
+    return int(units)
+
+
+def load_recipients(path, decimals=RANGI_DECIMALS):
+    """
+    [(address, base units)] from a CSV (address,amount; header optional)
+    or JSON-lines recipient list; duplicate addresses are rejected
+    """
+    with open(path, newline="") as f:
+        if path.endswith((".jsonl", ".ndjson", ".json")):
+            rows = [(row["address"], row["amount"]) for row in map(json.loads, f) if row]
+        else:
+            rows = [(row[0].strip(), row[1].strip()) for row in csv.reader(f)
+                    if row and row[0].strip() and not row[0].startswith("#")]
+            if rows and rows[0][0].lower() == "address":
+                rows = rows[1:]
+
+    recipients, seen = [], set()
+    for address, amount in rows:
+        if address in seen:
+            raise ValueError(f"duplicate recipient: {address}")
+        seen.add(address)
+        recipients.append((address, to_base_units(amount, decimals)))
+    return recipients
+
+
+def sample_recipients(count, seed=432):
+    """Seeded made-up recipients for local drills"""
+    alphabet = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+    rng = random.Random(seed)
+    return [("".join(rng.choice(alphabet) for _ in range(44)), rng.randint(1, 1000) * 10**RANGI_DECIMALS)
+            for _ in range(count)]
+
+
+class BatchRejected(Exception):
+    """The cluster refused a batch for a reason retrying will not fix"""
+
+
+class PreparedBatch:
+    """A signed transaction for one batch of (address, base units) transfers"""
+
+    __slots__ = ("transfers", "signature", "transaction", "last_valid")
+
+    def __init__(self, transfers, signature, transaction, last_valid):
+        self.transfers = transfers
+        self.signature = signature
+        self.transaction = transaction
+        self.last_valid = last_valid  # Last block height at which the blockhash is valid
+
+
+class Checkpoint:
+    """
+    Append-only JSON-lines log of a distribution run
+    The first line records the mint and mode; resuming against a different
+    one is refused. Later lines are
+    {"submitted", "recipients", "last_valid"}: written before a transaction is first sent
+    {"signature", "recipients"}: the transaction confirmed
+    {"discarded"}: a submitted transaction is known not to have landed
+    {"failed", "error"}: a recipient that could not be delivered (retried next run)
+    Submitted transactions with neither outcome are in doubt: they may have
+    landed just before the run stopped, so a resume checks them first
+    """
+
+    def __init__(self, path, mint, mode):
+        self.path = path
+        self.completed = {}
+        self.failed = {}
+        self.in_doubt = {}  # signature → submitted entry
+        if os.path.exists(path):
+            with open(path) as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+            header = lines[0] if lines else {}
+            if (header.get("mint"), header.get("mode")) != (mint, mode):
+                raise ValueError(f"checkpoint {path} belongs to mint {header.get('mint')} ({header.get('mode')})")
+            for entry in lines[1:]:
+                if "submitted" in entry:
+                    self.in_doubt[entry["submitted"]] = entry
+                elif "discarded" in entry:
+                    self.in_doubt.pop(entry["discarded"], None)
+                elif "failed" in entry:
+                    self.failed[entry["failed"]] = entry["error"]
+                else:
+                    self.in_doubt.pop(entry["signature"], None)
+                    for address in entry["recipients"]:
+                        self.completed[address] = entry["signature"]
+                        self.failed.pop(address, None)
+            self._file = open(path, "a")
+        else:
+            self._file = open(path, "a")
+            self._append({"mint": mint, "mode": mode, "started": time.time()})
+
+    def done(self, address):
+        return address in self.completed
+
+    def record_submitted(self, prepared):
+        entry = {"submitted": str(prepared.signature), "recipients": prepared.transfers,
+                 "last_valid": prepared.last_valid}
+        self._append(entry)
+        self.in_doubt[entry["submitted"]] = entry
+
+    def discard(self, signature):
+        self._append({"discarded": str(signature)})
+        self.in_doubt.pop(str(signature), None)
+
+    def record(self, signature, transfers):
+        signature = str(signature)
+        addresses = [address for address, _ in transfers]
+        self._append({"signature": signature, "recipients": addresses})
+        self.in_doubt.pop(signature, None)
+        for address in addresses:
+            self.completed[address] = signature
+            self.failed.pop(address, None)
+
+    def record_failure(self, address, error):
+        self._append({"failed": address, "error": error})
+        self.failed[address] = error
+
+    def _append(self, entry):
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+class SolanaBackend:
+    """
+    Batches as SPL token transactions on a cluster, over one pooled AsyncClient
+    mode="mint" mints from the mint authority (the payer); mode="transfer"
+    sends from the payer's associated token account
+    """
+
+    def __init__(self, payer, mint, mode="mint", rpc_url=RPC_URL, decimals=RANGI_DECIMALS):
+        from solana.rpc.async_api import AsyncClient
+        from solders.pubkey import Pubkey
+
+        self.payer = payer
+        self.mint = Pubkey.from_string(mint)
+        self.mode = mode
+        self.decimals = decimals
+        self.client = AsyncClient(rpc_url, timeout=30)
+        self._blockhash = None
+        self._blockhash_at = 0.0
+        self._blockhash_lock = asyncio.Lock()
+
+    async def _latest_blockhash(self):
+        # One blockhash is shared by every batch signed within BLOCKHASH_TTL
+        from solana.rpc.commitment import Confirmed
+
+        async with self._blockhash_lock:
+            if self._blockhash is None or time.monotonic() - self._blockhash_at > BLOCKHASH_TTL:
+                self._blockhash = (await self.client.get_latest_blockhash(Confirmed)).value
+                self._blockhash_at = time.monotonic()
+            return self._blockhash
+
+    def instructions(self, transfers):
+        from solders.pubkey import Pubkey
+        from spl.token.constants import TOKEN_PROGRAM_ID
+        from spl.token.instructions import (
+            MintToCheckedParams, TransferCheckedParams, create_idempotent_associated_token_account,
+            get_associated_token_address, mint_to_checked, transfer_checked,
+        )
+
+        payer = self.payer.pubkey()
+        source = get_associated_token_address(payer, self.mint)
+        instructions = []
+        for address, amount in transfers:
+            try:
+                owner = Pubkey.from_string(address)
+            except ValueError as e:
+                raise BatchRejected(f"invalid address {address}: {e}")
+            account = get_associated_token_address(owner, self.mint)
+            instructions.append(create_idempotent_associated_token_account(payer, owner, self.mint))
+            if self.mode == "mint":
+                instructions.append(mint_to_checked(MintToCheckedParams(
+                    program_id=TOKEN_PROGRAM_ID, mint=self.mint, dest=account,
+                    mint_authority=payer, amount=amount, decimals=self.decimals)))
+            else:
+                instructions.append(transfer_checked(TransferCheckedParams(
+                    program_id=TOKEN_PROGRAM_ID, source=source, mint=self.mint, dest=account,
+                    owner=payer, amount=amount, decimals=self.decimals)))
+        return instructions
+
+    async def prepare(self, transfers):
+        from solders.transaction import Transaction
+
+        blockhash = await self._latest_blockhash()
+        transaction = Transaction.new_signed_with_payer(
+            self.instructions(transfers), self.payer.pubkey(), [self.payer], blockhash.blockhash)
+        return PreparedBatch(transfers, transaction.signatures[0], transaction,
+                             blockhash.last_valid_block_height)
+
+    async def submit(self, prepared):
+        from solana.rpc.commitment import Confirmed
+        from solana.rpc.core import RPCException
+        from solana.rpc.types import TxOpts
+
+        try:
+            await self.client.send_raw_transaction(
+                bytes(prepared.transaction),
+                opts=TxOpts(skip_preflight=False, preflight_commitment=Confirmed, max_retries=0))
+        except RPCException as e:
+            message = str(e)
+            if "Blockhash not found" in message or "already been processed" in message:
+                return  # Stale blockhash or a duplicate; status() decides
+            raise BatchRejected(message)
+
+    async def status(self, prepared, wait=CONFIRM_TIMEOUT):
+        from solana.rpc.commitment import Confirmed
+        from solders.signature import Signature
+
+        signature = prepared.signature
+        if isinstance(signature, str):  # Resumed from a checkpoint
+            signature = Signature.from_string(signature)
+        deadline = time.monotonic() + wait
+        while True:
+            result = (await self.client.get_signature_statuses(
+                [signature], search_transaction_history=True)).value[0]
+            if result is not None:
+                if result.err is not None:
+                    return FAILED
+                if str(result.confirmation_status).lower().endswith(("confirmed", "finalized")):
+                    return LANDED
+            elif (await self.client.get_block_height(Confirmed)).value > prepared.last_valid:
+                return EXPIRED
+            if time.monotonic() >= deadline:
+                return PENDING
+            await asyncio.sleep(0.5)
+
+    async def close(self):
+        await self.client.close()
+
+
+class LocalValidator:
+    """
+    In-memory validator stand-in for dry runs and tests; no network
+    Applies batches to token balances and deduplicates by signature like the
+    cluster does. Slots advance every slot_seconds of wall time and a
+    blockhash expires expiry_slots after it was issued. Failures can be injected:
+    drop_rate: request lost before it lands (retried)
+    lost_ack_rate: batch lands but the response is lost (retried, must not double-mint)
+    reject: addresses whose batches the cluster refuses
+    """
+
+    def __init__(self, drop_rate=0.0, lost_ack_rate=0.0, reject=(), latency=0.0,
+                 slot_seconds=0.4, expiry_slots=150, seed=0):
+        self.drop_rate = drop_rate
+        self.lost_ack_rate = lost_ack_rate
+        self.reject = set(reject)
+        self.latency = latency
+        self.expiry_slots = expiry_slots
+        self.rng = random.Random(seed)
+        self.slot_seconds = slot_seconds
+        self.started = time.monotonic()
+        self.balances = {}
+        self.landed = {}  # signature → transfers
+        self.submissions = 0
+
+    @property
+    def slot(self):
+        return int((time.monotonic() - self.started) / self.slot_seconds)
+
+    async def prepare(self, transfers):
+        blockhash = self.slot
+        signature = hashlib.sha256(repr((blockhash, transfers)).encode()).hexdigest()
+        return PreparedBatch(transfers, signature, None, blockhash + self.expiry_slots)
+
+    async def submit(self, prepared):
+        self.submissions += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.slot > prepared.last_valid:
+            return  # Blockhash not found; the batch stays pending until it expires
+        if self.rng.random() < self.drop_rate:
+            raise ConnectionError("request dropped")
+        rejected = [address for address, _ in prepared.transfers if address in self.reject]
+        if rejected:
+            raise BatchRejected(f"invalid account {rejected[0]}")
+        if prepared.signature not in self.landed:
+            self.landed[prepared.signature] = prepared.transfers
+            for address, amount in prepared.transfers:
+                self.balances[address] = self.balances.get(address, 0) + amount
+        if self.rng.random() < self.lost_ack_rate:
+            raise ConnectionError("response lost")
+
+    async def status(self, prepared, wait=CONFIRM_TIMEOUT):
+        if prepared.signature in self.landed:
+            return LANDED
+        if self.slot > prepared.last_valid:
+            return EXPIRED
+        return PENDING
+
+    async def close(self):
+        pass
+
+
+class BulkDistributor:
+    """
+    Sends batched transfers through a backend (SolanaBackend or LocalValidator)
+    with bounded concurrency, retry and checkpointing
+    """
+
+    def __init__(self, backend, checkpoint, batch_size=DEFAULT_BATCH_SIZE, concurrency=DEFAULT_CONCURRENCY,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, confirm_timeout=CONFIRM_TIMEOUT):
+        self.backend = backend
+        self.checkpoint = checkpoint
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.confirm_timeout = confirm_timeout
+        self.stats = {"batches": 0, "delivered": 0, "retries": 0, "failed": 0}
+
+    async def run(self, recipients):
+        """Deliver every recipient not yet in the checkpoint; returns run stats"""
+        started = time.perf_counter()
+        unresolved = await self._resolve_in_doubt()
+        pending = [(address, amount) for address, amount in recipients
+                   if not self.checkpoint.done(address) and address not in unresolved]
+        self.stats["skipped"] = len(recipients) - len(pending) - len(unresolved)
+        self.stats["in_doubt"] = len(unresolved)
+
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.concurrency)]
+        try:
+            for start in range(0, len(pending), self.batch_size):
+                await queue.put(pending[start:start + self.batch_size])
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+        self.stats["seconds"] = round(time.perf_counter() - started, 3)
+        self.stats["failures"] = dict(self.checkpoint.failed)
+        return self.stats
+
+    async def _resolve_in_doubt(self):
+        """
+        Settle transactions a previous run submitted but never saw confirm
+        Returns the addresses still in doubt (their blockhash has not expired
+        yet); they are left out of this run rather than risk paying twice
+        """
+        entries = list(self.checkpoint.in_doubt.items())
+        batches = [PreparedBatch([tuple(transfer) for transfer in entry["recipients"]], signature, None,
+                                 entry["last_valid"]) for signature, entry in entries]
+        statuses = await asyncio.gather(*(self.backend.status(prepared, self.confirm_timeout)
+                                          for prepared in batches))
+        unresolved = set()
+        for prepared, status in zip(batches, statuses):
+            if status == LANDED:
+                self.checkpoint.record(prepared.signature, prepared.transfers)
+            elif status in (EXPIRED, FAILED):
+                self.checkpoint.discard(prepared.signature)
+            else:
+                unresolved.update(address for address, _ in prepared.transfers)
+        return unresolved
+
+    async def _worker(self, queue):
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+            await self._deliver_or_split(batch)
+
+    async def _deliver_or_split(self, batch):
+        try:
+            signature = await self._deliver(batch)
+        except BatchRejected as e:
+            if len(batch) > 1:
+                # Isolate the bad recipient: retry the rest one by one
+                for transfer in batch:
+                    await self._deliver_or_split([transfer])
+                return
+            self.checkpoint.record_failure(batch[0][0], str(e))
+            self.stats["failed"] += 1
+            return
+        except Exception as e:
+            for address, _ in batch:
+                self.checkpoint.record_failure(address, str(e))
+            self.stats["failed"] += len(batch)
+            return
+        self.checkpoint.record(signature, batch)
+        self.stats["batches"] += 1
+        self.stats["delivered"] += len(batch)
+
+    async def _deliver(self, batch):
+        """
+        Sign once and re-send the same transaction until it lands; a new one is
+        signed only after the old blockhash has expired without it landing
+        """
+        prepared, error = None, None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                if prepared is None:
+                    prepared = await self.backend.prepare(batch)
+                    self.checkpoint.record_submitted(prepared)
+                await self.backend.submit(prepared)
+            except BatchRejected:
+                if prepared is not None:
+                    self.checkpoint.discard(prepared.signature)  # Refused before it could land
+                raise
+            except Exception as e:
+                error = e  # It may still have landed; the status check decides
+            if prepared is None:
+                continue
+            try:
+                status = await self.backend.status(prepared, self.confirm_timeout)
+            except Exception as e:
+                error = e
+                continue
+            if status == LANDED:
+                return prepared.signature
+            if status == FAILED:
+                self.checkpoint.discard(prepared.signature)
+                raise BatchRejected(f"transaction {prepared.signature} failed on chain")
+            if status == EXPIRED:
+                self.checkpoint.discard(prepared.signature)
+                prepared = None
+        raise RuntimeError(f"batch not confirmed after {self.retries + 1} attempts: {error or 'timed out'}")
+
+
+async def distribute(recipients, backend, checkpoint_path, mint, mode="mint", **options):
+    """Run a bulk distribution and close the backend and checkpoint afterwards"""
+    checkpoint = Checkpoint(checkpoint_path, mint, mode)
+    try:
+        return await BulkDistributor(backend, checkpoint, **options).run(recipients)
+    finally:
+        checkpoint.close()
+        await backend.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RANGI mint and bulk distribution")
+    parser.add_argument("--distribute", metavar="RECIPIENTS",
+                        help="CSV or JSON-lines recipient list to distribute to")
+    parser.add_argument("--mint", help="RANGI mint address (required with --distribute on a cluster)")
+    parser.add_argument("--mode", choices=("mint", "transfer"), default="mint",
+                        help="mint new tokens, or transfer from the payer's token account")
+    parser.add_argument("--checkpoint", help="progress log (default: <RECIPIENTS>.checkpoint.jsonl)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("--local", action="store_true",
+                        help="distribute against the in-memory validator stand-in")
+    parser.add_argument("--sample", type=int, metavar="N",
+                        help="with --local and no list, distribute to N made-up recipients")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="with --local, share of requests dropped")
+    parser.add_argument("--lost-ack-rate", type=float, default=0.0,
+                        help="with --local, share of landed batches whose response is lost")
+    args = parser.parse_args(argv)
+
+    if not args.distribute and not args.sample:
+        asyncio.run(mint_rangi_token())
+        return 0
+
+    try:
+        recipients = load_recipients(args.distribute) if args.distribute else sample_recipients(args.sample)
+        checkpoint = args.checkpoint or f"{args.distribute or 'sample'}.checkpoint.jsonl"
+        if args.local:
+            backend = LocalValidator(args.drop_rate, args.lost_ack_rate)
+            mint = args.mint or "local-mint"
+        else:
+            if not args.mint:
+                raise ValueError("--mint is required unless --local is given")
+            backend = SolanaBackend(load_payer(), args.mint, args.mode)
+            mint = args.mint
+        stats = asyncio.run(distribute(
+            recipients, backend, checkpoint, mint, args.mode, batch_size=args.batch_size,
+            concurrency=args.concurrency, retries=args.retries,
+            backoff=0.01 if args.local else DEFAULT_BACKOFF))
+        if args.local:
+            # Every credited address must hold exactly its amount: a retry never mints twice
+            amounts = dict(recipients)
+            stats["double_credited"] = sum(units != amounts[address] for address, units in backend.balances.items())
+        print(json.dumps({"recipients": len(recipients), "checkpoint": checkpoint, **stats}, indent=2))
+        return 0 if not stats["failures"] else 1
+    except Exception as e:
+        print(json.dumps({"error": str(e), "status": "failed"}), file=sys.stderr)
+        return 1
+
+
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(mint_rangi_token())
+    sys.exit(main())
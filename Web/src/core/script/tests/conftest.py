@@ -0,0 +1,26 @@
+"""
+Fixtures for the RANGI distribution tests
+mint-rangi-token.py has a hyphenated name, so it is imported by path.
+
+Usage:
+    python3 -m pytest -q Web/src/core/script/tests
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mint-rangi-token.py")
+
+
+@pytest.fixture(scope="session")
+def rangi():
+    module = sys.modules.get("mint_rangi_token")
+    if module is None:
+        spec = importlib.util.spec_from_file_location("mint_rangi_token", SCRIPT)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["mint_rangi_token"] = module
+        spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,112 @@
+"""BulkDistributor delivery, retry, resume and in-doubt recovery on LocalValidator"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+MINT = "local-mint"
+
+
+def run(rangi, recipients, backend, path, **options):
+    checkpoint = rangi.Checkpoint(str(path), MINT, "mint")
+    try:
+        distributor = rangi.BulkDistributor(backend, checkpoint, backoff=0, **options)
+        return asyncio.run(distributor.run(recipients))
+    finally:
+        checkpoint.close()
+
+
+def test_lost_acks_and_drops_never_double_credit(rangi, tmp_path):
+    recipients = rangi.sample_recipients(300)
+    backend = rangi.LocalValidator(drop_rate=0.2, lost_ack_rate=0.5, seed=7)
+
+    stats = run(rangi, recipients, backend, tmp_path / "run.jsonl", retries=30)
+
+    assert stats["failures"] == {}
+    assert stats["delivered"] == len(recipients)
+    assert stats["retries"] > 0
+    assert backend.balances == dict(recipients)
+
+
+def test_resume_skips_completed_recipients(rangi, tmp_path):
+    recipients = rangi.sample_recipients(60)
+    path = tmp_path / "run.jsonl"
+    backend = rangi.LocalValidator()
+
+    run(rangi, recipients[:24], backend, path)
+    submitted = backend.submissions
+    stats = run(rangi, recipients, backend, path)
+
+    assert stats["skipped"] == 24
+    assert stats["delivered"] == 36
+    assert backend.submissions - submitted == 6  # 36 recipients in batches of 6
+    assert backend.balances == dict(recipients)
+
+
+def test_checkpoint_rejects_another_mint(rangi, tmp_path):
+    path = tmp_path / "run.jsonl"
+    rangi.Checkpoint(str(path), MINT, "mint").close()
+    with pytest.raises(ValueError):
+        rangi.Checkpoint(str(path), "other-mint", "mint")
+
+
+def _submitted_before_crash(rangi, backend, path, transfers, land):
+    """A run that logged a submission, maybe landed it, and stopped before confirming"""
+    checkpoint = rangi.Checkpoint(str(path), MINT, "mint")
+    prepared = asyncio.run(backend.prepare(transfers))
+    checkpoint.record_submitted(prepared)
+    if land:
+        asyncio.run(backend.submit(prepared))
+    checkpoint.close()
+    return prepared
+
+
+def test_in_doubt_batch_that_landed_is_recorded_not_resent(rangi, tmp_path):
+    recipients = rangi.sample_recipients(12)
+    path = tmp_path / "run.jsonl"
+    backend = rangi.LocalValidator()
+    prepared = _submitted_before_crash(rangi, backend, path, recipients[:6], land=True)
+
+    stats = run(rangi, recipients, backend, path)
+
+    assert stats["in_doubt"] == 0
+    assert stats["delivered"] == 6
+    assert backend.balances == dict(recipients)
+    resumed = rangi.Checkpoint(str(path), MINT, "mint")
+    assert resumed.in_doubt == {}
+    assert all(resumed.completed[address] == prepared.signature for address, _ in recipients[:6])
+    resumed.close()
+
+
+def test_in_doubt_batch_is_held_back_until_its_blockhash_expires(rangi, tmp_path):
+    recipients = rangi.sample_recipients(12)
+    path = tmp_path / "run.jsonl"
+    backend = rangi.LocalValidator(slot_seconds=0.02, expiry_slots=10)
+    _submitted_before_crash(rangi, backend, path, recipients[:6], land=False)
+
+    stats = run(rangi, recipients, backend, path)
+    assert stats["in_doubt"] == 6
+    assert set(backend.balances) == {address for address, _ in recipients[6:]}
+
+    time.sleep(0.3)  # Let the logged blockhash expire
+    stats = run(rangi, recipients, backend, path)
+    assert stats["in_doubt"] == 0
+    assert stats["delivered"] == 6
+    assert backend.balances == dict(recipients)
+    with open(path) as f:
+        assert sum("discarded" in json.loads(line) for line in f) == 1
+
+
+def test_rejected_batch_is_split_so_only_the_bad_address_fails(rangi, tmp_path):
+    recipients = rangi.sample_recipients(12)
+    bad = recipients[3][0]
+    backend = rangi.LocalValidator(reject={bad})
+
+    stats = run(rangi, recipients, backend, tmp_path / "run.jsonl")
+
+    assert list(stats["failures"]) == [bad]
+    assert stats["failed"] == 1
+    assert stats["delivered"] == 11
+    assert backend.balances == {address: amount for address, amount in recipients if address != bad}
@@ -1,19 +1,127 @@
 // websocket/harmonic-stream.js
-class HarmonicStream {
-    constructor() {
-        this.validators = new Map();
-        this.rcpInterval = setInterval(this.calculateRCP.bind(this), 2000);
+const { EventEmitter } = require("events");
+const { callConsensusPulse } = require("../Web/lib/engineBridge");
+
+// CHS packets go to the engine in batches: when this many are queued, or
+// FLUSH_MS after the first one arrives
+const BATCH_SIZE = 500;
+const FLUSH_MS = 100;
+// A batch the engine failed to ingest is queued again for the next flush;
+// beyond this many queued packets the oldest are dropped (and counted)
+const MAX_PENDING = 20 * BATCH_SIZE;
+const RCP_INTERVAL_MS = 2000;
+const OPEN = 1; // WebSocket.OPEN
+
+/**
+ * Validator CHS packets in, Rangi Consensus Pulse out
+ * Validator state, drift detection and the RCP live in the Python
+ * Consensus Pulse engine; this class batches packets to it and fans results
+ * out to connected clients
+ *
+ * Events: "harmonic" (drift_started / drift_cleared), "rcp" (pulse), "error"
+ * Packets of a failed ingest are retried with the next flush; `dropped`
+ * counts packets discarded once more than maxPending were waiting
+ */
+class HarmonicStream extends EventEmitter {
+    constructor(options = {}) {
+        super();
+        this.call = options.call || callConsensusPulse;
+        this.batchSize = options.batchSize || BATCH_SIZE;
+        this.maxPending = options.maxPending || MAX_PENDING;
+        this.dropped = 0;
+        this.clients = new Set();
+        this.pending = [];
+        this.flushTimer = null;
+        this.latest = null;
+        this.computing = false;
+        this.rcpInterval = setInterval(this.calculateRCP.bind(this), options.intervalMs || RCP_INTERVAL_MS);
     }
-    
+
+    addClient(client) {
+        this.clients.add(client);
+        if (this.latest) this._send(client, { type: "rcp", data: this.latest });
+    }
+
+    removeClient(client) {
+        this.clients.delete(client);
+    }
+
     onCHS(packet) {
-        // Update validator health
-        // Detect drift patterns
-        // Emit harmonic events for dashboards
+        this.pending.push(packet);
+        if (this.pending.length >= this.batchSize) {
+            this.flush();
+        } else if (!this.flushTimer) {
+            this.flushTimer = setTimeout(() => this.flush(), FLUSH_MS);
+        }
+    }
+
+    async flush() {
+        clearTimeout(this.flushTimer);
+        this.flushTimer = null;
+        if (!this.pending.length) return;
+
+        const packets = this.pending;
+        this.pending = [];
+        try {
+            const { events } = await this.call("ingest", { packets });
+            for (const event of events) {
+                this.emit("harmonic", event);
+                this.broadcast({ type: "harmonic", data: event });
+            }
+        } catch (err) {
+            this._requeue(packets);
+            this._error(err);
+        }
+    }
+
+    _requeue(packets) {
+        this.pending = packets.concat(this.pending);
+        const excess = this.pending.length - this.maxPending;
+        if (excess > 0) {
+            this.pending.splice(0, excess);
+            this.dropped += excess;
+        }
+        if (!this.flushTimer) this.flushTimer = setTimeout(() => this.flush(), FLUSH_MS);
+    }
+
+    async calculateRCP() {
+        if (this.computing) return this.latest; // Previous pulse still in progress
+        this.computing = true;
+        try {
+            await this.flush();
+            this.latest = await this.call("rcp", {});
+            this.emit("rcp", this.latest);
+            this.broadcast({ type: "rcp", data: this.latest });
+        } catch (err) {
+            this._error(err);
+        } finally {
+            this.computing = false;
+        }
+        return this.latest;
+    }
+
+    broadcast(message) {
+        for (const client of this.clients) this._send(client, message);
+    }
+
+    close() {
+        clearInterval(this.rcpInterval);
+        clearTimeout(this.flushTimer);
+        this.clients.clear();
+    }
+
+    _send(client, message) {
+        if (client.readyState !== undefined && client.readyState !== OPEN) return;
+        client.send(JSON.stringify(message));
     }
-    
-    calculateRCP() {
-        // Aggregate all CHS signals
-        // Compute global stability index
-        // Broadcast RCP to all connected clients
+
+    _error(err) {
+        if (this.listenerCount("error")) {
+            this.emit("error", err);
+        } else {
+            console.error(`HarmonicStream: ${err.message}`);
+        }
     }
 }
+
+module.exports = { HarmonicStream };